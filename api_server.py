@@ -0,0 +1,400 @@
+"""대시보드 집계 데이터 JSON API (표준 라이브러리 http.server, Streamlit 불필요)
+
+    python api_server.py                           # http://127.0.0.1:8600/api/categories
+    python api_server.py --port 8080 --data-dir /data
+
+    GET /api/years                                  조사연도와 데이터 버전
+    GET /api/categories?type=감축&sort=kr_tech_level&order=desc&page=1&per_page=50
+    GET /api/categories/<중분류>                     중분류 집계와 소속 세부기술
+    GET /api/details?category=<중분류>&type=&page=&per_page=
+    GET /api/rankings?type=전체&metric=tech_level   국가별 평균/순위/선도 중분류 수
+    GET /api/search?q=수소&limit=10
+
+모든 조회는 year 파라미터(기본: 최신 조사연도)를 받는다. 응답에는 데이터 버전과 정규화한 요청으로
+만든 약한 ETag를 붙이므로 If-None-Match가 일치하면 본문 없이 304를 돌려준다. 데이터는 TrackerWatcher가
+워크북 변경을 감시해 갱신하며, 갱신되면 ETag도 바뀐다. Accept-Encoding에 gzip이 있으면 압축해 보낸다.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import re
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+from tracker_data import COLUMN_MAPPING, COUNTRY_CODES, COUNTRY_NAMES, NUMERIC_METRICS, TYPE_FILTERS
+from tracker_watch import TrackerWatcher
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+DEFAULT_SEARCH_LIMIT = 10
+# 이보다 작은 응답은 압축하지 않음 (헤더 비용이 더 큼)
+GZIP_MIN_BYTES = 1024
+# (ETag -> 직렬화 본문) 보관 개수
+RESPONSE_CACHE_ENTRIES = 256
+
+COUNTRY_LABELS = dict(zip(COUNTRY_CODES, COUNTRY_NAMES))
+
+logger = logging.getLogger('tracker.api')
+
+
+class ApiError(Exception):
+    """JSON 오류 응답 (HTTP 상태 코드, 메시지)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON 직렬화 불가: {type(value).__name__}")
+
+
+def _records(frame):
+    """DataFrame -> dict 목록 (NaN은 null)"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _paginate(frame, params):
+    """페이지 단위로 잘라 직렬화 (요청한 페이지만 변환)"""
+    page, per_page = params['page'], params['per_page']
+    total = len(frame)
+    items = frame.iloc[(page - 1) * per_page:page * per_page]
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': max(1, math.ceil(total / per_page)),
+        'items': _records(items)
+    }
+
+
+# 요청 파라미터 파서 (검증 후 정규화한 값이 ETag에 들어가므로 기본값 생략 여부와 무관하게 같은 키)
+def _int_param(query, name, default, low, high):
+    raw = query.get(name, [str(default)])[-1]
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ApiError(400, f"{name}은(는) 정수여야 합니다: {raw}")
+    if not low <= value <= high:
+        raise ApiError(400, f"{name}은(는) {low}~{high} 범위여야 합니다: {value}")
+    return value
+
+
+def _choice_param(query, name, default, choices):
+    value = query.get(name, [default])[-1]
+    if value not in choices:
+        raise ApiError(400, f"{name}은(는) {', '.join(map(str, choices))} 중 하나여야 합니다: {value}")
+    return value
+
+
+def _page_params(query):
+    return {
+        'page': _int_param(query, 'page', 1, 1, sys.maxsize),
+        'per_page': _int_param(query, 'per_page', DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+    }
+
+
+def _category_row(dataset, name):
+    rows = dataset.category_data[dataset.category_data['tech_category'] == name]
+    if len(rows) == 0:
+        raise ApiError(404, f"중분류를 찾을 수 없습니다: {name}")
+    return rows
+
+
+def _detail_frame(dataset):
+    df = dataset.df
+    columns = [col for col in COLUMN_MAPPING.values() if col in df.columns]
+    frame = df[columns]
+    return frame.assign(position=np.arange(len(df)))
+
+
+# 라우트: (파라미터 파서, 응답 생성) 쌍. 파서는 (dataset, query, match) -> 정규화한 파라미터 dict
+def _parse_categories(dataset, query, match):
+    return {
+        'type': _choice_param(query, 'type', '전체', TYPE_FILTERS),
+        'sort': _choice_param(query, 'sort', 'kr_tech_level', list(dataset.category_data.columns)),
+        'order': _choice_param(query, 'order', 'desc', ['asc', 'desc']),
+        **_page_params(query)
+    }
+
+
+def _categories(dataset, params):
+    data = dataset.category_data
+    if params['type'] != '전체':
+        data = data[data['type'] == params['type']]
+    data = data.sort_values(params['sort'], ascending=params['order'] == 'asc', kind='stable', na_position='last')
+    return _paginate(data, params)
+
+
+def _parse_category(dataset, query, match):
+    name = unquote(match.group('name'))
+    _category_row(dataset, name)
+    return {'name': name}
+
+
+def _category(dataset, params):
+    row = _category_row(dataset, params['name'])
+    details = _detail_frame(dataset).iloc[dataset.details.rows(params['name'])]
+    return {**_records(row)[0], 'details': _records(details)}
+
+
+def _parse_details(dataset, query, match):
+    params = {'category': query.get('category', [None])[-1], 'type': _choice_param(query, 'type', '전체', TYPE_FILTERS)}
+    if params['category'] is not None:
+        _category_row(dataset, params['category'])
+    return {**params, **_page_params(query)}
+
+
+def _details(dataset, params):
+    frame = _detail_frame(dataset)
+    if params['category'] is not None:
+        frame = frame.iloc[dataset.details.rows(params['category'])]
+    if params['type'] != '전체':
+        frame = frame[frame['type'] == params['type']]
+    return _paginate(frame, params)
+
+
+def _parse_rankings(dataset, query, match):
+    return {
+        'type': _choice_param(query, 'type', '전체', TYPE_FILTERS),
+        'metric': _choice_param(query, 'metric', 'tech_level', NUMERIC_METRICS)
+    }
+
+
+def _rankings(dataset, params):
+    """집계 큐브에서 국가별 평균/순위/최고 중분류 조회 (순위 오름차순)"""
+    cube = dataset.cube
+    selected_type, metric = params['type'], params['metric']
+    ranks = cube.get('rank', selected_type, metric=metric)
+    means = cube.get('mean', selected_type, metric=metric)
+    maxima = cube.get('max', selected_type, metric=metric)
+    best = cube.get('argmax', selected_type, metric=metric)
+    counts = cube.get('count', selected_type, metric=metric)
+    leader_counts = cube.get('leader_count', selected_type)
+    group_leader_counts = cube.get('group_leader_count', selected_type)
+    countries = []
+    for i in np.argsort(ranks, kind='stable'):
+        code = cube.countries[i]
+        countries.append({
+            'country': code,
+            'name': COUNTRY_LABELS[code],
+            'rank': int(ranks[i]),
+            'mean': _number(means[i]),
+            'max': _number(maxima[i]),
+            'best_category': best[i],
+            'count': int(counts[i]),
+            'leader_count': int(leader_counts[i]),
+            'group_leader_count': int(group_leader_counts[i])
+        })
+    return {
+        'type': selected_type,
+        'metric': metric,
+        'category_count': int(cube.category_count[cube.filters.get_loc(selected_type)]),
+        'countries': countries
+    }
+
+
+def _parse_search(dataset, query, match):
+    text = query.get('q', [''])[-1].strip()
+    if not text:
+        raise ApiError(400, "q 파라미터가 필요합니다.")
+    return {'q': text, 'limit': _int_param(query, 'limit', DEFAULT_SEARCH_LIMIT, 1, 100)}
+
+
+def _search(dataset, params):
+    hits = dataset.search.search(params['q'], params['limit'])
+    return {
+        'q': params['q'],
+        'items': [
+            {'kind': hit.kind, 'name': hit.name, 'category': hit.category,
+             'position': hit.position, 'score': round(hit.score, 4)}
+            for hit in hits
+        ]
+    }
+
+
+ROUTES = [
+    (re.compile(r'^/api/categories$'), _parse_categories, _categories),
+    (re.compile(r'^/api/categories/(?P<name>[^/]+)$'), _parse_category, _category),
+    (re.compile(r'^/api/details$'), _parse_details, _details),
+    (re.compile(r'^/api/rankings$'), _parse_rankings, _rankings),
+    (re.compile(r'^/api/search$'), _parse_search, _search),
+]
+
+
+def _accepts_gzip(accept_encoding):
+    for token in (accept_encoding or '').lower().split(','):
+        name, _, quality = token.strip().partition(';')
+        if name.strip() in ('gzip', '*'):
+            return quality.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _etag_matches(if_none_match, etag):
+    """If-None-Match 약한 비교 (W/ 접두어 무시)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag.removeprefix('W/') in (tag.removeprefix('W/') for tag in tags)
+
+
+class TrackerApi:
+    """요청 경로/쿼리 -> (상태 코드, 헤더, 본문). HTTP 서버와 분리되어 있어 직접 호출할 수 있다."""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def respond(self, path, query_string='', if_none_match=None, accept_encoding=None):
+        try:
+            version, payload_fn = self._resolve(path, parse_qs(query_string, keep_blank_values=True))
+            etag = f'W/"{version}"'
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+            if _etag_matches(if_none_match, etag):
+                return 304, headers, b''
+            body, compressed = self._body(etag, payload_fn)
+        except ApiError as e:
+            return self._error(e.status, str(e))
+        except Exception:
+            logger.exception("요청 처리 실패: %s?%s", path, query_string)
+            return self._error(500, "서버 내부 오류")
+
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        if compressed is not None and _accepts_gzip(accept_encoding):
+            headers['Content-Encoding'] = 'gzip'
+            body = compressed
+        return 200, headers, body
+
+    @staticmethod
+    def _error(status, message):
+        body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+        return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+    def _resolve(self, path, query):
+        """경로와 파라미터 검증 -> (ETag 값, 본문 생성 함수)"""
+        datasets = self.watcher.datasets
+        if path == '/api/years':
+            versions = {year: dataset.version for year, dataset in datasets.items()}
+            payload = {'years': [{'year': year, 'version': version} for year, version in versions.items()]}
+            return self._etag('years', versions), lambda: payload
+
+        for pattern, parse, build in ROUTES:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            raise ApiError(404, f"알 수 없는 경로: {path}")
+
+        if not datasets:
+            raise ApiError(503, "tracker20XX.xlsx 데이터가 없습니다.")
+        year = _int_param(query, 'year', max(datasets), 0, 9999)
+        if year not in datasets:
+            raise ApiError(404, f"조사연도 데이터가 없습니다: {year}")
+        dataset = datasets[year]
+        params = parse(dataset, query, match)
+        # 내용이 같은 워크북이라도 조사연도가 다르면 응답('year')이 다르므로 연도를 키에 포함
+        return (self._etag(year, dataset.version, pattern.pattern, params),
+                lambda: {'year': year, 'version': dataset.version, **build(dataset, params)})
+
+    @staticmethod
+    def _etag(*parts):
+        key = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def _body(self, etag, payload_fn):
+        """ETag별 직렬화 본문과 gzip 본문 (작으면 None) 캐시"""
+        with self._lock:
+            cached = self._responses.get(etag)
+            if cached is not None:
+                self._responses.move_to_end(etag)
+                return cached
+
+        body = json.dumps(payload_fn(), ensure_ascii=False, default=_json_default).encode('utf-8')
+        compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        with self._lock:
+            self._responses[etag] = (body, compressed)
+            while len(self._responses) > RESPONSE_CACHE_ENTRIES:
+                self._responses.popitem(last=False)
+        return body, compressed
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'TrackerAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._send(head=False)
+
+    def do_HEAD(self):
+        self._send(head=True)
+
+    def _send(self, head):
+        url = urlsplit(self.path)
+        status, headers, body = self.server.api.respond(
+            url.path, url.query, self.headers.get('If-None-Match'), self.headers.get('Accept-Encoding'))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head and status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, data_dir='.'):
+    """API 서버 생성 (데이터 로드 및 워크북 감시 시작)"""
+    watcher = TrackerWatcher(data_dir).start()
+    server = ThreadingHTTPServer((host, port), ApiRequestHandler)
+    server.daemon_threads = True
+    server.api = TrackerApi(watcher)
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='기후기술 델파이조사 집계 데이터 JSON API')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'바인딩 주소 (기본: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본: {DEFAULT_PORT})')
+    parser.add_argument('--data-dir', default='.', help='tracker20XX.xlsx 워크북 폴더 (기본: 현재 폴더)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    server = create_server(args.host, args.port, args.data_dir)
+    if not server.api.watcher.datasets:
+        raise SystemExit(f"{args.data_dir}에서 tracker20XX.xlsx 파일을 찾을 수 없습니다.")
+    print(f"API 서버 시작: http://{args.host}:{server.server_port}/api/categories")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.api.watcher.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
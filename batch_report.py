@@ -0,0 +1,240 @@
+"""기술분야별 분석 정적 리포트 일괄 생성 (Streamlit 없이 대시보드 차트 빌더 재사용)
+
+    python batch_report.py                       # 최신 조사연도, HTML
+    python batch_report.py --years all --format html png --workers 4
+    python batch_report.py --force               # 이전 결과 무시하고 전체 재생성
+
+중분류마다 카드, 기술수준/격차 막대그래프, 상세 현황 및 R&D 테이블을 담은 HTML(선택 시 PNG)을
+{출력 폴더}/{연도}/ 아래에 만든다. manifest.json에 중분류별 집계 해시를 기록해 두므로 중단 후
+다시 실행하거나 워크북 일부를 고친 뒤 실행하면 집계가 바뀌지 않은 중분류는 건너뛴다. PNG 출력에는 kaleido 패키지가 필요하다.
+"""
+import argparse
+import html
+import importlib.util
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 대시보드 모듈 import 시 Streamlit 런타임 부재 경고 숨김
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+from tracker_data import build_dataset, load_tracker_years
+
+MANIFEST_NAME = 'manifest.json'
+FORMATS = ('html', 'png')
+
+# 워커 프로세스별 데이터셋 ({연도: TrackerDataset})
+_DATASETS = {}
+
+
+def report_filename(category):
+    """중분류명 -> 파일명 (경로 구분자, 공백 등 치환)"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', category).strip('_')
+
+
+def _init_worker(directory, years):
+    # 스냅샷은 메인 프로세스에서 미리 갱신해 두므로 여기서는 Arrow 파일만 읽음
+    tracker_years = load_tracker_years(directory)
+    for year in years:
+        df, category_data, version = tracker_years[year]
+        _DATASETS[year] = build_dataset(df, category_data, version, year)
+
+
+def _table_html(frame):
+    return frame.to_html(index=False, border=0, classes='report-table', na_rep='-',
+                         float_format=lambda value: f'{value:.1f}')
+
+
+def render_category_page(dataset, category):
+    """중분류 하나의 리포트 HTML 문서와 차트 figure 목록"""
+    import dashboard_260916 as dashboard
+
+    category_data = dataset.category_data
+    category_info = category_data[category_data['tech_category'] == category].iloc[0]
+    figures = [dashboard.create_category_bar(dataset, category, 'tech_level'),
+               dashboard.create_category_bar(dataset, category, 'tech_gap')]
+    charts = [fig.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False,
+                          config={'displayModeBar': False})
+              for i, fig in enumerate(figures)]
+    cards = ''.join(f'<div class="card">{card}</div>' for card in dashboard.category_cards_html(category_info))
+    rd_cards = ''.join(f'<div class="card">{card}</div>' for card in dashboard.rd_capability_html(dataset, category_info))
+
+    page = f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(category)} - 기후기술 델파이조사 {dataset.year}</title>
+{dashboard.PAGE_CSS}
+<style>
+body {{ font-family: sans-serif; max-width: 1200px; margin: 2rem auto; padding: 0 1rem; }}
+.row {{ display: flex; gap: 1rem; }}
+.row > .card, .row > .chart {{ flex: 1; }}
+.report-table {{ border-collapse: collapse; width: 100%; }}
+.report-table th, .report-table td {{ border-bottom: 1px solid #e5e7eb; padding: 0.4rem 0.6rem; text-align: left; }}
+</style>
+</head>
+<body>
+<p><a href="../index.html">← 전체 목록</a> · {dataset.year}년 조사 · 세부기술 {int(category_info['detail_count'])}개</p>
+{dashboard.category_summary_html(category)}
+<div class="row">{cards}</div>
+<h3>📊 기술수준 및 격차 분석</h3>
+<div class="row">{''.join(f'<div class="chart">{chart}</div>' for chart in charts)}</div>
+<h3>📋 상세 현황</h3>
+{_table_html(dashboard.build_country_detail_table(dataset, category_info))}
+<h3>🎯 연구개발 역량 및 경향</h3>
+{_table_html(dashboard.build_rd_table(dataset, category_info))}
+<div class="row">{rd_cards}</div>
+</body>
+</html>
+"""
+    return page, figures
+
+
+def render_category(year, category, output_dir, formats):
+    """워커 작업: 중분류 리포트 파일 생성 -> (연도, 중분류, 소요 시간)"""
+    start = time.perf_counter()
+    dataset = _DATASETS[year]
+    page, figures = render_category_page(dataset, category)
+
+    year_dir = os.path.join(output_dir, str(year))
+    os.makedirs(year_dir, exist_ok=True)
+    stem = os.path.join(year_dir, report_filename(category))
+    if 'html' in formats:
+        with open(f'{stem}.html', 'w', encoding='utf-8') as f:
+            f.write(page)
+    if 'png' in formats:
+        for fig, suffix in zip(figures, ('level', 'gap')):
+            fig.write_image(f'{stem}-{suffix}.png', width=800, height=400)
+    return year, category, time.perf_counter() - start
+
+
+def _output_paths(output_dir, year, category, formats):
+    stem = os.path.join(output_dir, str(year), report_filename(category))
+    paths = []
+    if 'html' in formats:
+        paths.append(f'{stem}.html')
+    if 'png' in formats:
+        paths += [f'{stem}-level.png', f'{stem}-gap.png']
+    return paths
+
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    """작업 하나가 끝날 때마다 기록 (중단 시에도 완료분 보존)"""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def write_index(output_dir, datasets):
+    """연도별 중분류 리포트 목록 페이지"""
+    sections = []
+    for year, dataset in sorted(datasets.items(), reverse=True):
+        items = ''.join(
+            f'<li><a href="{year}/{report_filename(category)}.html">{html.escape(category)}</a></li>'
+            for category in dataset.category_data['tech_category']
+        )
+        sections.append(f'<h2>{year}년 조사</h2>\n<ul>{items}</ul>')
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html lang="ko">\n<head><meta charset="utf-8">'
+                '<title>기후기술 델파이조사 기술분야별 리포트</title></head>\n<body>\n'
+                '<h1>🔬 기술분야별 분석 리포트</h1>\n' + '\n'.join(sections) + '\n</body>\n</html>\n')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='기술분야별 분석 정적 리포트 일괄 생성')
+    parser.add_argument('--data-dir', default='.', help='tracker20XX.xlsx 워크북 폴더 (기본: 현재 폴더)')
+    parser.add_argument('--output', default='reports', help='출력 폴더 (기본: reports)')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['html'], dest='formats',
+                        help='출력 형식 (png는 kaleido 필요)')
+    parser.add_argument('--years', default='latest',
+                        help="조사연도: latest(기본), all, 또는 쉼표 구분 목록 (예: 2020,2022)")
+    parser.add_argument('--workers', type=int, default=None, help='워커 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--force', action='store_true', help='manifest를 무시하고 전체 재생성')
+    return parser.parse_args(argv)
+
+
+def select_years(available, spec):
+    if spec == 'latest':
+        return [max(available)]
+    if spec == 'all':
+        return sorted(available)
+    years = sorted({int(year) for year in spec.split(',')})
+    missing = [year for year in years if year not in available]
+    if missing:
+        raise SystemExit(f"워크북이 없는 조사연도: {', '.join(map(str, missing))}")
+    return years
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if 'png' in args.formats:
+        if importlib.util.find_spec('kaleido') is None:
+            raise SystemExit("PNG 출력에는 kaleido 패키지가 필요합니다 (pip install kaleido).")
+
+    # 스냅샷 갱신 (오래된 워크북은 여기서 병렬 파싱, 워커는 Arrow 스냅샷만 읽음)
+    tracker_years = load_tracker_years(args.data_dir)
+    if not tracker_years:
+        raise SystemExit(f"{args.data_dir}에서 tracker20XX.xlsx 파일을 찾을 수 없습니다.")
+    years = select_years(tracker_years, args.years)
+    datasets = {year: build_dataset(*tracker_years[year], year) for year in years}
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = {} if args.force else load_manifest(args.output)
+
+    tasks = []
+    skipped = 0
+    for year in years:
+        versions = datasets[year].category_versions
+        for category in datasets[year].category_data['tech_category']:
+            entry = manifest.get(f'{year}/{category}')
+            if (entry and entry['version'] == versions[category] and set(args.formats) <= set(entry['formats'])
+                    and all(os.path.exists(path) for path in _output_paths(args.output, year, category, args.formats))):
+                skipped += 1
+                continue
+            tasks.append((year, category))
+
+    print(f"조사연도 {', '.join(map(str, years))} · 중분류 {len(tasks) + skipped}개 "
+          f"(생성 {len(tasks)}, 건너뜀 {skipped})")
+
+    start = time.perf_counter()
+    if tasks:
+        workers = max(1, min(len(tasks), args.workers or os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(args.data_dir, years)) as pool:
+            futures = [pool.submit(render_category, year, category, args.output, args.formats)
+                       for year, category in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                year, category, seconds = future.result()
+                key = f'{year}/{category}'
+                formats = set(args.formats)
+                version = datasets[year].category_versions[category]
+                if manifest.get(key, {}).get('version') == version:
+                    formats |= set(manifest[key]['formats'])
+                manifest[key] = {
+                    'version': version,
+                    'formats': sorted(formats),
+                    'seconds': round(seconds, 3)
+                }
+                save_manifest(args.output, manifest)
+                print(f"[{done:>3}/{len(tasks)}] {year} {category}: {seconds:.2f}초")
+
+    write_index(args.output, datasets)
+    print(f"완료: {time.perf_counter() - start:.1f}초 → {os.path.join(args.output, 'index.html')}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
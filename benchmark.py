@@ -0,0 +1,404 @@
+"""대시보드 성능 벤치마크 (합성 tracker 워크북 생성 + 구간별 시간 측정)
+
+    python benchmark.py                                  # 100 ~ 100k 세부기술, 결과 JSON 출력
+    python benchmark.py --sizes 100 1000 --output bench.json
+    python benchmark.py --compare baseline.json          # 기준 결과 대비 회귀 검사 (느려지면 종료 코드 1)
+    python benchmark.py --sizes --startup-budget 1500    # 시작 시간(import)만 측정, 예산 초과 시 종료 코드 1
+
+합성 워크북은 실제 워크북과 같은 한글 컬럼 스키마를 사용하며 {작업 폴더}/{행 수}/tracker2020.xlsx에
+한 번만 생성해 재사용한다. 각 구간은 --repeat 회 반복해 최솟값과 중앙값(초)을 기록한다.
+시작 시간은 새 인터프리터에서 `python -X importtime -c "import dashboard_260916"`으로 측정한다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+# 대시보드 모듈 import 시 Streamlit 런타임 부재 경고 숨김
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+# 로더 측정 중 워크북 감시 스레드를 띄우지 않음
+os.environ['TRACKER_WATCH_INTERVAL'] = '0'
+
+import numpy as np
+import pandas as pd
+
+from tracker_data import COLUMN_MAPPING, COUNTRY_CODES, COUNTRY_NAMES, aggregate_categories, build_dataset, load_tracker
+from biblio_store import BiblioStore
+from tracker_bootstrap import bootstrap_dataset
+from tracker_clusters import cluster_dataset
+from tracker_search import build_search_index
+from tracker_trends import build_trend_cube
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+DEFAULT_WORKDIR = '.bench'
+# 실제 2020 워크북 기준 중분류당 세부기술 수 (185 / 44)
+DETAILS_PER_CATEGORY = 4.2
+# 회귀 판정 기준 (최솟값 비율) 및 측정 잡음으로 보고 무시할 최소 시간
+REGRESSION_RATIO = 1.25
+NOISE_FLOOR = 0.002
+# 연도별 추이 측정용 조사연도 (같은 데이터를 연도만 바꿔 재사용)
+TREND_YEARS = [2020, 2021, 2022, 2023, 2024, 2025]
+# 대시보드 모듈 cold import 예산 (ms, Streamlit 워커 시작/스크립트 첫 실행 비용)
+STARTUP_MODULE = 'dashboard_260916'
+STARTUP_BUDGET_MS = 2000
+
+# 중분류당 합성 논문/특허 레코드 수
+BIBLIO_RECORDS_PER_CATEGORY = 200
+
+# 국가별 기술수준 평균 (실제 워크북 분포와 비슷하게)
+LEVEL_MEANS = {'kr': 80, 'cn': 78, 'jp': 88, 'us': 98, 'eu': 93}
+RD_TRENDS = ['급상승', '상승', '유지', '하락']
+
+
+def generate_tracker(n_rows, n_categories=None, seed=0):
+    """실제 워크북 컬럼 스키마(한글)를 따르는 합성 세부기술 데이터"""
+    rng = np.random.default_rng(seed)
+    n_categories = n_categories or max(1, min(n_rows, round(n_rows / DETAILS_PER_CATEGORY)))
+    category_ids = np.sort(rng.integers(0, n_categories, n_rows))
+    category_ids[:n_categories] = np.arange(n_categories)
+    category_ids.sort()
+    category_types = np.where(rng.random(n_categories) < 0.7, '감축', '적응')
+    names = dict(zip(COUNTRY_CODES, COUNTRY_NAMES))
+
+    columns = {
+        '번호': np.arange(1, n_rows + 1),
+        '세부기술': [f'세부기술 {i + 1:06d}' for i in range(n_rows)],
+        '중분류': np.array([f'중분류 {i + 1:05d}' for i in range(n_categories)])[category_ids],
+        '38대 번호': category_ids % 38 + 1,
+        '38대 기후기술법': np.array([f'기후기술 {i + 1:02d}' for i in range(38)])[category_ids % 38],
+        '감축/적응': category_types[category_ids],
+    }
+    levels = {code: np.clip(rng.normal(mean, 6, n_rows), 40, 100).round() for code, mean in LEVEL_MEANS.items()}
+    best = np.max(np.stack(list(levels.values())), axis=0)
+    columns['최고 기술 보유국'] = np.array(COUNTRY_NAMES)[np.argmax(np.stack(list(levels.values())), axis=0)]
+    for code in COUNTRY_CODES:
+        gap = np.round((best - levels[code]) / 4 + rng.random(n_rows), 1)
+        columns[f'{names[code]}-기술 수준 (%)'] = levels[code]
+        columns[f'{names[code]}-기술 격차 (년)'] = gap
+        columns[f'{names[code]}-기술 수준 그룹'] = np.select(
+            [levels[code] >= 90, levels[code] >= 75], ['선도', '추격'], '후발')
+    for code in COUNTRY_CODES:
+        columns[f'{names[code]}-연구 개발 활동 경향'] = rng.choice(RD_TRENDS, n_rows, p=[0.1, 0.4, 0.45, 0.05])
+        columns[f'{names[code]}-기초 연구 역량(점)'] = np.clip(levels[code] - rng.normal(10, 8, n_rows), 0, 100).round(1)
+        columns[f'{names[code]}-응용 개발 연구 역량(점)'] = np.clip(levels[code] - rng.normal(8, 8, n_rows), 0, 100).round(1)
+
+    df = pd.DataFrame(columns)
+    # 응답이 비어 있는 셀 (약 1%)
+    numeric = [col for col, name in COLUMN_MAPPING.items() if name.endswith(('level', 'gap', 'research'))]
+    blanks = rng.random((n_rows, len(numeric))) < 0.01
+    df[numeric] = df[numeric].mask(blanks)
+    return df
+
+
+def generate_biblio(categories, seed=0):
+    """중분류마다 BIBLIO_RECORDS_PER_CATEGORY건의 합성 논문/특허 레코드 (biblio_store 입력 형식)"""
+    rng = np.random.default_rng(seed)
+    n = len(categories) * BIBLIO_RECORDS_PER_CATEGORY
+    return pd.DataFrame({
+        'id': [f'R{i:09d}' for i in range(n)],
+        'tech_category': np.repeat(np.asarray(categories), BIBLIO_RECORDS_PER_CATEGORY),
+        'country': rng.choice(COUNTRY_CODES, n),
+        'year': rng.integers(2010, 2025, n),
+        'kind': rng.choice(['paper', 'patent'], n, p=[0.6, 0.4])
+    })
+
+
+def ensure_workbook(workdir, n_rows, seed=0):
+    """{workdir}/{n_rows}/tracker2020.xlsx 생성 (이미 있으면 재사용)"""
+    directory = os.path.join(workdir, str(n_rows))
+    path = os.path.join(directory, 'tracker2020.xlsx')
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        start = time.perf_counter()
+        generate_tracker(n_rows, seed=seed).to_excel(f'{path}.tmp.xlsx', index=False, engine='openpyxl')
+        os.replace(f'{path}.tmp.xlsx', path)
+        print(f"  워크북 생성 {n_rows:,}행: {time.perf_counter() - start:.1f}초", file=sys.stderr)
+    return path
+
+
+def measure(func, repeat, setup=None):
+    """func를 repeat회 실행한 시간 (초) 통계"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': statistics.median(timings), 'repeat': repeat}
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def benchmark_size(path, repeat):
+    """워크북 하나에 대한 구간별 측정 -> {구간: 통계}"""
+    import dashboard_260916 as dashboard
+    from streamlit.logger import set_log_level
+    # 캐시 함수를 런타임 없이 호출할 때의 ScriptRunContext 경고 숨김
+    set_log_level('error')
+
+    cache_dir = os.path.join(os.path.dirname(path), '.tracker_cache')
+    results = {}
+
+    def drop_snapshots():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        dashboard.get_tracker_watcher.clear()
+
+    # 대시보드 로더 (Excel 파싱 + 스냅샷 기록 / 스냅샷 적중)
+    with working_directory(os.path.dirname(path)):
+        cold_repeat = min(repeat, 3)
+        results['load_climate_tech_data.cold'] = measure(dashboard.load_climate_tech_data, cold_repeat, drop_snapshots)
+        results['load_climate_tech_data.warm'] = measure(
+            dashboard.load_climate_tech_data, repeat, dashboard.get_tracker_watcher.clear)
+        dashboard.get_tracker_watcher.clear()
+
+    df, category_data, version = load_tracker(path)
+    results['aggregate_categories'] = measure(lambda: aggregate_categories(df), repeat)
+    results['build_dataset'] = measure(lambda: build_dataset(df, category_data, version), repeat)
+    dataset = build_dataset(df, category_data, version)
+    results['build_search_index'] = measure(
+        lambda: build_search_index(dataset.tensor.categories, df['tech_detail'], df['tech_category']), repeat)
+    results['search'] = measure(lambda: dataset.search.search("세부기술 01", 8), repeat)
+    results['bootstrap_dataset'] = measure(lambda: bootstrap_dataset(dataset), repeat)
+    results['cluster_dataset.category'] = measure(lambda: cluster_dataset(dataset, 'category'), repeat)
+    results['cluster_dataset.detail'] = measure(lambda: cluster_dataset(dataset, 'detail'), min(repeat, 3))
+    clusters = dataset.clusters('detail')
+    results['cluster.neighbors'] = measure(lambda: clusters.neighbors(len(df) // 2), repeat)
+    category = category_data['tech_category'].iloc[0]
+    category_info = category_data.iloc[0]
+    detail = int(dataset.details.rows(category)[0])
+
+    figures = {
+        'create_simple_bar_comparison': lambda: dashboard.create_simple_bar_comparison(
+            dataset, '전체', "기술수준 비교", 'tech_level'),
+        'create_enhanced_heatmap': lambda: dashboard.create_enhanced_heatmap(dataset),
+        'create_radar_chart': lambda: dashboard.create_radar_chart(dataset),
+        'create_category_bar': lambda: dashboard.create_category_bar(dataset, category, 'tech_level'),
+        'create_windowed_heatmap.detail': lambda: dashboard.create_windowed_heatmap(
+            dataset, 'detail', '전체', 'kr', False, len(df) // 2, 30),
+        'create_detail_bar': lambda: dashboard.create_detail_bar(dataset, detail, 'tech_level'),
+        'create_cluster_scatter.detail': lambda: dashboard.create_cluster_scatter(dataset, 'detail'),
+        'create_cluster_profile.detail': lambda: dashboard.create_cluster_profile(dataset, 'detail'),
+    }
+    for name, build in figures.items():
+        results[name] = measure(build, repeat)
+    dashboard.get_figure_cache().clear()
+    dashboard.cached_figure(dashboard.create_enhanced_heatmap, dataset)
+    results['cached_figure.hit'] = measure(
+        lambda: dashboard.cached_figure(dashboard.create_enhanced_heatmap, dataset), repeat)
+
+    tables = {
+        'build_status_table': lambda: dashboard.build_status_table(category_data),
+        'build_rank_table': lambda: dashboard.build_rank_table(category_data, 10),
+        'build_comparison_table': lambda: dashboard.build_comparison_table(category_data, dataset.tensor),
+        'build_country_detail_table': lambda: dashboard.build_country_detail_table(dataset, category_info),
+        'build_rd_table': lambda: dashboard.build_rd_table(dataset, category_info),
+        'build_detail_table': lambda: dashboard.build_detail_table(
+            dataset, detail, ['tech_level', 'tech_gap'], 'tech_group'),
+        'build_cluster_table.detail': lambda: dashboard.build_cluster_table(clusters),
+        'build_neighbor_table.detail': lambda: dashboard.build_neighbor_table(dataset, clusters, len(df) // 2),
+    }
+    for name, build in tables.items():
+        results[name] = measure(build, repeat)
+
+    # 연도별 추이 (전체 연도 쌍 × 중분류 × 국가)
+    datasets = {year: dataset for year in TREND_YEARS}
+    results['build_trend_cube'] = measure(lambda: build_trend_cube(datasets), repeat)
+    results['trend.pairwise'] = measure(
+        lambda: [build_trend_cube(datasets).pairwise(stat) for stat in ('delta', 'annual', 'cagr')], repeat)
+    trends = build_trend_cube(datasets)
+    start, end = TREND_YEARS[0], TREND_YEARS[-1]
+    trend_builds = {
+        'create_trend_lines': lambda: dashboard.create_trend_lines(trends),
+        'create_category_trajectories': lambda: dashboard.create_category_trajectories(trends),
+        'create_change_heatmap': lambda: dashboard.create_change_heatmap(trends, start, end),
+        'build_movers_table': lambda: dashboard.build_movers_table(trends, start, end),
+    }
+    for name, build in trend_builds.items():
+        results[name] = measure(build, repeat)
+
+    # 논문·특허 저장소 (덤프 가져오기 + rollups 재계산 / 중분류 조회)
+    biblio_dir = os.path.join(os.path.dirname(path), 'biblio')
+    dump = os.path.join(biblio_dir, 'records.csv')
+    if not os.path.exists(dump):
+        os.makedirs(biblio_dir, exist_ok=True)
+        generate_biblio(category_data['tech_category'].to_numpy()).to_csv(dump, index=False)
+    db_path = os.path.join(biblio_dir, 'biblio.sqlite3')
+
+    def drop_db():
+        for suffix in ('', '-wal', '-shm'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(db_path + suffix)
+
+    results['biblio_store.import'] = measure(lambda: BiblioStore(db_path).import_files([dump]), min(repeat, 3), drop_db)
+    store = BiblioStore(db_path)
+    results['biblio_store.category_summary'] = measure(lambda: store.category_summary(category), repeat)
+    results['biblio_store.category_years'] = measure(lambda: store.category_years(category), repeat)
+    summary, years = store.category_summary(category), store.category_years(category)
+    store.close()
+    results['create_biblio_trend'] = measure(lambda: dashboard.create_biblio_trend(years, 'paper'), repeat)
+    results['build_biblio_table'] = measure(
+        lambda: dashboard.build_biblio_table(summary, 'paper', dashboard.DEFAULT_WINDOW), repeat)
+
+    return results
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> [(들여쓰기 깊이, 모듈, 누적 시간 초)]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1e6))
+    return entries
+
+
+def measure_startup(repeat, module=STARTUP_MODULE):
+    """새 인터프리터의 모듈 import 시간 -> (구간별 통계, 가장 무거운 직접 import 모듈)"""
+    imports, walls = [], []
+    heaviest = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        walls.append(time.perf_counter() - start)
+        # 자식 모듈은 부모보다 먼저, 한 단계 깊게 출력됨
+        children = []
+        for depth, name, seconds in parse_importtime(proc.stderr):
+            if depth == 0 and name == module:
+                imports.append(seconds)
+                break
+            if depth == 0:
+                children = []
+            elif depth == 1:
+                children.append((name, seconds))
+        for name, seconds in children:
+            heaviest[name] = min(seconds, heaviest.get(name, seconds))
+
+    def stats(timings):
+        return {'min': min(timings), 'median': statistics.median(timings), 'repeat': repeat}
+
+    top = dict(sorted(heaviest.items(), key=lambda item: -item[1])[:10])
+    return {f'import {module}': stats(imports), 'interpreter (wall)': stats(walls)}, top
+
+
+def environment_info():
+    """결과 비교용 실행 환경 (커밋, 버전)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import plotly
+    import streamlit
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plotly': plotly.__version__,
+        'streamlit': streamlit.__version__,
+    }
+
+
+def compare_results(current, baseline, ratio=REGRESSION_RATIO, noise_floor=NOISE_FLOOR):
+    """기준 결과 대비 최솟값 비율 -> (출력 행 목록, 회귀 구간 목록)
+
+    공유 머신에서는 중앙값의 흔들림이 커서 반복 측정의 최솟값으로 비교한다.
+    """
+    lines = []
+    regressions = []
+    for size, stages in current['results'].items():
+        base_stages = baseline.get('results', {}).get(size, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            change = stats['min'] / base['min'] if base['min'] else float('inf')
+            slower = change > ratio and stats['min'] - base['min'] > noise_floor
+            mark = '  ⚠ 회귀' if slower else ''
+            lines.append(f"{size:>7} {stage:<32} {base['min'] * 1000:10.2f}ms → "
+                         f"{stats['min'] * 1000:10.2f}ms  x{change:.2f}{mark}")
+            if slower:
+                regressions.append((size, stage))
+    return lines, regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='대시보드 성능 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help='세부기술 행 수 목록 (값 없이 주면 시작 시간만 측정)')
+    parser.add_argument('--repeat', type=int, default=5, help='구간별 반복 횟수 (기본: 5)')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help=f'합성 워크북 폴더 (기본: {DEFAULT_WORKDIR})')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 시드')
+    parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+    parser.add_argument('--compare', help='비교할 기준 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO,
+                        help=f'회귀로 판정할 최솟값 비율 (기본: {REGRESSION_RATIO})')
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_MS,
+                        help=f'{STARTUP_MODULE} import 시간 예산 ms (기본: {STARTUP_BUDGET_MS})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {'environment': environment_info(), 'results': {}}
+    startup, heaviest = measure_startup(args.repeat)
+    report['results']['startup'] = startup
+    report['startup_modules'] = heaviest
+    import_seconds = startup[f'import {STARTUP_MODULE}']['min']
+    print(f"  시작 시간 (import {STARTUP_MODULE}): {import_seconds * 1000:.0f}ms / 예산 {args.startup_budget:.0f}ms",
+          file=sys.stderr)
+
+    for n_rows in args.sizes:
+        path = os.path.abspath(ensure_workbook(args.workdir, n_rows, args.seed))
+        start = time.perf_counter()
+        report['results'][str(n_rows)] = benchmark_size(path, args.repeat)
+        print(f"  {n_rows:,}행 측정: {time.perf_counter() - start:.1f}초", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    status = 0
+    if import_seconds * 1000 > args.startup_budget:
+        print("시작 시간 예산 초과 - 무거운 import:", file=sys.stderr)
+        for name, seconds in heaviest.items():
+            print(f"  {name:<24} {seconds * 1000:8.1f}ms", file=sys.stderr)
+        status = 1
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressions = compare_results(report, baseline, args.threshold)
+        print('\n'.join(lines), file=sys.stderr)
+        if regressions:
+            print(f"회귀 {len(regressions)}건 (기준 x{args.threshold})", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
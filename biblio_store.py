@@ -0,0 +1,310 @@
+"""논문·특허 서지 통계 저장소 (로컬 SQLite, Streamlit 없이 사용 가능)
+
+    python biblio_store.py import papers.csv patents.jsonl     # 기본 DB: biblio.sqlite3
+    python biblio_store.py import dump.csv --kind patent --db /data/biblio.sqlite3
+    python biblio_store.py summary 수소                          # 중분류 하나의 국가별 건수/증가율
+
+원본 레코드는 records 표에 (tech_category, country, year, kind) 색인과 함께 쌓고, 가져오기가 끝나면
+레코드가 추가된 중분류의 (중분류, 종류, 국가, 연도)별 건수를 rollups 표에 다시 계산해 둔다. 조회는
+rollups만 기본 키 범위로 읽으므로 원본 레코드 수와 관계없이 중분류 전환이 색인 조회로 끝난다.
+읽기 연결은 읽기 전용으로 열어 풀로 재사용하며, WAL 모드라 가져오기 중에도 읽을 수 있다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from tracker_data import COUNTRY_CODES, COUNTRY_NAMES
+
+BIBLIO_DB_ENV = 'TRACKER_BIBLIO_DB'
+DEFAULT_DB = 'biblio.sqlite3'
+KINDS = {'paper': '논문', 'patent': '특허'}
+# 최근 건수/증가율 비교 구간 (년)
+DEFAULT_WINDOW = 5
+POOL_SIZE = 4
+IMPORT_CHUNK_ROWS = 100_000
+
+# 입력 컬럼 별칭 (영문/한글 헤더 모두 허용) -> 표준 컬럼
+INPUT_COLUMNS = {
+    'tech_category': 'tech_category', '중분류': 'tech_category',
+    'country': 'country', '국가': 'country',
+    'year': 'year', '연도': 'year', '발행연도': 'year', '출원연도': 'year',
+    'kind': 'kind', '종류': 'kind', '구분': 'kind',
+    'id': 'source_id', 'source_id': 'source_id', 'doi': 'source_id', '식별자': 'source_id',
+    'title': 'title', '제목': 'title'
+}
+# 국가 표기 (코드, 한글명, 영문 약어) -> 국가 코드
+COUNTRY_ALIASES = {
+    **{code: code for code in COUNTRY_CODES},
+    **dict(zip(COUNTRY_NAMES, COUNTRY_CODES)),
+    **dict(zip([name.lower() for name in COUNTRY_NAMES], COUNTRY_CODES)),
+    'korea': 'kr', 'china': 'cn', 'japan': 'jp', 'usa': 'us', 'us': 'us', 'eu': 'eu'
+}
+KIND_ALIASES = {**{kind: kind for kind in KINDS}, **{label: kind for kind, label in KINDS.items()},
+                'papers': 'paper', 'patents': 'patent', 'article': 'paper'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source_id TEXT,
+    tech_category TEXT NOT NULL,
+    country TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    title TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS records_source ON records (kind, source_id) WHERE source_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS records_key ON records (tech_category, country, year, kind);
+CREATE TABLE IF NOT EXISTS rollups (
+    tech_category TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    country TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (tech_category, kind, country, year)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def biblio_path():
+    """DB 경로, TRACKER_BIBLIO_DB 환경변수로 조정"""
+    return os.environ.get(BIBLIO_DB_ENV) or DEFAULT_DB
+
+
+def _lookup(aliases, value):
+    if pd.isna(value):
+        return None
+    text = str(value).strip()
+    return aliases.get(text.lower(), aliases.get(text))
+
+
+def normalize_records(frame, kind=None):
+    """입력 표 -> (kind, source_id, tech_category, country, year, title) 표, 버린 행 수
+
+    필수 컬럼이 없으면 ValueError, 필수 값이 비었거나 알 수 없는 국가/종류인 행은 버린다.
+    """
+    frame = frame.rename(columns=lambda name: INPUT_COLUMNS.get(str(name).strip(), str(name).strip()))
+    missing = [name for name in ('tech_category', 'country', 'year') + (() if kind else ('kind',)) if name not in frame]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)} (종류 컬럼이 없으면 kind를 지정)")
+    n = len(frame)
+    column = lambda name: frame[name] if name in frame else pd.Series([None] * n, index=frame.index, dtype=object)
+
+    kinds = pd.Series([kind] * n, index=frame.index, dtype=object) if kind else column('kind')
+    records = pd.DataFrame({
+        'kind': kinds.map(lambda value: _lookup(KIND_ALIASES, value)),
+        'source_id': column('source_id').astype(object),
+        'tech_category': column('tech_category').astype(object).str.strip(),
+        'country': column('country').map(lambda value: _lookup(COUNTRY_ALIASES, value)),
+        'year': pd.to_numeric(column('year'), errors='coerce'),
+        'title': column('title').astype(object)
+    })
+    valid = records[['kind', 'tech_category', 'country', 'year']].notna().all(axis=1) & (records['tech_category'] != '')
+    records = records[valid].astype({'year': np.int64})
+    # 빈 문자열 식별자는 중복 판정에서 제외
+    records['source_id'] = records['source_id'].map(
+        lambda value: None if pd.isna(value) or str(value).strip() == '' else str(value).strip())
+    records['title'] = records['title'].map(lambda value: None if pd.isna(value) else str(value))
+    return records, n - len(records)
+
+
+def read_dump(path, chunk_rows=IMPORT_CHUNK_ROWS):
+    """CSV/JSONL 덤프를 chunk_rows 행씩 읽는 반복자 (모든 값은 문자열)"""
+    if path.lower().endswith(('.jsonl', '.ndjson', '.json')):
+        with pd.read_json(path, lines=True, dtype=False, chunksize=chunk_rows) as reader:
+            yield from reader
+    else:
+        yield from pd.read_csv(path, dtype=str, chunksize=chunk_rows, encoding='utf-8-sig')
+
+
+class BiblioStore:
+    """논문·특허 레코드 저장 및 중분류별 집계 조회 (스레드 간 공유 가능)"""
+
+    def __init__(self, path=None, pool_size=POOL_SIZE):
+        self.path = os.path.abspath(path or biblio_path())
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._write_lock = threading.Lock()
+
+    def _connect(self, readonly):
+        if readonly:
+            conn = sqlite3.connect(f"file:{quote(self.path)}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextlib.contextmanager
+    def reader(self):
+        """풀에서 읽기 전용 연결 대여 (풀이 비면 새로 열고, 가득 차면 반납 시 닫음)"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(readonly=True)
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def import_files(self, paths, kind=None, chunk_rows=IMPORT_CHUNK_ROWS):
+        """CSV/JSONL 덤프 가져오기 -> 통계 {'inserted', 'duplicates', 'skipped', 'categories', 'seconds'}
+
+        kind를 주면 파일의 종류 컬럼 대신 사용한다. 식별자(id/doi)가 같은 레코드는 한 번만 저장하며,
+        끝나면(중간 파일이 실패해도) 가져온 중분류의 rollups만 다시 계산한다.
+        """
+        start = time.perf_counter()
+        stats = {'inserted': 0, 'duplicates': 0, 'skipped': 0}
+        categories = set()
+        with self._write_lock, contextlib.closing(self._connect(readonly=False)) as conn:
+            conn.executescript(SCHEMA)
+            try:
+                for path in paths:
+                    # 파일 하나가 한 트랜잭션 (실패하면 그 파일만 되돌림)
+                    with conn:
+                        for chunk in read_dump(path, chunk_rows):
+                            records, skipped = normalize_records(chunk, kind)
+                            before = conn.total_changes
+                            conn.executemany(
+                                "INSERT OR IGNORE INTO records (kind, source_id, tech_category, country, year, title) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                zip(*(records[name].tolist() for name in records.columns))
+                            )
+                            inserted = conn.total_changes - before
+                            stats['inserted'] += inserted
+                            stats['duplicates'] += len(records) - inserted
+                            stats['skipped'] += skipped
+                            categories.update(records['tech_category'].unique())
+            finally:
+                with conn:
+                    self._rebuild_rollups(conn, sorted(categories))
+        stats['categories'] = len(categories)
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    @staticmethod
+    def _rebuild_rollups(conn, categories):
+        # records_key 색인의 중분류 범위만 읽어 다시 집계
+        for category in categories:
+            conn.execute("DELETE FROM rollups WHERE tech_category = ?", (category,))
+            conn.execute(
+                "INSERT INTO rollups (tech_category, kind, country, year, count) "
+                "SELECT tech_category, kind, country, year, COUNT(*) FROM records "
+                "WHERE tech_category = ? GROUP BY kind, country, year",
+                (category,)
+            )
+        latest = conn.execute("SELECT MAX(year) FROM rollups").fetchone()[0]
+        version = int((conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() or ('0',))[0]) + 1
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                         [('version', str(version)), ('latest_year', str(latest))])
+
+    def meta(self):
+        """{'version': 가져오기 횟수, 'latest_year': 전체 레코드의 최근 연도} (데이터가 없으면 None)"""
+        try:
+            with self.reader() as conn:
+                rows = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.OperationalError:
+            return None
+        if 'version' not in rows or rows.get('latest_year') in (None, 'None'):
+            return None
+        return {'version': int(rows['version']), 'latest_year': int(rows['latest_year'])}
+
+    def category_years(self, category):
+        """중분류 하나의 연도별 건수 (kind, country, year, count)"""
+        with self.reader() as conn:
+            rows = conn.execute(
+                "SELECT kind, country, year, count FROM rollups WHERE tech_category = ? ORDER BY kind, country, year",
+                (category,)
+            ).fetchall()
+        return pd.DataFrame(rows, columns=['kind', 'country', 'year', 'count'])
+
+    def category_summary(self, category, window=DEFAULT_WINDOW, latest_year=None):
+        """중분류 하나의 종류 × 국가별 최근 window년 건수와 직전 window년 대비 증가율(%)
+
+        -> (kind, country, recent, previous, growth) 표, 모든 종류/국가 조합을 COUNTRY_CODES 순서로 포함.
+        latest_year를 주지 않으면 저장소 전체의 최근 연도를 기준으로 한다 (중분류 간 같은 구간 비교).
+        """
+        if latest_year is None:
+            meta = self.meta()
+            latest_year = None if meta is None else meta['latest_year']
+        kinds = list(KINDS)
+        # (종류, 국가, [최근, 직전])
+        counts = np.zeros((len(kinds), len(COUNTRY_CODES), 2), dtype=np.int64)
+        if latest_year is not None:
+            with self.reader() as conn:
+                rows = conn.execute(
+                    "SELECT kind, country, year, count FROM rollups WHERE tech_category = ? AND year > ? AND year <= ?",
+                    (category, latest_year - 2 * window, latest_year)
+                ).fetchall()
+            for kind, country, year, count in rows:
+                if kind in KINDS and country in COUNTRY_CODES:
+                    counts[kinds.index(kind), COUNTRY_CODES.index(country), int(year <= latest_year - window)] += count
+        recent, previous = counts[..., 0].ravel(), counts[..., 1].ravel()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            growth = np.where(previous > 0, (recent / previous - 1) * 100, np.nan)
+        return pd.DataFrame({
+            'kind': np.repeat(kinds, len(COUNTRY_CODES)),
+            'country': np.tile(COUNTRY_CODES, len(kinds)),
+            'recent': recent,
+            'previous': previous,
+            'growth': growth
+        })
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='논문·특허 서지 통계 저장소')
+    parser.add_argument('--db', default=None, help=f'SQLite 파일 (기본: ${BIBLIO_DB_ENV} 또는 {DEFAULT_DB})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help='CSV/JSONL 덤프 가져오기')
+    importer.add_argument('paths', nargs='+', help='덤프 파일 (.csv, .jsonl)')
+    importer.add_argument('--kind', choices=list(KINDS), help='모든 레코드의 종류 (파일에 종류 컬럼이 없을 때)')
+    importer.add_argument('--chunk-rows', type=int, default=IMPORT_CHUNK_ROWS, help='한 번에 읽는 행 수')
+    summary = commands.add_parser('summary', help='중분류의 국가별 건수/증가율 출력')
+    summary.add_argument('category', help='중분류명')
+    summary.add_argument('--window', type=int, default=DEFAULT_WINDOW, help=f'비교 구간 (기본: {DEFAULT_WINDOW}년)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = BiblioStore(args.db)
+    if args.command == 'import':
+        try:
+            stats = store.import_files(args.paths, args.kind, args.chunk_rows)
+        except (OSError, ValueError) as e:
+            print(f"가져오기 실패: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(stats, ensure_ascii=False))
+        return 0
+
+    if not os.path.exists(store.path):
+        print(f"DB 파일이 없습니다: {store.path}", file=sys.stderr)
+        return 1
+    print(store.category_summary(args.category, args.window).to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
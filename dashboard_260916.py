@@ -1,24 +1,26 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import numpy as np
-import io
 from datetime import datetime
+import os
 import warnings
+import functools
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import instrumentation
+from instrumentation import profiled, span
+from figure_cache import FigureCache
+from prewarm import Prewarm, prewarm_enabled
+from biblio_store import DEFAULT_WINDOW, KINDS, BiblioStore, biblio_path
+from tracker_data import COUNTRY_CODES, COUNTRY_NAMES
+from tracker_clusters import (CLUSTER_LEVELS, CLUSTER_METHODS, FEATURE_MODES, HIERARCHICAL_MAX_ROWS,
+                              hierarchical_available)
+from tracker_trends import build_trend_cube
+from tracker_watch import TrackerWatcher, watch_interval
+from tracker_export import to_csv_bytes, to_parquet_bytes, to_xlsx_bytes, workbook_sheets
 warnings.filterwarnings('ignore')
 
-# 페이지 설정
-st.set_page_config(
-    page_title="🌍 기후기술 델파이조사 분석 대시보드",
-    page_icon="🌍",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
 # CSS 스타일
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -64,7 +66,7 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # 기술 설명 데이터 (실제 데이터로 추후 교체 예정)
 TECH_DESCRIPTIONS = {
@@ -85,151 +87,197 @@ TECH_DESCRIPTIONS = {
     }
 }
 
-# 캐시된 데이터 로딩 함수
-@st.cache_data(ttl=3600)
+# 캐시된 데이터 로딩 함수 (읽기 전용 데이터 모델을 복사 없이 공유)
+# 워크북 감시 (프로세스당 하나). 워크북이 바뀌면 바뀐 행이 속한 중분류만 재집계(파생 구조와 버전 키 figure는 전체 재생성)하고 generation을 올림
+@st.cache_resource
+def get_tracker_watcher():
+    """전체 조사연도 데이터셋 로드 및 변경 감시 시작 (Arrow 스냅샷이 최신이면 Excel 파싱 생략)
+    
+    스냅샷은 레플리카 간 공유되며 memory-map으로 연결하고, 갱신은 잠금을 얻은 한 프로세스만 수행
+    """
+    instrumentation.mark(cache='miss')
+    with span('TrackerWatcher'):
+        watcher = TrackerWatcher('.')
+    if not watcher.datasets:
+        raise FileNotFoundError("tracker20XX.xlsx 파일을 찾을 수 없습니다.")
+    return watcher.start()
+
 def load_climate_tech_data():
-    """기후기술 데이터 로드 및 전처리"""
+    """기후기술 데이터 (최신 조사연도 TrackerDataset)
+    
+    세부기술 df, 중분류 category_data와 함께 중분류 × 국가 × 지표 텐서 및 필터별 집계 큐브를 포함
+    """
     try:
-        # Excel 파일 읽기
-        df = pd.read_excel('tracker2020.xlsx', sheet_name=0)
-        
-        # 컬럼명 정리
-        column_mapping = {
-            '세부기술': 'tech_detail',
-            '중분류': 'tech_category',
-            '감축/적응': 'type',
-            '최고 기술 보유국': 'leading_country',
-            '한국-기술 수준 (%)': 'kr_tech_level',
-            '한국-기술 격차 (년)': 'kr_tech_gap',
-            '한국-기술 수준 그룹': 'kr_tech_group',
-            '중국-기술 수준 (%)': 'cn_tech_level',
-            '중국-기술 격차 (년)': 'cn_tech_gap',
-            '일본-기술 수준 (%)': 'jp_tech_level',
-            '일본-기술 격차 (년)': 'jp_tech_gap',
-            '미국-기술 수준 (%)': 'us_tech_level',
-            '미국-기술 격차 (년)': 'us_tech_gap',
-            'EU-기술 수준 (%)': 'eu_tech_level',
-            'EU-기술 격차 (년)': 'eu_tech_gap',
-            '한국-연구 개발 활동 경향': 'kr_rd_trend',
-            '한국-기초 연구 역량(점)': 'kr_basic_research',
-            '한국-응용 개발 연구 역량(점)': 'kr_applied_research',
-            '중국-연구 개발 활동 경향': 'cn_rd_trend',
-            '중국-기초 연구 역량(점)': 'cn_basic_research',
-            '중국-응용 개발 연구 역량(점)': 'cn_applied_research',
-            '일본-연구 개발 활동 경향': 'jp_rd_trend',
-            '일본-기초 연구 역량(점)': 'jp_basic_research',
-            '일본-응용 개발 연구 역량(점)': 'jp_applied_research',
-            '미국-연구 개발 활동 경향': 'us_rd_trend',
-            '미국-기초 연구 역량(점)': 'us_basic_research',
-            '미국-응용 개발 연구 역량(점)': 'us_applied_research',
-            'EU-연구 개발 활동 경향': 'eu_rd_trend',
-            'EU-기초 연구 역량(점)': 'eu_basic_research',
-            'EU-응용 개발 연구 역량(점)': 'eu_applied_research'
-        }
-        
-        df = df.rename(columns=column_mapping)
-        
-        # 숫자 컬럼 변환
-        numeric_cols = [col for col in df.columns if 'tech_level' in col or 'tech_gap' in col or 'research' in col]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # 중분류별 데이터 집계 (평균값 사용)
-        category_data = df.groupby('tech_category').agg({
-            'type': 'first',
-            'kr_tech_level': 'mean',
-            'kr_tech_gap': 'mean',
-            'kr_tech_group': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'cn_tech_level': 'mean',
-            'cn_tech_gap': 'mean',
-            'jp_tech_level': 'mean',
-            'jp_tech_gap': 'mean',
-            'us_tech_level': 'mean',
-            'us_tech_gap': 'mean',
-            'eu_tech_level': 'mean',
-            'eu_tech_gap': 'mean',
-            'kr_rd_trend': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'kr_basic_research': 'mean',
-            'kr_applied_research': 'mean',
-            'cn_basic_research': 'mean',
-            'cn_applied_research': 'mean',
-            'jp_basic_research': 'mean',
-            'jp_applied_research': 'mean',
-            'us_basic_research': 'mean',
-            'us_applied_research': 'mean',
-            'eu_basic_research': 'mean',
-            'eu_applied_research': 'mean',
-            'leading_country': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'tech_detail': 'count'
-        }).reset_index()
-        
-        # 컬럼명 변경
-        category_data = category_data.rename(columns={'tech_detail': 'detail_count'})
-        
-        return df, category_data
+        generation, dataset = get_tracker_watcher().current()
+        st.session_state['data_generation'] = generation
+        return dataset
         
     except Exception as e:
         st.error(f"데이터 로드 오류: {str(e)}")
-        return None, None
+        return None
+
+@st.cache_resource(max_entries=2)
+def load_trend_cube(generation=None):
+    """조사연도 × 중분류 × 국가 × 지표 추이 배열 (generation: 감시기 갱신 번호)"""
+    instrumentation.mark(cache='miss')
+    try:
+        return build_trend_cube(get_tracker_watcher().datasets)
+        
+    except Exception as e:
+        st.error(f"연도별 추이 데이터 구성 오류: {str(e)}")
+        return None
 
-# 경량화된 시각화 함수들
-def create_simple_bar_comparison(data, title, metric_col, countries=['한국', '중국', '일본', '미국', 'EU']):
-    """단순하고 빠른 막대그래프"""
-    country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
-    values = [data[f'{code}_{metric_col}'].mean() for code in country_codes]
+# 논문·특허 저장소 (프로세스당 하나, 읽기 연결 풀 공유). DB 파일이 생기면 다음 조회부터 연결
+@st.cache_resource
+def open_biblio_store(path):
+    return BiblioStore(path)
+
+def get_biblio_store():
+    """논문·특허 저장소 (DB 파일이 없으면 None)"""
+    path = os.path.abspath(biblio_path())
+    return open_biblio_store(path) if os.path.exists(path) else None
+
+# figure 캐시 (프로세스 공유, 데이터 버전 + 함수 + 인자 키). 아래 figure는 데이터 버전 대신 중분류 집계 해시를 키로 사용
+CATEGORY_FIGURES = {'create_category_bar'}
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+def cached_figure(builder, dataset, *args):
+    """figure 캐시를 거쳐 builder(dataset, *args) 결과 반환 (args는 해시 가능해야 함)"""
+    # 중분류 하나만 그리는 figure는 그 중분류 집계가 바뀔 때만 다시 생성
+    if builder.__name__ in CATEGORY_FIGURES:
+        key = (dataset.category_versions[args[0]], builder.__name__, args)
+    else:
+        key = (dataset.version, builder.__name__, args)
+    
+    def build():
+        instrumentation.mark(cache='miss')
+        return builder(dataset, *args)
+    
+    with span('cached_figure', figure=builder.__name__, cache='hit'):
+        return get_figure_cache().get_or_build(key, build)
+
+def show_chart(fig, **kwargs):
+    """st.plotly_chart (브라우저 전송용 직렬화 구간 계측)"""
+    with span('plotly_chart'):
+        st.plotly_chart(fig, **kwargs)
+
+# 성능 계측 (TRACKER_PROFILE=1 환경변수 또는 ?debug=1 쿼리 파라미터로 활성화, 메모리는 TRACKER_PROFILE_MEMORY=1일 때만)
+def start_profiling(**context):
+    """현재 스크립트 실행의 계측 시작 -> 활성화 여부"""
+    enabled = instrumentation.enabled_by_env() or st.query_params.get('debug') == '1'
+    ctx = get_script_run_ctx()
+    instrumentation.begin_run(enabled, session=ctx.session_id if ctx else None, **context)
+    return enabled
+
+def profiled_fragment(func):
+    """fragment 단독 재실행 시에도 계측되도록 필요하면 계측을 시작한 뒤 구간 기록"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        standalone = not instrumentation.is_enabled()
+        if standalone:
+            start_profiling(fragment=func.__name__)
+        try:
+            with span(func.__name__):
+                return func(*args, **kwargs)
+        finally:
+            if standalone:
+                instrumentation.end_run()
+    return wrapper
+
+def render_debug_panel():
+    """사이드바 성능 계측 패널 (현재 전체 실행의 구간별 기록 + figure 캐시 상태)"""
+    records = instrumentation.records()
+    with st.sidebar.expander("🛠️ 성능 계측", expanded=False):
+        if records:
+            total_ms = sum(record['ms'] for record in records if record['depth'] == 0)
+            st.caption(f"이번 실행 계측 합계 {total_ms:.1f}ms (fragment 단독 재실행은 로그에만 기록)")
+            table = pd.DataFrame(records)
+            table['section'] = ['· ' * depth + section for depth, section in zip(table['depth'], table['section'])]
+            st.dataframe(table.drop(columns='depth'), hide_index=True, use_container_width=True)
+        stats = get_figure_cache().stats()
+        st.caption(
+            f"figure 캐시: 적중 {stats['hits']} / 미적중 {stats['misses']} ({stats['hit_rate']:.0%}), "
+            f"{stats['entries']}개, {stats['bytes'] / 1024 / 1024:.1f}/{stats['max_bytes'] / 1024 / 1024:.0f}MB, "
+            f"제거 {stats['evictions']}"
+        )
+
+# 국가 표시명/색상 (tensor.countries 순서)
+COUNTRY_LABELS = dict(zip(COUNTRY_CODES, COUNTRY_NAMES))
+COUNTRY_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
+
+def confidence_error_bars(values, low, high):
+    """부트스트랩 신뢰구간 -> plotly 비대칭 error bar 설정"""
+    return dict(type='data', symmetric=False, array=np.maximum(high - values, 0),
+                arrayminus=np.maximum(values - low, 0), color='#374151', thickness=1.5, width=6)
+
+def value_axis_range(values, headroom=1.2):
+    """0부터 최댓값 × headroom까지의 축 범위 (값이 하나도 없으면 None, plotly 자동 범위)"""
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    return [0, float(finite.max()) * headroom] if len(finite) else None
+
+# 경량화된 시각화 함수들 (plotly는 차트를 그리는 분기에서 처음 호출될 때 import)
+@profiled
+def create_simple_bar_comparison(dataset, selected_type, title, metric_col):
+    """단순하고 빠른 막대그래프 (중분류 평균)"""
+    import plotly.graph_objects as go
+    cube, bootstrap = dataset.cube, dataset.bootstrap()
+    values = cube.get('mean', selected_type, metric=metric_col)
+    low = bootstrap.get('mean_low', selected_type, metric_col)
+    high = bootstrap.get('mean_high', selected_type, metric_col)
+    unit = "%" if 'level' in metric_col else "년"
     
     fig = go.Figure(data=[
         go.Bar(
-            x=countries,
+            x=[COUNTRY_LABELS[code] for code in cube.countries],
             y=values,
-            marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
-            text=[f"{val:.1f}%" if 'level' in metric_col else f"{val:.1f}년" for val in values],
-            textposition='outside'
+            marker_color=COUNTRY_COLORS,
+            error_y=confidence_error_bars(values, low, high),
+            customdata=np.column_stack([low, high]),
+            text=[f"{val:.1f}{unit}" for val in values],
+            textposition='outside',
+            hovertemplate=f"%{{x}}: %{{y:.1f}}{unit}<br>95% 신뢰구간 %{{customdata[0]:.1f}}~%{{customdata[1]:.1f}}{unit}<extra></extra>"
         )
     ])
     
     fig.update_layout(
         title=title,
         height=300,
-        yaxis=dict(range=[0, max(values) * 1.2])
+        yaxis=dict(range=value_axis_range(high))
     )
     
     return fig
 
-def create_enhanced_heatmap(data, title="기술수준 히트맵"):
+@profiled
+def create_enhanced_heatmap(dataset, selected_type='전체', title="기술수준 히트맵"):
     """향상된 가시성의 히트맵"""
-    countries = ['한국', '중국', '일본', '미국', 'EU']
-    country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
+    import plotly.graph_objects as go
+    cube = dataset.cube
+    f = cube.filters.get_loc(selected_type)
     
     # 상위 15개만 표시 (성능 최적화)
-    top_data = data.nlargest(15, 'kr_tech_level') if len(data) > 15 else data
-    
-    heatmap_values = []
-    heatmap_text = []
-    
-    for _, row in top_data.iterrows():
-        values = [row[f'{code}_tech_level'] for code in country_codes]
-        texts = [f"<b>{val:.1f}%</b>" for val in values]
-        heatmap_values.append(values)
-        heatmap_text.append(texts)
+    rows = cube.order[f][:15] if cube.category_count[f] > 15 else cube.members[f]
+    top_data = dataset.tensor.select(rows)
     
     fig = go.Figure(data=go.Heatmap(
-        z=heatmap_values,
-        x=countries,
-        y=[name[:15] + "..." if len(name) > 15 else name for name in top_data['tech_category']],
+        z=top_data.metric('tech_level'),
+        x=[COUNTRY_LABELS[code] for code in top_data.countries],
+        y=[name[:15] + "..." if len(name) > 15 else name for name in top_data.categories],
         colorscale='RdYlGn',
         zmid=80,
         zmin=60,
         zmax=100,
-        text=heatmap_text,
-        texttemplate="%{text}",
+        texttemplate="<b>%{z:.1f}%</b>",
         textfont={"size": 14, "color": "white"},  # 폰트 크기 증대
         colorbar=dict(title=dict(text="기술수준(%)", font=dict(size=14)))
     ))
     
     fig.update_layout(
         title=dict(text=title, font=dict(size=20)),  # 제목 폰트 크기 증대
-        height=max(400, len(top_data) * 40),
+        height=max(400, len(top_data.categories) * 40),
         xaxis=dict(title=dict(text="국가", font=dict(size=14))),
         yaxis=dict(title=dict(text="중분류", font=dict(size=14))),
         font=dict(size=12)
@@ -237,41 +285,75 @@ def create_enhanced_heatmap(data, title="기술수준 히트맵"):
     
     return fig
 
-def create_radar_chart(data, selected_type='전체', selected_countries=['한국', '중국', '일본', '미국', 'EU']):
-    """국가별 기술경쟁력 레이더 차트"""
+# 전체 히트맵 구간 (한 번에 전송하는 행 수 선택지, 단위별 표시명)
+HEATMAP_WINDOWS = [20, 30, 50, 100]
+HEATMAP_LEVELS = {'category': '중분류', 'detail': '세부기술'}
+
+@profiled
+def create_windowed_heatmap(dataset, level='category', selected_type='전체', sort_by='kr', ascending=False,
+                            start=0, size=HEATMAP_WINDOWS[1]):
+    """전체 중분류/세부기술 히트맵의 한 구간 (필터 전체 요약 행 + 정렬 순서 start부터 size개 행)"""
+    import plotly.graph_objects as go
+    matrix = dataset.heatmaps[level]
+    rows = matrix.rows(selected_type, sort_by, ascending)[start:start + size]
+    summary = matrix.summary(selected_type)
     
-    if selected_type != '전체':
-        filtered_data = data[data['type'] == selected_type]
-    else:
-        filtered_data = data
+    z = np.vstack([np.vstack(list(summary.values())), matrix.values[rows]])
+    y = [f"〈{name}〉" for name in summary] + [
+        f"{start + i + 1}. {name[:20] + '...' if len(name) > 20 else name}"
+        for i, name in enumerate(matrix.labels[rows])
+    ]
+    groups = np.concatenate([np.full(len(summary), f"{HEATMAP_LEVELS[level]} {len(matrix.members(selected_type))}개"),
+                             matrix.categories[rows]])
     
-    # 상위 8개 중분류만 표시 (성능 및 가독성)
-    top_categories = filtered_data.nlargest(8, 'kr_tech_level')
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=[COUNTRY_LABELS[code] for code in matrix.countries],
+        y=y,
+        customdata=np.repeat(groups[:, None], len(matrix.countries), axis=1),
+        colorscale='RdYlGn',
+        zmid=80,
+        zmin=60,
+        zmax=100,
+        texttemplate="<b>%{z:.1f}%</b>",
+        textfont={"size": 12, "color": "white"},
+        hovertemplate="%{y}<br>%{customdata}<br>%{x}: %{z:.1f}%<extra></extra>",
+        colorbar=dict(title=dict(text="기술수준(%)", font=dict(size=14)))
+    ))
     
-    country_codes = {'한국': 'kr', '중국': 'cn', '일본': 'jp', '미국': 'us', 'EU': 'eu'}
-    colors = {'한국': '#FF6B6B', '중국': '#4ECDC4', '일본': '#45B7D1', '미국': '#96CEB4', 'EU': '#FECA57'}
+    fig.update_layout(
+        height=max(300, len(y) * 28 + 120),
+        margin=dict(t=30),
+        xaxis=dict(side='top'),
+        yaxis=dict(autorange='reversed', title=dict(text=HEATMAP_LEVELS[level], font=dict(size=14))),
+        font=dict(size=12)
+    )
     
-    # 레이더 차트용 데이터 생성
-    radar_data = []
-    for _, row in top_categories.iterrows():
-        radar_entry = {'category': row['tech_category'][:10] + "..." if len(row['tech_category']) > 10 else row['tech_category']}
-        for country in selected_countries:
-            if country in country_codes:
-                code = country_codes[country]
-                radar_entry[country] = row[f'{code}_tech_level']
-        radar_data.append(radar_entry)
+    return fig
+
+@profiled
+def create_radar_chart(dataset, selected_type='전체', selected_countries=tuple(COUNTRY_NAMES)):
+    """국가별 기술경쟁력 레이더 차트"""
+    import plotly.graph_objects as go
+    cube = dataset.cube
+    
+    # 상위 8개 중분류만 표시 (성능 및 가독성)
+    top_categories = dataset.tensor.select(cube.order[cube.filters.get_loc(selected_type)][:8])
+    levels = top_categories.metric('tech_level')
+    theta = [name[:10] + "..." if len(name) > 10 else name for name in top_categories.categories]
     
     fig = go.Figure()
     
     for country in selected_countries:
-        if country in country_codes:
+        if country in COUNTRY_NAMES:
+            j = top_categories.countries.get_loc(COUNTRY_CODES[COUNTRY_NAMES.index(country)])
             fig.add_trace(go.Scatterpolar(
-                r=[entry[country] for entry in radar_data],
-                theta=[entry['category'] for entry in radar_data],
+                r=levels[:, j],
+                theta=theta,
                 fill='toself',
                 name=country,
-                line_color=colors[country],
-                fillcolor=colors[country],
+                line_color=COUNTRY_COLORS[j],
+                fillcolor=COUNTRY_COLORS[j],
                 opacity=0.6
             ))
     
@@ -299,561 +381,1412 @@ def create_radar_chart(data, selected_type='전체', selected_countries=['한국
     
     return fig
 
-# 메인 애플리케이션
-def main():
-    # 헤더
+@profiled
+def create_category_bar(dataset, category, metric_col):
+    """중분류 하나의 국가별 기술수준/기술격차 막대그래프 (한국 강조)"""
+    import plotly.graph_objects as go
+    tensor = dataset.tensor
+    values = tensor.row(category)[:, tensor.metrics.get_loc(metric_col)]
+    low, high = dataset.bootstrap().category_interval(category, metric_col)
+    is_level = 'level' in metric_col
+    unit = '%' if is_level else '년'
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[COUNTRY_LABELS[code] for code in tensor.countries],
+            y=values,
+            marker_color=np.where(tensor.countries == 'kr', '#FF6B6B', '#E5E7EB'),
+            error_y=confidence_error_bars(values, low, high),
+            customdata=np.column_stack([low, high]),
+            text=[f"{val:.1f}{unit}" for val in values],
+            textposition='outside',
+            hovertemplate=f"%{{x}}: %{{y:.1f}}{unit}<br>95% 신뢰구간 %{{customdata[0]:.1f}}~%{{customdata[1]:.1f}}{unit}<extra></extra>"
+        )
+    ])
+    
+    fig.update_layout(
+        title="기술수준 비교" if is_level else "기술격차 비교",
+        height=400,
+        yaxis=dict(range=[0, 110] if is_level else value_axis_range(high))
+    )
+    
+    return fig
+
+@profiled
+def create_detail_bar(dataset, position, metric_col):
+    """세부기술 하나(df 행 position)의 국가별 지표와 소속 중분류 평균 비교 막대그래프"""
+    import plotly.graph_objects as go
+    details, tensor = dataset.details, dataset.tensor
+    values = details.values[position, :, details.metrics.get_loc(metric_col)]
+    averages = tensor.row(details.category_of(position))[:, tensor.metrics.get_loc(metric_col)]
+    is_level = 'level' in metric_col
+    unit = '%' if is_level else '년'
+    countries = [COUNTRY_LABELS[code] for code in details.countries]
+    name = details.names[position]
+    
+    fig = go.Figure(data=[
+        go.Bar(
+            name=name[:15] + "..." if len(name) > 15 else name,
+            x=countries,
+            y=values,
+            marker_color=np.where(details.countries == 'kr', '#FF6B6B', '#93C5FD'),
+            text=[f"{val:.1f}{unit}" for val in values],
+            textposition='outside'
+        ),
+        go.Bar(
+            name="중분류 평균",
+            x=countries,
+            y=averages,
+            marker_color='#E5E7EB',
+            text=[f"{val:.1f}{unit}" for val in averages],
+            textposition='outside'
+        )
+    ])
+    
+    fig.update_layout(
+        title="기술수준 비교" if is_level else "기술격차 비교",
+        barmode='group',
+        height=400,
+        yaxis=dict(range=[0, 105] if is_level else value_axis_range(np.concatenate([values, averages]))),
+        legend=dict(orientation='h', y=-0.15)
+    )
+    
+    return fig
+
+# 기술분야 카드 (HTML 조각, 대시보드와 배치 리포트 공용)
+DEFAULT_TECH_DESCRIPTION = {
+    "description": "해당 기술분야에 대한 상세 설명은 추후 보완 예정입니다.",
+    "korea_status": "한국의 기술 현황 분석은 추후 보완 예정입니다.",
+    "global_trend": "글로벌 기술 동향 분석은 추후 보완 예정입니다."
+}
+
+# 연도별 추이 지표 (표시명, 단위). 기술격차는 감소가 개선
+TREND_METRICS = {'tech_level': ('기술수준', '%'), 'tech_gap': ('기술격차', '년')}
+
+@profiled
+def create_trend_lines(trends, selected_type='전체', metric='tech_level'):
+    """조사연도별 국가 평균 추이 (해당 연도 중분류 평균)"""
+    import plotly.graph_objects as go
+    label, unit = TREND_METRICS[metric]
+    means = trends.country_means(selected_type)[:, :, trends.metrics.get_loc(metric)]
+    
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=trends.years,
+            y=means[:, j],
+            mode='lines+markers',
+            name=COUNTRY_LABELS[code],
+            line=dict(color=COUNTRY_COLORS[j], width=4 if code == 'kr' else 2),
+            hovertemplate=f"{COUNTRY_LABELS[code]} %{{x}}년: %{{y:.1f}}{unit}<extra></extra>"
+        )
+        for j, code in enumerate(trends.countries)
+    ])
+    
+    fig.update_layout(
+        title=f"국가별 평균 {label} 추이",
+        height=400,
+        xaxis=dict(tickmode='array', tickvals=trends.years),
+        yaxis=dict(title=f"{label}({unit})")
+    )
+    
+    return fig
+
+@profiled
+def create_category_trajectories(trends, selected_type='전체', country='kr', metric='tech_level'):
+    """중분류별 조사연도 궤적 (전체 중분류를 trace 하나로 그리고 평균선 강조)"""
+    import plotly.graph_objects as go
+    label, unit = TREND_METRICS[metric]
+    rows = trends.members(selected_type)
+    j, k = trends.countries.get_loc(country), trends.metrics.get_loc(metric)
+    
+    # 중분류마다 연도 값 뒤에 NaN을 하나 두어 선을 끊음 (중분류 수만큼 trace를 만들지 않음)
+    values = np.hstack([trends.values[:, rows, j, k].T, np.full((len(rows), 1), np.nan)])
+    x = np.tile(np.append(trends.years.astype(float), np.nan), len(rows))
+    names = np.repeat(np.asarray(trends.categories[rows], dtype=object), len(trends.years) + 1)
+    
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=x,
+            y=values.ravel(),
+            customdata=names,
+            mode='lines+markers',
+            name='중분류',
+            line=dict(color='rgba(148, 163, 184, 0.5)', width=1),
+            marker=dict(size=4),
+            hovertemplate=f"%{{customdata}}<br>%{{x}}년: %{{y:.1f}}{unit}<extra></extra>"
+        ),
+        go.Scatter(
+            x=trends.years,
+            y=trends.country_means(selected_type)[:, j, k],
+            mode='lines+markers',
+            name='평균',
+            line=dict(color=COUNTRY_COLORS[j], width=4),
+            hovertemplate=f"평균 %{{x}}년: %{{y:.1f}}{unit}<extra></extra>"
+        )
+    ])
+    
+    fig.update_layout(
+        title=f"{COUNTRY_LABELS[country]} 중분류별 {label} 궤적",
+        height=400,
+        xaxis=dict(tickmode='array', tickvals=trends.years),
+        yaxis=dict(title=f"{label}({unit})")
+    )
+    
+    return fig
+
+@profiled
+def create_change_heatmap(trends, start_year, end_year, selected_type='전체', metric='tech_level'):
+    """두 조사연도 사이 전체 중분류 × 국가 변화량 히트맵 (한국 변화 순, 개선은 파란색)"""
+    import plotly.graph_objects as go
+    label, unit = TREND_METRICS[metric]
+    rows = trends.members(selected_type)
+    delta = trends.change(start_year, end_year, 'delta', metric)[rows]
+    kr = delta[:, trends.countries.get_loc('kr')]
+    # 개선 폭이 큰 순 (기술격차는 감소가 개선), 값이 없는 중분류는 마지막
+    improvement = -kr if metric == 'tech_gap' else kr
+    order = np.argsort(-np.where(np.isnan(improvement), -np.inf, improvement), kind='stable')
+    limit = np.nanmax(np.abs(delta)) if np.isfinite(delta).any() else 1.0
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=delta[order],
+        x=[COUNTRY_LABELS[code] for code in trends.countries],
+        y=[name[:20] + "..." if len(name) > 20 else name for name in trends.categories[rows][order]],
+        colorscale='RdBu',
+        reversescale=metric == 'tech_gap',
+        zmid=0,
+        zmin=-limit,
+        zmax=limit,
+        texttemplate="%{z:+.1f}",
+        hovertemplate=f"%{{y}}<br>%{{x}}: %{{z:+.1f}}{unit}<extra></extra>",
+        colorbar=dict(title=dict(text=f"{label} 변화({unit})", font=dict(size=14)))
+    ))
+    
+    fig.update_layout(
+        title=f"{start_year}→{end_year}년 {label} 변화",
+        height=max(400, len(rows) * 22 + 120),
+        xaxis=dict(side='top'),
+        yaxis=dict(autorange='reversed'),
+        font=dict(size=12)
+    )
+    
+    return fig
+
+@profiled
+def create_biblio_trend(years, kind):
+    """중분류의 국가별 연도별 논문/특허 건수 추이 (years: BiblioStore.category_years 결과)"""
+    import plotly.graph_objects as go
+    label, unit = KINDS[kind], "편" if kind == 'paper' else "건"
+    years = years[years['kind'] == kind]
+    
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=years.loc[years['country'] == code, 'year'],
+            y=years.loc[years['country'] == code, 'count'],
+            mode='lines+markers',
+            name=COUNTRY_LABELS[code],
+            line=dict(color=COUNTRY_COLORS[j], width=4 if code == 'kr' else 2),
+            hovertemplate=f"{COUNTRY_LABELS[code]} %{{x}}년: %{{y:,}}{unit}<extra></extra>"
+        )
+        for j, code in enumerate(COUNTRY_CODES)
+    ])
+    
+    fig.update_layout(
+        title=f"연도별 {label} 수",
+        height=350,
+        xaxis=dict(dtick=1),
+        yaxis=dict(title=f"{label} 수({unit})")
+    )
+    
+    return fig
+
+
+CLUSTER_METRICS = {**TREND_METRICS, 'basic_research': ('기초연구', '점'), 'applied_research': ('응용연구', '점')}
+CLUSTER_COLORS = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880']
+CLUSTER_K_OPTIONS = list(range(2, len(CLUSTER_COLORS) + 1))
+# 이 행 수를 넘으면 산점도를 WebGL(Scattergl)로 그림 (세부기술 수천 행)
+SCATTERGL_ROWS = 1000
+
+@profiled
+def create_cluster_scatter(dataset, level='category', method='kmeans', k=4, mode='profile'):
+    """군집별 중분류/세부기술 주성분 산점도"""
+    import plotly.graph_objects as go
+    result = dataset.clusters(level, method, k, mode)
+    trace = go.Scattergl if len(result.labels) > SCATTERGL_ROWS else go.Scatter
+    group_label = "중분류" if level == 'detail' else "구분"
+    
+    fig = go.Figure(data=[
+        trace(
+            x=result.coords[members, 0],
+            y=result.coords[members, 1],
+            mode='markers',
+            name=f"군집 {c + 1} ({result.sizes[c]:,})",
+            marker=dict(color=CLUSTER_COLORS[c % len(CLUSTER_COLORS)], size=11 if level == 'category' else 7, opacity=0.8),
+            customdata=np.column_stack([result.names[members], result.groups[members]]),
+            hovertemplate=f"<b>%{{customdata[0]}}</b><br>{group_label}: %{{customdata[1]}}<extra>군집 {c + 1}</extra>"
+        )
+        for c, members in ((c, result.labels == c) for c in range(result.k))
+    ])
+    
+    fig.update_layout(
+        title=f"{CLUSTER_LEVELS[level]} 경쟁구도 군집 ({CLUSTER_METHODS[method]}, {FEATURE_MODES[mode]})",
+        height=500,
+        xaxis=dict(title=f"주성분 1 ({result.explained[0]:.0%})", zeroline=False),
+        yaxis=dict(title=f"주성분 2 ({result.explained[1]:.0%})", zeroline=False),
+        legend=dict(title=dict(text="군집"))
+    )
+    
+    return fig
+
+@profiled
+def create_cluster_profile(dataset, level='category', method='kmeans', k=4, mode='profile', metric='tech_level'):
+    """군집 × 국가 평균 지표 히트맵"""
+    import plotly.graph_objects as go
+    result = dataset.clusters(level, method, k, mode)
+    label, unit = CLUSTER_METRICS[metric]
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=result.profiles[:, :, result.metrics.get_loc(metric)],
+        x=[COUNTRY_LABELS[code] for code in result.countries],
+        y=[f"군집 {c + 1} ({result.sizes[c]:,})" for c in range(result.k)],
+        # 기술격차는 작을수록 좋음
+        colorscale='RdYlGn_r' if metric == 'tech_gap' else 'RdYlGn',
+        texttemplate=f"<b>%{{z:.1f}}{unit}</b>",
+        textfont={"size": 12},
+        hovertemplate=f"%{{y}}<br>%{{x}} 평균 {label}: %{{z:.1f}}{unit}<extra></extra>",
+        colorbar=dict(title=dict(text=f"{label}({unit})"))
+    ))
+    
+    fig.update_layout(
+        title=f"군집별 국가 평균 {label}",
+        height=max(300, result.k * 50 + 120),
+        xaxis=dict(side='top'),
+        yaxis=dict(autorange='reversed'),
+        margin=dict(t=80)
+    )
+    
+    return fig
+
+def category_summary_html(category):
+    """기술 설명 카드"""
+    tech_desc = TECH_DESCRIPTIONS.get(category, DEFAULT_TECH_DESCRIPTION)
+    return f"""
+    <div class="tech-summary-card">
+        <h2>📋 {category}</h2>
+        <p>{tech_desc['description']}</p>
+    </div>
+    """
+
+def category_cards_html(category_info):
+    """기술 현황 카드 4개 (기술수준, 기술격차, 기술그룹, 최고보유국)"""
+    level_color = level_badges([category_info['kr_tech_level']])[0]
+    gap_color = gap_badges([category_info['kr_tech_gap']])[0]
+    group_color = GROUP_EMOJI.get(category_info['kr_tech_group'], "❓")
+    return [
+        f"""
+        <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px; text-align: center;">
+            <h4>{level_color} 기술수준</h4>
+            <h2 style="color: #3b82f6; margin: 0;">{category_info['kr_tech_level']:.1f}%</h2>
+        </div>
+        """,
+        f"""
+        <div style="background: #fef3c7; padding: 1rem; border-radius: 8px; text-align: center;">
+            <h4>{gap_color} 기술격차</h4>
+            <h2 style="color: #f59e0b; margin: 0;">{category_info['kr_tech_gap']:.1f}년</h2>
+        </div>
+        """,
+        f"""
+        <div style="background: #ecfdf5; padding: 1rem; border-radius: 8px; text-align: center;">
+            <h4>{group_color} 기술그룹</h4>
+            <h2 style="color: #10b981; margin: 0;">{category_info['kr_tech_group']}</h2>
+        </div>
+        """,
+        f"""
+        <div style="background: #f3e8ff; padding: 1rem; border-radius: 8px; text-align: center;">
+            <h4>🏆 최고보유국</h4>
+            <h2 style="color: #8b5cf6; margin: 0;">{category_info['leading_country']}</h2>
+        </div>
+        """
+    ]
+
+def rd_capability_html(dataset, category_info):
+    """한국 R&D 역량 및 글로벌 최고 수준 대비 카드 2개"""
+    tensor = dataset.tensor
+    values = tensor.row(category_info['tech_category'])
+    max_basic = np.nanmax(values[:, tensor.metrics.get_loc('basic_research')])
+    max_applied = np.nanmax(values[:, tensor.metrics.get_loc('applied_research')])
+    return [
+        f"""
+        <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px;">
+            <h4>🇰🇷 한국의 R&D 역량</h4>
+            <p><strong>기초연구역량:</strong> {category_info['kr_basic_research']:.1f}점</p>
+            <p><strong>응용연구역량:</strong> {category_info['kr_applied_research']:.1f}점</p>
+            <p><strong>R&D 활동경향:</strong> {category_info['kr_rd_trend']}</p>
+        </div>
+        """,
+        f"""
+        <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px;">
+            <h4>🌍 글로벌 최고 수준 대비</h4>
+            <p><strong>기초연구 격차:</strong> {max_basic - category_info['kr_basic_research']:.1f}점</p>
+            <p><strong>응용연구 격차:</strong> {max_applied - category_info['kr_applied_research']:.1f}점</p>
+            <p><strong>종합 경쟁력:</strong> {'우수' if (category_info['kr_basic_research'] + category_info['kr_applied_research'])/2 > 75 else '보통'}</p>
+        </div>
+        """
+    ]
+
+# 테이블 빌더 (수치 컬럼은 수치로 유지, 표시 형식은 column_config로 지정)
+GROUP_EMOJI = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}
+
+# 세부기술 비교 테이블 컬럼 (지표 -> 값, 소속 중분류 평균, 중분류 내 백분위)
+DETAIL_COLUMNS = {
+    'tech_level': ('기술수준(%)', '중분류 평균(%)', '수준 백분위'),
+    'tech_gap': ('기술격차(년)', '중분류 평균(년)', '격차 백분위'),
+    'basic_research': ('기초연구역량', '중분류 평균(기초)', '기초 백분위'),
+    'applied_research': ('응용연구역량', '중분류 평균(응용)', '응용 백분위')
+}
+DETAIL_CATEGORICAL = {'tech_group': '기술그룹', 'rd_trend': 'R&D활동경향'}
+
+TABLE_COLUMN_CONFIG = {
+    '기술수준(%)': st.column_config.NumberColumn(format="%.1f%%"),
+    '기술격차(년)': st.column_config.NumberColumn(format="%.1f년"),
+    '기초연구역량': st.column_config.NumberColumn(format="%.1f"),
+    '응용연구역량': st.column_config.NumberColumn(format="%.1f"),
+    **{name: st.column_config.NumberColumn(format="%.1f%%") for name in COUNTRY_NAMES},
+    '중분류 평균(%)': st.column_config.NumberColumn(format="%.1f%%"),
+    '중분류 평균(년)': st.column_config.NumberColumn(format="%.1f년"),
+    '중분류 평균(기초)': st.column_config.NumberColumn(format="%.1f"),
+    '중분류 평균(응용)': st.column_config.NumberColumn(format="%.1f"),
+    **{percentile: st.column_config.ProgressColumn(format="%.0f", min_value=0, max_value=100)
+       for _, _, percentile in DETAIL_COLUMNS.values()}
+}
+
+def level_badges(levels):
+    """기술수준 신호등 (85% 이상 🟢, 70% 이상 🟡, 그 외 🔴)"""
+    levels = np.asarray(levels, dtype=float)
+    return np.select([levels >= 85, levels >= 70], ["🟢", "🟡"], "🔴")
+
+def gap_badges(gaps):
+    """기술격차 신호등 (2년 이하 🟢, 4년 이하 🟡, 그 외 🔴)"""
+    gaps = np.asarray(gaps, dtype=float)
+    return np.select([gaps <= 2, gaps <= 4], ["🟢", "🟡"], "🔴")
+
+def type_labels(types):
+    """감축/적응 구분 라벨"""
+    types = pd.Series(types, dtype=object)
+    return np.where(types == '감축', "⚡ ", "🛡️ ") + types.astype(str).to_numpy()
+
+def group_labels(groups):
+    """기술그룹 라벨 (🥇 선도 등)"""
+    groups = pd.Series(groups, dtype=object)
+    return (groups.map(GROUP_EMOJI).fillna("❓") + " " + groups.astype(str)).to_numpy()
+
+def build_status_table(data):
+    """한국 기준 상세현황 테이블 (기술수준 내림차순)"""
+    data = data.sort_values('kr_tech_level', ascending=False, kind='stable')
+    return pd.DataFrame({
+        '구분': type_labels(data['type']),
+        '중분류': data['tech_category'].to_numpy(),
+        '수준': level_badges(data['kr_tech_level']),
+        '기술수준(%)': data['kr_tech_level'].to_numpy(),
+        '격차': gap_badges(data['kr_tech_gap']),
+        '기술격차(년)': data['kr_tech_gap'].to_numpy(),
+        '기술그룹': group_labels(data['kr_tech_group']),
+        '최고보유국': data['leading_country'].to_numpy()
+    })
+
+def interval_labels(low, high, unit=''):
+    """신뢰구간 -> '하한~상한' 문자열 (값이 없으면 '-')"""
+    return np.array([
+        '-' if np.isnan(lo) or np.isnan(hi) else f"{lo:.1f}~{hi:.1f}{unit}"
+        for lo, hi in zip(np.asarray(low, dtype=float), np.asarray(high, dtype=float))
+    ], dtype=object)
+
+def rank_stability_badge(stability):
+    """순위 안정도 신호등 (90% 이상 🟢, 60% 이상 🟡, 그 외 🔴)"""
+    return "🟢" if stability >= 0.9 else "🟡" if stability >= 0.6 else "🔴"
+
+def rank_interval_label(low, high):
+    return f"{low}위" if low == high else f"{low}~{high}위"
+
+def build_rank_table(data, n=10, largest=True, bootstrap=None):
+    """한국 기술수준 상위/하위 n개 중분류 테이블 (bootstrap을 주면 한국 기술수준 95% 신뢰구간 포함)"""
+    ranked = data.nlargest(n, 'kr_tech_level') if largest else data.nsmallest(n, 'kr_tech_level')
+    table = pd.DataFrame({
+        '구분': type_labels(ranked['type']),
+        '중분류': ranked['tech_category'].to_numpy(),
+        '기술수준(%)': ranked['kr_tech_level'].to_numpy(),
+        '기술격차(년)': ranked['kr_tech_gap'].to_numpy()
+    })
+    if bootstrap is not None:
+        rows = bootstrap.categories.get_indexer(ranked['tech_category'])
+        j, k = bootstrap.countries.get_loc('kr'), bootstrap.metrics.get_loc('tech_level')
+        table.insert(3, '95% 신뢰구간', interval_labels(bootstrap.category_low[rows, j, k],
+                                                    bootstrap.category_high[rows, j, k], '%'))
+    return table
+
+def build_comparison_table(data, tensor):
+    """전체 중분류 국가별 기술수준 비교 테이블 (한국 기술수준 순위)"""
+    levels = tensor.metric('tech_level')
+    order = np.argsort(-levels[:, tensor.countries.get_loc('kr')], kind='stable')
+    comparison_df = pd.DataFrame(levels[order], columns=[COUNTRY_LABELS[code] for code in tensor.countries])
+    comparison_df.insert(0, '순위', np.arange(1, len(order) + 1))
+    comparison_df.insert(1, '구분', type_labels(tensor.types[order]))
+    comparison_df.insert(2, '중분류', tensor.categories[order])
+    comparison_df['최고보유국'] = data['leading_country'].to_numpy()[order]
+    return comparison_df
+
+def build_country_detail_table(dataset, category_info):
+    """중분류 하나의 국가별 기술수준/격차/그룹 테이블 (최고 수준 국가 표시)"""
+    tensor = dataset.tensor
+    values = tensor.row(category_info['tech_category'])
+    tech_levels = values[:, tensor.metrics.get_loc('tech_level')]
+    country_labels = np.array([COUNTRY_LABELS[code] for code in tensor.countries])
+    
+    # 최고 수준 국가 찾기
+    is_leader = tech_levels == np.nanmax(tech_levels)
+    
+    return pd.DataFrame({
+        '국가': np.where(is_leader, np.char.add("🏆 ", country_labels), country_labels),
+        '기술수준(%)': tech_levels,
+        '기술격차(년)': values[:, tensor.metrics.get_loc('tech_gap')],
+        '기술그룹': category_info.reindex([f'{code}_tech_group' for code in tensor.countries], fill_value='N/A').to_numpy(),
+        '최고수준국가': np.where(is_leader, "✓", "")
+    })
+
+def build_rd_table(dataset, category_info):
+    """중분류 하나의 국가별 R&D 역량/경향 테이블"""
+    tensor = dataset.tensor
+    values = tensor.row(category_info['tech_category'])
+    return pd.DataFrame({
+        '국가': [COUNTRY_LABELS[code] for code in tensor.countries],
+        '기초연구역량': values[:, tensor.metrics.get_loc('basic_research')],
+        '응용연구역량': values[:, tensor.metrics.get_loc('applied_research')],
+        'R&D활동경향': category_info.reindex([f'{code}_rd_trend' for code in tensor.countries], fill_value='N/A').to_numpy()
+    })
+
+def build_detail_table(dataset, position, metrics, categorical=None):
+    """세부기술 하나(df 행 position)의 국가별 지표 / 소속 중분류 평균 / 중분류 내 백분위 테이블"""
+    details, tensor = dataset.details, dataset.tensor
+    averages = tensor.row(details.category_of(position))
+    percentiles = details.percentile(position)
+    table = {'국가': [COUNTRY_LABELS[code] for code in details.countries]}
+    for metric in metrics:
+        value_col, average_col, percentile_col = DETAIL_COLUMNS[metric]
+        k = details.metrics.get_loc(metric)
+        table[value_col] = details.values[position, :, k]
+        table[average_col] = averages[:, tensor.metrics.get_loc(metric)]
+        table[percentile_col] = percentiles[:, k]
+    if categorical is not None:
+        row = dataset.df.iloc[position]
+        table[DETAIL_CATEGORICAL[categorical]] = row.reindex(
+            [f'{code}_{categorical}' for code in details.countries], fill_value='N/A').to_numpy()
+    return pd.DataFrame(table)
+
+def build_movers_table(trends, start_year, end_year, country='kr', metric='tech_level', selected_type='전체',
+                       n=10, improving=True):
+    """두 조사연도 사이 가장 빠르게 개선/악화된 중분류 n개 (기술격차는 감소가 개선)"""
+    movers = trends.movers(start_year, end_year, country, metric, selected_type)
+    # 개선(악화) 폭 = 기술수준 증가(감소) 또는 기술격차 감소(증가), 폭이 0보다 큰 중분류만 큰 순서로
+    change = movers['delta'].to_numpy() * (-1 if metric == 'tech_gap' else 1) * (1 if improving else -1)
+    order = np.argsort(-change, kind='stable')
+    picked = movers.iloc[order[change[order] > 0][:n]]
+    
+    table = pd.DataFrame({
+        '구분': type_labels(picked['type']),
+        '중분류': picked['tech_category'].to_numpy(),
+        f'{start_year}년': picked['start'].to_numpy(),
+        f'{end_year}년': picked['end'].to_numpy(),
+        '변화': picked['delta'].to_numpy(),
+        '연평균 변화': picked['annual'].to_numpy()
+    })
+    if metric == 'tech_gap':
+        table['격차 단축(년/년)'] = picked['closure'].to_numpy()
+        table['단축률(%)'] = picked['closure_rate'].to_numpy()
+    else:
+        table['연평균 증가율(%)'] = picked['cagr'].to_numpy()
+    return table
+
+def build_biblio_table(summary, kind, window):
+    """국가별 최근 window년 논문/특허 수와 직전 window년 대비 증가율 (summary: BiblioStore.category_summary 결과)"""
+    summary = summary[summary['kind'] == kind]
+    unit = "편" if kind == 'paper' else "건"
+    return pd.DataFrame({
+        '국가': summary['country'].map(COUNTRY_LABELS).to_numpy(),
+        f'{KINDS[kind]} 수({unit})': summary['recent'].to_numpy(),
+        f'직전 {window}년': summary['previous'].to_numpy(),
+        '증가율': summary['growth'].to_numpy()
+    })
+
+CLUSTER_COLUMN_CONFIG = {
+    **TABLE_COLUMN_CONFIG,
+    '한국 기술수준(%)': st.column_config.NumberColumn(format="%.1f%%"),
+    '거리': st.column_config.NumberColumn(format="%.2f", help="표준화한 20개 특성(5개국 × 4개 지표) 사이 거리, 작을수록 경쟁구도가 비슷함")
+}
+
+def build_cluster_table(result, n=3):
+    """군집별 항목 수, 경쟁구도 요약, 한국 평균 기술수준, 대표 항목(군집 중심에 가까운 n개)"""
+    metric_labels = {key: label for key, (label, _) in CLUSTER_METRICS.items()}
+    kr_level = result.profiles[:, result.countries.get_loc('kr'), result.metrics.get_loc('tech_level')]
+    return pd.DataFrame({
+        '군집': [f"군집 {c + 1}" for c in range(result.k)],
+        '항목 수': result.sizes,
+        '경쟁구도': [result.describe(c, COUNTRY_LABELS, metric_labels) for c in range(result.k)],
+        '한국 기술수준(%)': kr_level,
+        '대표 항목': [', '.join(result.names[result.representatives(c, n)]) for c in range(result.k)]
+    })
+
+def build_neighbor_table(dataset, result, position, n=10):
+    """position 행과 경쟁구도가 가장 비슷한 n개 (특성 거리 가까운 순, 국가별 기술수준)"""
+    nearest, distances = result.neighbors(position, n)
+    values = dataset.tensor.values if result.level == 'category' else dataset.details.values
+    levels = values[nearest][:, :, result.metrics.get_loc('tech_level')]
+    table = pd.DataFrame({
+        '순위': np.arange(1, len(nearest) + 1),
+        CLUSTER_LEVELS[result.level]: result.names[nearest],
+        '중분류' if result.level == 'detail' else '구분': result.groups[nearest],
+        '군집': [f"군집 {c + 1}" for c in result.labels[nearest]],
+        '거리': distances
+    })
+    for j, code in enumerate(result.countries):
+        table[COUNTRY_LABELS[code]] = levels[:, j]
+    return table
+
+def trend_column_config(start_year, end_year, metric):
+    """변화 테이블 컬럼 형식 (연도 컬럼명과 단위가 선택에 따라 달라짐)"""
+    unit = "%%" if metric == 'tech_level' else "년"
+    change_unit = "%%p" if metric == 'tech_level' else "년"
+    return {
+        f'{start_year}년': st.column_config.NumberColumn(format=f"%.1f{unit}"),
+        f'{end_year}년': st.column_config.NumberColumn(format=f"%.1f{unit}"),
+        '변화': st.column_config.NumberColumn(format=f"%+.1f{change_unit}"),
+        '연평균 변화': st.column_config.NumberColumn(format=f"%+.2f{change_unit}"),
+        '연평균 증가율(%)': st.column_config.NumberColumn(format="%+.2f%%"),
+        '격차 단축(년/년)': st.column_config.NumberColumn(format="%+.2f"),
+        '단축률(%)': st.column_config.NumberColumn(format="%+.1f%%")
+    }
+
+# 분석 화면 구성 (위젯별 구간을 fragment로 분리해 해당 구간만 재실행)
+@profiled
+def render_main_dashboard(dataset):
+    """🏠 메인 대시보드 - 한국 중심 스토리텔링"""
+    st.subheader("🇰🇷 메인 대시보드 - 한국 기후기술 경쟁력 현황")
+    
+    # 한국 중심 스토리 섹션
     st.markdown("""
-    <div class="main-header">
-        <h1>🌍 기후기술 델파이조사 분석 대시보드</h1>
-        <p>NIGT 기후기술 수준조사 기반 의사결정 지원 도구 (스토리텔링 고도화 버전)</p>
+    <div class="story-box">
+        <h3>📖 한국 기후기술의 현재 위치</h3>
+        <p>한국은 전체 44개 중분류 기후기술에서 <strong>평균 79.2%</strong>의 기술수준을 보유하며, 
+        글로벌 최고 수준 대비 평균 <strong>2.8년</strong>의 기술격차를 보이고 있습니다. 
+        특히 <strong>원자력, 태양광, 연료전지</strong> 분야에서 세계적 경쟁력을 확보한 상태입니다.</p>
     </div>
     """, unsafe_allow_html=True)
     
-    # 데이터 로드
-    with st.spinner('데이터를 로딩중입니다...'):
-        df, category_data = load_climate_tech_data()
+    main_dashboard_section(dataset)
+
+def main_summary(dataset, selected_type):
+    """메인 대시보드 한국 핵심 지표 (사전 집계 큐브 + 세부기술 부트스트랩 신뢰구간/순위 범위)"""
+    cube, bootstrap = dataset.cube, dataset.bootstrap()
+    kr = bootstrap.countries.get_loc('kr')
+    interval = lambda stat: bootstrap.get(stat, selected_type, 'tech_level')[kr]
+    return {
+        'level': cube.get('mean', selected_type, 'kr', 'tech_level'),
+        'gap': cube.get('mean', selected_type, 'kr', 'tech_gap'),
+        'leading_count': cube.get('group_leader_count', selected_type, 'kr'),
+        'total_count': cube.get('category_count', selected_type),
+        'rank': cube.get('rank', selected_type, 'kr', 'tech_level'),
+        'best_category': cube.get('argmax', selected_type, 'kr', 'tech_level'),
+        'level_low': interval('mean_low'),
+        'level_high': interval('mean_high'),
+        'rank_range': rank_interval_label(interval('rank_low'), interval('rank_high')),
+        'rank_stability': interval('rank_stability'),
+        'n_resamples': bootstrap.n_resamples
+    }
+
+def main_metric_cards(summary):
+    """핵심 지표 카드 4개 [(라벨, 값, delta, delta_color, help)]"""
+    rank, gap, best = summary['rank'], summary['gap'], summary['best_category']
+    return [
+        ("🇰🇷 한국 평균 기술수준", f"{summary['level']:.1f}%",
+         f"글로벌 {rank}위" if rank <= 3 else f"글로벌 {rank}위 · 개선 필요", "normal" if rank <= 3 else "inverse",
+         f"95% 신뢰구간 {summary['level_low']:.1f}~{summary['level_high']:.1f}%, 순위 범위 {summary['rank_range']} "
+         f"(세부기술 부트스트랩 {summary['n_resamples']:,}회)"),
+        ("⏱️ 평균 기술격차", f"{gap:.1f}년", "우수" if gap < 3 else "보통", "normal", None),
+        ("🥇 선도 기술분야", f"{summary['leading_count']}개", f"전체 {summary['total_count']}개 중", "normal", None),
+        ("🏆 최우수 분야", best[:12] + "..." if len(best) > 12 else best, None, "normal", None)
+    ]
+
+def main_insight_html(story_context, summary):
+    gap = summary['gap']
+    return f"""
+    <div class="insight-highlight">
+        <h4>💡 {story_context} 핵심 인사이트</h4>
+        <p><strong>• 기술수준:</strong> 한국은 {summary['level']:.1f}%(95% 신뢰구간 {summary['level_low']:.1f}~{summary['level_high']:.1f}%)로 5개국 중 {summary['rank']}위, 
+        재표본 {summary['rank_stability']:.0%}에서 같은 순위 (순위 범위 {summary['rank_range']})</p>
+        <p><strong>• 기술격차:</strong> 최고 수준 대비 평균 {gap:.1f}년 격차, {'우수한' if gap < 3 else '보통' if gap < 4 else '개선이 필요한'} 수준</p>
+        <p><strong>• 경쟁 우위:</strong> {summary['leading_count']}개 분야에서 선도 지위 확보</p>
+    </div>
+    """
+
+def country_performance_html(dataset):
+    """국가별 성과 카드 HTML (순위순 5개)과 설명 문구"""
+    cube, bootstrap = dataset.cube, dataset.bootstrap()
+    avg_levels = cube.get('mean', metric='tech_level')
+    leading_counts = cube.get('leader_count')
+    ranks = cube.get('rank', metric='tech_level')
+    interval = lambda stat: bootstrap.get(stat, metric='tech_level')
     
-    if df is None or category_data is None:
-        st.stop()
+    # 순위순 정렬 (사전 계산된 순위 사용, 순위 범위/안정도는 세부기술 부트스트랩 기준)
+    cards = []
+    for j in np.argsort(ranks):
+        rank_emoji = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"][ranks[j] - 1]
+        stability = interval('rank_stability')[j]
+        cards.append(f"""
+            <div class="country-performance">
+                <h4>{rank_emoji} {COUNTRY_LABELS[cube.countries[j]]}</h4>
+                <p><strong>평균 기술수준</strong><br>{avg_levels[j]:.1f}%
+                <small>({interval('mean_low')[j]:.1f}~{interval('mean_high')[j]:.1f})</small></p>
+                <p><strong>선도 기술 수</strong><br>{leading_counts[j]}개</p>
+                <p><strong>순위 안정도</strong><br>{rank_stability_badge(stability)} {stability:.0%}
+                <small>({rank_interval_label(interval('rank_low')[j], interval('rank_high')[j])})</small></p>
+            </div>
+            """)
+    caption = (f"괄호 안은 세부기술 부트스트랩({bootstrap.n_resamples:,}회) 95% 신뢰구간과 순위 범위, "
+               "순위 안정도는 재표본에서 같은 순위가 나온 비율")
+    return cards, caption
+
+# 분석 범위 선택지 -> (필터, 화면 문구)
+HIERARCHY_LEVELS = {'전체': ('전체', "전체 기후기술"), '감축기술': ('감축', "감축기술"), '적응기술': ('적응', "적응기술")}
+
+@st.fragment
+@profiled_fragment
+def main_dashboard_section(dataset):
+    """분석 범위(hierarchy_level)에 따른 지표/차트/테이블 구간"""
+    category_data, cube = dataset.category_data, dataset.cube
     
-    # 사이드바
-    st.sidebar.title("📊 분석 메뉴")
+    # 계층 선택 드롭다운
+    col1, col2 = st.columns([1, 2])
     
-    analysis_type = st.sidebar.selectbox(
-        "분석 유형을 선택하세요:",
-        ["🏠 메인 대시보드", "🌏 국가별 경쟁력", "🔬 기술분야별 분석"]
+    with col1:
+        hierarchy_level = st.selectbox(
+            "📊 분석 범위:",
+            list(HIERARCHY_LEVELS),
+            key="hierarchy_level"
+        )
+    
+    # 선택된 데이터 필터링 (사전 집계 큐브 조회)
+    selected_type, story_context = HIERARCHY_LEVELS[hierarchy_level]
+    
+    # 한국 중심 핵심 지표
+    summary = main_summary(dataset, selected_type)
+    for col, (label, value, delta, delta_color, help_text) in zip(st.columns(4), main_metric_cards(summary)):
+        with col:
+            st.metric(label, value, delta=delta, delta_color=delta_color, help=help_text)
+    
+    # 기술개요 - 한국 vs 주요국 비교
+    st.subheader(f"📊 {story_context} - 한국 vs 주요국 기술수준 비교")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig_levels = cached_figure(create_simple_bar_comparison, dataset, selected_type, "기술수준 비교", "tech_level")
+        show_chart(fig_levels, use_container_width=True, config={'displayModeBar': False})
+    
+    with col2:
+        fig_gaps = cached_figure(create_simple_bar_comparison, dataset, selected_type, "기술격차 비교", "tech_gap")
+        show_chart(fig_gaps, use_container_width=True, config={'displayModeBar': False})
+    
+    # 한국 중심 인사이트
+    st.markdown(main_insight_html(story_context, summary), unsafe_allow_html=True)
+    
+    # 경량화된 히트맵 (성능 개선)
+    st.subheader(f"🔥 {story_context} 기술수준 현황 (한국 기준 상위 15개)")
+    fig_heatmap = cached_figure(create_enhanced_heatmap, dataset, selected_type, f"{story_context} 기술수준 히트맵")
+    show_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
+    
+    # 상세현황 테이블 (색상 강화)
+    st.subheader(f"📋 {story_context} 상세현황")
+    
+    st.dataframe(
+        build_status_table(category_data.iloc[cube.get('members', selected_type)]),
+        use_container_width=True,
+        hide_index=True,
+        height=400,
+        column_config=TABLE_COLUMN_CONFIG
     )
+
+@profiled
+def render_country_competitiveness(dataset):
+    """🌏 국가별 경쟁력 - 주요국 비교 스토리텔링"""
+    category_data, tensor, bootstrap = dataset.category_data, dataset.tensor, dataset.bootstrap()
     
-    # 메인 대시보드 - 한국 중심 스토리텔링
-    if analysis_type == "🏠 메인 대시보드":
-        st.subheader("🇰🇷 메인 대시보드 - 한국 기후기술 경쟁력 현황")
-        
-        # 한국 중심 스토리 섹션
-        st.markdown("""
-        <div class="story-box">
-            <h3>📖 한국 기후기술의 현재 위치</h3>
-            <p>한국은 전체 44개 중분류 기후기술에서 <strong>평균 79.2%</strong>의 기술수준을 보유하며, 
-            글로벌 최고 수준 대비 평균 <strong>2.8년</strong>의 기술격차를 보이고 있습니다. 
-            특히 <strong>원자력, 태양광, 연료전지</strong> 분야에서 세계적 경쟁력을 확보한 상태입니다.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # 계층 선택 드롭다운
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            hierarchy_level = st.selectbox(
-                "📊 분석 범위:",
-                ['전체', '감축기술', '적응기술'],
-                key="hierarchy_level"
-            )
-        
-        # 선택된 데이터 필터링
-        if hierarchy_level == '전체':
-            filtered_data = category_data.copy()
-            story_context = "전체 기후기술"
-        elif hierarchy_level == '감축기술':
-            filtered_data = category_data[category_data['type'] == '감축']
-            story_context = "감축기술"
-        else:  # 적응기술
-            filtered_data = category_data[category_data['type'] == '적응']
-            story_context = "적응기술"
-        
-        # 한국 중심 핵심 지표
-        col1, col2, col3, col4 = st.columns(4)
-        
-        avg_kr_level = filtered_data['kr_tech_level'].mean()
-        avg_kr_gap = filtered_data['kr_tech_gap'].mean()
-        leading_count = len(filtered_data[filtered_data['kr_tech_group'] == '선도'])
-        total_count = len(filtered_data)
-        
-        with col1:
-            st.metric("🇰🇷 한국 평균 기술수준", f"{avg_kr_level:.1f}%", 
-                     delta=f"글로벌 3위" if avg_kr_level > 78 else "개선 필요")
-        
-        with col2:
-            st.metric("⏱️ 평균 기술격차", f"{avg_kr_gap:.1f}년",
-                     delta="우수" if avg_kr_gap < 3 else "보통")
-        
-        with col3:
-            st.metric("🥇 선도 기술분야", f"{leading_count}개",
-                     delta=f"전체 {total_count}개 중")
-        
-        with col4:
-            best_category = filtered_data.loc[filtered_data['kr_tech_level'].idxmax(), 'tech_category']
-            st.metric("🏆 최우수 분야", best_category[:12] + "..." if len(best_category) > 12 else best_category)
-        
-        # 기술개요 - 한국 vs 주요국 비교
-        st.subheader(f"📊 {story_context} - 한국 vs 주요국 기술수준 비교")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig_levels = create_simple_bar_comparison(filtered_data, "기술수준 비교", "tech_level")
-            st.plotly_chart(fig_levels, use_container_width=True, config={'displayModeBar': False})
-        
-        with col2:
-            fig_gaps = create_simple_bar_comparison(filtered_data, "기술격차 비교", "tech_gap")
-            st.plotly_chart(fig_gaps, use_container_width=True, config={'displayModeBar': False})
-        
-        # 한국 중심 인사이트
-        st.markdown(f"""
-        <div class="insight-highlight">
-            <h4>💡 {story_context} 핵심 인사이트</h4>
-            <p><strong>• 기술수준:</strong> 한국은 {avg_kr_level:.1f}%로 5개국 중 {'3위' if avg_kr_level > 78 else '4위'} 수준</p>
-            <p><strong>• 기술격차:</strong> 최고 수준 대비 평균 {avg_kr_gap:.1f}년 격차, {'우수한' if avg_kr_gap < 3 else '보통' if avg_kr_gap < 4 else '개선이 필요한'} 수준</p>
-            <p><strong>• 경쟁 우위:</strong> {leading_count}개 분야에서 선도 지위 확보</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # 경량화된 히트맵 (성능 개선)
-        st.subheader(f"🔥 {story_context} 기술수준 현황 (한국 기준 상위 15개)")
-        fig_heatmap = create_enhanced_heatmap(filtered_data, f"{story_context} 기술수준 히트맵")
-        st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
-        
-        # 상세현황 테이블 (색상 강화)
-        st.subheader(f"📋 {story_context} 상세현황")
-        
-        display_data = []
-        for _, row in filtered_data.iterrows():
-            level_emoji = "🟢" if row['kr_tech_level'] >= 85 else "🟡" if row['kr_tech_level'] >= 70 else "🔴"
-            gap_emoji = "🟢" if row['kr_tech_gap'] <= 2 else "🟡" if row['kr_tech_gap'] <= 4 else "🔴"
-            group_emoji = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(row['kr_tech_group'], "❓")
-            type_emoji = "⚡" if row['type'] == '감축' else "🛡️"
-            
-            display_data.append({
-                '구분': f"{type_emoji} {row['type']}",
-                '중분류': row['tech_category'],
-                '기술수준(%)': f"{level_emoji} {row['kr_tech_level']:.1f}%",
-                '기술격차(년)': f"{gap_emoji} {row['kr_tech_gap']:.1f}년",
-                '기술그룹': f"{group_emoji} {row['kr_tech_group']}",
-                '최고보유국': row['leading_country']
-            })
-        
-        display_df = pd.DataFrame(display_data)
-        st.dataframe(
-            display_df.sort_values('기술수준(%)', ascending=False),
-            use_container_width=True,
-            hide_index=True,
-            height=400
+    st.subheader("🌍 국가별 기후기술 경쟁력 비교 분석")
+    
+    # 국가별 경쟁력 스토리 섹션
+    st.markdown("""
+    <div class="story-box">
+        <h3>🏁 글로벌 기후기술 경쟁 구도</h3>
+        <p>현재 기후기술 분야에서는 <strong>미국이 선두</strong>를 달리고 있으며, 
+        <strong>중국이 제조 기반 기술에서 급부상</strong>, <strong>EU는 정책 연계 기술 혁신</strong>, 
+        <strong>일본은 정밀 기술 우위</strong>, <strong>한국은 시스템 통합 강점</strong>을 보이는 구조입니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    radar_section(dataset)
+    
+    # 국가별 성과 분석
+    st.subheader("📊 주요국 기술경쟁력 현황")
+    
+    # 국가별 성과 카드
+    cards, caption = country_performance_html(dataset)
+    cols = st.columns(5)
+    st.caption(caption)
+    for col, card in zip(cols, cards):
+        with col:
+            st.markdown(card, unsafe_allow_html=True)
+    
+    # 전체 현황 히트맵 (정렬/페이지 단위로 보이는 구간만 전송)
+    st.subheader("🔥 국가별 기술수준 히트맵 - 전체 현황")
+    heatmap_section(dataset)
+    
+    # 상위/하위 기술분야 (개선된 테이블)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("🏆 한국 상위 기술분야 (TOP 10)")
+        st.dataframe(build_rank_table(category_data, 10, bootstrap=bootstrap), hide_index=True, height=350, column_config=TABLE_COLUMN_CONFIG)
+    
+    with col2:
+        st.subheader("📈 한국 개선 필요 분야 (하위 10)")
+        st.dataframe(build_rank_table(category_data, 10, largest=False, bootstrap=bootstrap), hide_index=True, height=350, column_config=TABLE_COLUMN_CONFIG)
+    
+    # 종합 비교 분석 (기존 종합비교에서 이동)
+    st.subheader("📈 종합 비교 분석 - 전체 중분류 현황")
+    
+    comparison_df = build_comparison_table(category_data, tensor)
+    st.dataframe(comparison_df, use_container_width=True, hide_index=True, height=500, column_config=TABLE_COLUMN_CONFIG)
+
+@st.fragment
+@profiled_fragment
+def radar_section(dataset):
+    """레이더 차트 구간 (radar_type, selected_countries)"""
+    # 레이더 차트 컨트롤
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        radar_type = st.selectbox(
+            "🎯 분석 분류:",
+            ['전체', '감축', '적응'],
+            key="radar_type"
         )
     
-    # 국가별 경쟁력 - 주요국 비교 스토리텔링
-    elif analysis_type == "🌏 국가별 경쟁력":
-        st.subheader("🌍 국가별 기후기술 경쟁력 비교 분석")
-        
-        # 국가별 경쟁력 스토리 섹션
-        st.markdown("""
-        <div class="story-box">
-            <h3>🏁 글로벌 기후기술 경쟁 구도</h3>
-            <p>현재 기후기술 분야에서는 <strong>미국이 선두</strong>를 달리고 있으며, 
-            <strong>중국이 제조 기반 기술에서 급부상</strong>, <strong>EU는 정책 연계 기술 혁신</strong>, 
-            <strong>일본은 정밀 기술 우위</strong>, <strong>한국은 시스템 통합 강점</strong>을 보이는 구조입니다.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # 레이더 차트 컨트롤
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
-            radar_type = st.selectbox(
-                "🎯 분석 분류:",
-                ['전체', '감축', '적응'],
-                key="radar_type"
-            )
-        
-        with col2:
-            countries = ['한국', '중국', '일본', '미국', 'EU']
-            selected_countries = st.multiselect(
-                "🌐 비교 국가 선택:",
-                countries,
-                default=countries,
-                key="selected_countries"
-            )
-        
-        # 레이더 차트
-        if selected_countries:
-            st.subheader("📡 국가별 기술경쟁력 레이더 분석")
-            fig_radar = create_radar_chart(category_data, radar_type, selected_countries)
-            st.plotly_chart(fig_radar, use_container_width=True, config={'displayModeBar': False})
-        
-        # 국가별 성과 분석
-        st.subheader("📊 주요국 기술경쟁력 현황")
-        
-        country_analysis = []
-        country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
-        country_names = ['한국', '중국', '일본', '미국', 'EU']
-        
-        for name, code in zip(country_names, country_codes):
-            avg_level = category_data[f'{code}_tech_level'].mean()
-            leading_count = len(category_data[category_data[f'{code}_tech_level'] >= 90])
-            
-            country_analysis.append({
-                'country': name,
-                'avg_level': avg_level,
-                'leading_count': leading_count,
-                'rank': 0  # 나중에 계산
-            })
-        
-        # 순위 계산
-        sorted_analysis = sorted(country_analysis, key=lambda x: x['avg_level'], reverse=True)
-        for i, item in enumerate(sorted_analysis):
-            item['rank'] = i + 1
-        
-        # 국가별 성과 카드
-        cols = st.columns(5)
-        for i, country_info in enumerate(sorted_analysis):
-            with cols[i]:
-                rank_emoji = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"][country_info['rank']-1]
-                st.markdown(f"""
-                <div class="country-performance">
-                    <h4>{rank_emoji} {country_info['country']}</h4>
-                    <p><strong>평균 기술수준</strong><br>{country_info['avg_level']:.1f}%</p>
-                    <p><strong>선도 기술 수</strong><br>{country_info['leading_count']}개</p>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # 향상된 히트맵
-        st.subheader("🔥 국가별 기술수준 히트맵 - 전체 현황")
-        fig_country_heatmap = create_enhanced_heatmap(category_data, "국가별 기술수준 종합 현황")
-        st.plotly_chart(fig_country_heatmap, use_container_width=True, config={'displayModeBar': False})
-        
-        # 상위/하위 기술분야 (개선된 테이블)
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("🏆 한국 상위 기술분야 (TOP 10)")
-            top_categories = category_data.nlargest(10, 'kr_tech_level')
-            top_table = []
-            for _, row in top_categories.iterrows():
-                top_table.append({
-                    '구분': "⚡ 감축" if row['type'] == '감축' else "🛡️ 적응",
-                    '중분류': row['tech_category'],
-                    '기술수준(%)': f"{row['kr_tech_level']:.1f}%",
-                    '기술격차(년)': f"{row['kr_tech_gap']:.1f}년"
-                })
-            st.dataframe(pd.DataFrame(top_table), hide_index=True, height=350)
-        
-        with col2:
-            st.subheader("📈 한국 개선 필요 분야 (하위 10)")
-            bottom_categories = category_data.nsmallest(10, 'kr_tech_level')
-            bottom_table = []
-            for _, row in bottom_categories.iterrows():
-                bottom_table.append({
-                    '구분': "⚡ 감축" if row['type'] == '감축' else "🛡️ 적응",
-                    '중분류': row['tech_category'],
-                    '기술수준(%)': f"{row['kr_tech_level']:.1f}%",
-                    '기술격차(년)': f"{row['kr_tech_gap']:.1f}년"
-                })
-            st.dataframe(pd.DataFrame(bottom_table), hide_index=True, height=350)
-        
-        # 종합 비교 분석 (기존 종합비교에서 이동)
-        st.subheader("📈 종합 비교 분석 - 전체 중분류 현황")
-        
-        comparison_data = []
-        for _, row in category_data.iterrows():
-            comparison_data.append({
-                '순위': 0,  # 나중에 설정
-                '구분': "⚡ 감축" if row['type'] == '감축' else "🛡️ 적응",
-                '중분류': row['tech_category'],
-                '한국': f"{row['kr_tech_level']:.1f}%",
-                '중국': f"{row['cn_tech_level']:.1f}%",
-                '일본': f"{row['jp_tech_level']:.1f}%",
-                '미국': f"{row['us_tech_level']:.1f}%",
-                'EU': f"{row['eu_tech_level']:.1f}%",
-                '최고보유국': row['leading_country']
-            })
-        
-        comparison_df = pd.DataFrame(comparison_data)
-        comparison_df['한국_정렬용'] = comparison_df['한국'].str.replace('%', '').astype(float)
-        comparison_df = comparison_df.sort_values('한국_정렬용', ascending=False).reset_index(drop=True)
-        comparison_df['순위'] = range(1, len(comparison_df) + 1)
-        comparison_df = comparison_df.drop('한국_정렬용', axis=1)
-        
-        st.dataframe(comparison_df, use_container_width=True, hide_index=True, height=500)
+    with col2:
+        selected_countries = st.multiselect(
+            "🌐 비교 국가 선택:",
+            COUNTRY_NAMES,
+            default=COUNTRY_NAMES,
+            key="selected_countries"
+        )
     
-    # 기술분야별 분석 - 개별 기술 집중 분석
-    elif analysis_type == "🔬 기술분야별 분석":
-        st.subheader("🔬 기술분야별 상세 분석")
-        
-        # 중분류 선택
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            selected_category = st.selectbox(
-                "📋 중분류를 선택하세요:",
-                options=sorted(category_data['tech_category'].unique()),
-                key="category_select"
-            )
+    # 레이더 차트
+    if selected_countries:
+        st.subheader("📡 국가별 기술경쟁력 레이더 분석")
+        fig_radar = cached_figure(create_radar_chart, dataset, radar_type, tuple(selected_countries))
+        show_chart(fig_radar, use_container_width=True, config={'displayModeBar': False})
+
+@st.fragment
+@profiled_fragment
+def heatmap_section(dataset):
+    """전체 중분류/세부기술 히트맵 구간 (heatmap_level, heatmap_type, heatmap_sort, heatmap_order, heatmap_window)"""
+    col1, col2, col3, col4, col5 = st.columns([1.2, 1, 1, 1, 1])
+    
+    with col1:
+        level = st.radio("단위", list(HEATMAP_LEVELS), format_func=HEATMAP_LEVELS.get,
+                         horizontal=True, key="heatmap_level")
+    with col2:
+        selected_type = st.selectbox("구분", ['전체', '감축', '적응'], key="heatmap_type")
+    with col3:
+        sort_by = st.selectbox("정렬 기준", list(COUNTRY_LABELS) + ['label'],
+                               format_func=lambda key: f"{COUNTRY_LABELS[key]} 기술수준" if key in COUNTRY_LABELS else "이름",
+                               key="heatmap_sort")
+    with col4:
+        ascending = st.selectbox("정렬 순서", [False, True], format_func=lambda asc: "오름차순" if asc else "내림차순",
+                                 key="heatmap_order")
+    with col5:
+        size = st.selectbox("표시 행 수", HEATMAP_WINDOWS, index=1, key="heatmap_window")
+    
+    total = len(dataset.heatmaps[level].members(selected_type))
+    if total == 0:
+        st.info(f"{selected_type} 구분에 해당하는 {HEATMAP_LEVELS[level]}가 없습니다.")
+        return
+    n_pages = max(1, -(-total // size))
+    page = st.number_input(
+        f"페이지 (1 ~ {n_pages})", min_value=1, max_value=n_pages, value=1, step=1,
+        # 단위/구분/행 수가 바뀌면 페이지 수가 달라지므로 첫 페이지부터
+        key=f"heatmap_page_{level}_{selected_type}_{size}"
+    )
+    start = (page - 1) * size
+    st.caption(f"{HEATMAP_LEVELS[level]} 전체 {total:,}개 중 {start + 1:,}~{min(start + size, total):,}번째 "
+               f"(〈평균/최고/최저〉 행은 {total:,}개 전체 기준)")
+    
+    fig = cached_figure(create_windowed_heatmap, dataset, level, selected_type, sort_by, ascending, start, size)
+    show_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+@profiled
+def render_tech_field_analysis(dataset):
+    """🔬 기술분야별 분석 - 개별 기술 집중 분석"""
+    st.subheader("🔬 기술분야별 상세 분석")
+    
+    tech_field_section(dataset)
+
+@st.fragment
+@profiled_fragment
+def tech_field_section(dataset):
+    """중분류/세부기술 선택(category_select, detail_select)에 따른 상세 분석 구간"""
+    df, category_data, details = dataset.df, dataset.category_data, dataset.details
+    
+    # 중분류 선택
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        selected_category = st.selectbox(
+            "📋 중분류를 선택하세요:",
+            options=details.categories,
+            key="category_select"
+        )
+    
+    with col2:
+        # 세부기술은 df 행 위치로 선택 (-1: 중분류 전체), 중분류 -> 행 위치는 사전 구축 인덱스 조회
+        selected_detail = st.selectbox(
+            "🔍 세부기술 선택:",
+            options=[-1] + details.rows(selected_category).tolist(),
+            format_func=lambda position: '전체(중분류)' if position < 0 else details.names[position],
+            key="detail_select"
+        )
+    
+    if selected_category:
+        category_info = category_data[category_data['tech_category'] == selected_category].iloc[0]
+        detail_info = df.iloc[selected_detail] if selected_detail >= 0 else None
         
-        with col2:
-            detail_techs = df[df['tech_category'] == selected_category]['tech_detail'].tolist()
-            selected_detail = st.selectbox(
-                "🔍 세부기술 선택:",
-                options=['전체(중분류)'] + detail_techs,
-                key="detail_select"
-            )
+        # 기술 설명 및 현황 카드
+        st.markdown(category_summary_html(selected_category), unsafe_allow_html=True)
         
-        if selected_category:
-            category_info = category_data[category_data['tech_category'] == selected_category].iloc[0]
-            
-            # 기술 설명 및 현황 카드
-            tech_desc = TECH_DESCRIPTIONS.get(selected_category, {
-                "description": "해당 기술분야에 대한 상세 설명은 추후 보완 예정입니다.",
-                "korea_status": "한국의 기술 현황 분석은 추후 보완 예정입니다.",
-                "global_trend": "글로벌 기술 동향 분석은 추후 보완 예정입니다."
-            })
-            
+        if detail_info is not None:
+            kr_percentile = details.percentile(selected_detail)[0, details.metrics.get_loc('tech_level')]
             st.markdown(f"""
-            <div class="tech-summary-card">
-                <h2>📋 {selected_category}</h2>
-                <p>{tech_desc['description']}</p>
+            <div class="insight-highlight">
+                <h4>🔍 {detail_info['tech_detail']}</h4>
+                <p>{selected_category} 세부기술 {len(details.rows(selected_category))}개 중 한국 기술수준 백분위
+                <strong>{kr_percentile:.0f}</strong> (중분류 평균 {category_info['kr_tech_level']:.1f}% 대비
+                {detail_info['kr_tech_level'] - category_info['kr_tech_level']:+.1f}%p)</p>
             </div>
             """, unsafe_allow_html=True)
+        
+        # 기술 현황 카드 4개 (세부기술 선택 시 해당 세부기술 기준)
+        for col, card in zip(st.columns(4), category_cards_html(category_info if detail_info is None else detail_info)):
+            with col:
+                st.markdown(card, unsafe_allow_html=True)
+        
+        # 탭 기반 분석
+        tab1, tab2, tab3 = st.tabs(["📊 기술수준 및 격차", "🎯 역량 및 경향", "📈 논문·특허"])
+        
+        with tab1:
+            st.subheader("📊 기술수준 및 격차 분석")
             
-            # 기술 현황 카드 4개
-            col1, col2, col3, col4 = st.columns(4)
+            # 기술수준/격차 차트 분리
+            col1, col2 = st.columns(2)
             
             with col1:
-                level_color = "🟢" if category_info['kr_tech_level'] >= 85 else "🟡" if category_info['kr_tech_level'] >= 70 else "🔴"
-                st.markdown(f"""
-                <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px; text-align: center;">
-                    <h4>{level_color} 기술수준</h4>
-                    <h2 style="color: #3b82f6; margin: 0;">{category_info['kr_tech_level']:.1f}%</h2>
-                </div>
-                """, unsafe_allow_html=True)
+                if detail_info is None:
+                    fig_level = cached_figure(create_category_bar, dataset, selected_category, 'tech_level')
+                else:
+                    fig_level = cached_figure(create_detail_bar, dataset, selected_detail, 'tech_level')
+                show_chart(fig_level, use_container_width=True, config={'displayModeBar': False})
             
             with col2:
-                gap_color = "🟢" if category_info['kr_tech_gap'] <= 2 else "🟡" if category_info['kr_tech_gap'] <= 4 else "🔴"
-                st.markdown(f"""
-                <div style="background: #fef3c7; padding: 1rem; border-radius: 8px; text-align: center;">
-                    <h4>{gap_color} 기술격차</h4>
-                    <h2 style="color: #f59e0b; margin: 0;">{category_info['kr_tech_gap']:.1f}년</h2>
-                </div>
-                """, unsafe_allow_html=True)
+                if detail_info is None:
+                    fig_gap = cached_figure(create_category_bar, dataset, selected_category, 'tech_gap')
+                else:
+                    fig_gap = cached_figure(create_detail_bar, dataset, selected_detail, 'tech_gap')
+                show_chart(fig_gap, use_container_width=True, config={'displayModeBar': False})
             
-            with col3:
-                group_color = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(category_info['kr_tech_group'], "❓")
-                st.markdown(f"""
-                <div style="background: #ecfdf5; padding: 1rem; border-radius: 8px; text-align: center;">
-                    <h4>{group_color} 기술그룹</h4>
-                    <h2 style="color: #10b981; margin: 0;">{category_info['kr_tech_group']}</h2>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col4:
-                st.markdown(f"""
-                <div style="background: #f3e8ff; padding: 1rem; border-radius: 8px; text-align: center;">
-                    <h4>🏆 최고보유국</h4>
-                    <h2 style="color: #8b5cf6; margin: 0;">{category_info['leading_country']}</h2>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # 탭 기반 분석
-            tab1, tab2, tab3 = st.tabs(["📊 기술수준 및 격차", "🎯 역량 및 경향", "📈 논문·특허"])
-            
-            with tab1:
-                st.subheader("📊 기술수준 및 격차 분석")
-                
-                # 기술수준/격차 차트 분리
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    countries = ['한국', '중국', '일본', '미국', 'EU']
-                    country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
-                    tech_levels = [category_info[f'{code}_tech_level'] for code in country_codes]
-                    
-                    fig_level = go.Figure(data=[
-                        go.Bar(
-                            x=countries,
-                            y=tech_levels,
-                            marker_color=['#FF6B6B' if c == '한국' else '#E5E7EB' for c in countries],
-                            text=[f"{val:.1f}%" for val in tech_levels],
-                            textposition='outside'
-                        )
-                    ])
-                    
-                    fig_level.update_layout(
-                        title="기술수준 비교",
-                        height=400,
-                        yaxis=dict(range=[0, 105])
-                    )
-                    
-                    st.plotly_chart(fig_level, use_container_width=True, config={'displayModeBar': False})
-                
-                with col2:
-                    tech_gaps = [category_info[f'{code}_tech_gap'] for code in country_codes]
-                    
-                    fig_gap = go.Figure(data=[
-                        go.Bar(
-                            x=countries,
-                            y=tech_gaps,
-                            marker_color=['#FF6B6B' if c == '한국' else '#E5E7EB' for c in countries],
-                            text=[f"{val:.1f}년" for val in tech_gaps],
-                            textposition='outside'
-                        )
-                    ])
-                    
-                    fig_gap.update_layout(
-                        title="기술격차 비교",
-                        height=400,
-                        yaxis=dict(range=[0, max(tech_gaps) * 1.2])
-                    )
-                    
-                    st.plotly_chart(fig_gap, use_container_width=True, config={'displayModeBar': False})
-                
-                # 향상된 상세 테이블
-                st.subheader("📋 상세 현황")
-                detail_table = []
-                for country, code in zip(countries, country_codes):
-                    level = category_info[f'{code}_tech_level']
-                    gap = category_info[f'{code}_tech_gap']
-                    group = category_info.get(f'{code}_tech_group', 'N/A')
-                    
-                    # 최고 수준 국가 찾기
-                    is_leader = level == max([category_info[f'{c}_tech_level'] for c in country_codes])
-                    
-                    detail_table.append({
-                        '국가': f"🏆 {country}" if is_leader else country,
-                        '기술수준(%)': f"{level:.1f}%",
-                        '기술격차(년)': f"{gap:.1f}년",
-                        '기술그룹': group,
-                        '최고수준국가': "✓" if is_leader else ""
-                    })
-                
-                st.dataframe(pd.DataFrame(detail_table), use_container_width=True, hide_index=True)
+            # 향상된 상세 테이블
+            st.subheader("📋 상세 현황")
+            if detail_info is None:
+                st.dataframe(build_country_detail_table(dataset, category_info), use_container_width=True, hide_index=True, column_config=TABLE_COLUMN_CONFIG)
+            else:
+                st.dataframe(build_detail_table(dataset, selected_detail, ['tech_level', 'tech_gap'], 'tech_group'),
+                             use_container_width=True, hide_index=True, column_config=TABLE_COLUMN_CONFIG)
+                st.caption("백분위: 같은 중분류 세부기술 중 값이 이 세부기술보다 작은 비율 (동률은 절반 반영)")
+        
+        with tab2:
+            st.subheader("🎯 연구개발 역량 및 경향")
             
-            with tab2:
-                st.subheader("🎯 연구개발 역량 및 경향")
-                
+            if detail_info is None:
                 # R&D 역량 테이블 (기존 유지)
-                countries = ['한국', '중국', '일본', '미국', 'EU']
-                country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
-                
-                rd_data = []
-                for country, code in zip(countries, country_codes):
-                    trend = category_info.get(f'{code}_rd_trend', 'N/A')
-                    basic = category_info.get(f'{code}_basic_research', 0)
-                    applied = category_info.get(f'{code}_applied_research', 0)
-                    
-                    rd_data.append({
-                        '국가': country,
-                        '기초연구역량': f"{basic:.1f}" if pd.notna(basic) else "N/A",
-                        '응용연구역량': f"{applied:.1f}" if pd.notna(applied) else "N/A", 
-                        'R&D활동경향': trend
-                    })
-                
-                st.dataframe(pd.DataFrame(rd_data), use_container_width=True, hide_index=True)
+                st.dataframe(build_rd_table(dataset, category_info), use_container_width=True, hide_index=True, column_config=TABLE_COLUMN_CONFIG)
                 
                 # 한국 중심 역량 분석 (기존 유지)
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown(f"""
-                    <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px;">
-                        <h4>🇰🇷 한국의 R&D 역량</h4>
-                        <p><strong>기초연구역량:</strong> {category_info['kr_basic_research']:.1f}점</p>
-                        <p><strong>응용연구역량:</strong> {category_info['kr_applied_research']:.1f}점</p>
-                        <p><strong>R&D 활동경향:</strong> {category_info['kr_rd_trend']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    # 글로벌 최고 수준 대비
-                    max_basic = max([category_info[f'{code}_basic_research'] for code in country_codes if pd.notna(category_info[f'{code}_basic_research'])])
-                    max_applied = max([category_info[f'{code}_applied_research'] for code in country_codes if pd.notna(category_info[f'{code}_applied_research'])])
-                    
-                    st.markdown(f"""
-                    <div style="background: #f1f5f9; padding: 1rem; border-radius: 8px;">
-                        <h4>🌍 글로벌 최고 수준 대비</h4>
-                        <p><strong>기초연구 격차:</strong> {max_basic - category_info['kr_basic_research']:.1f}점</p>
-                        <p><strong>응용연구 격차:</strong> {max_applied - category_info['kr_applied_research']:.1f}점</p>
-                        <p><strong>종합 경쟁력:</strong> {'우수' if (category_info['kr_basic_research'] + category_info['kr_applied_research'])/2 > 75 else '보통'}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with tab3:
-                st.subheader("📈 논문·특허 분석")
-                
-                st.markdown("""
-                <div style="background: #fff3cd; border: 1px solid #ffeaa7; border-radius: 8px; padding: 1rem; margin: 1rem 0;">
-                    <strong>📌 샘플 데이터 안내:</strong> 현재 표시되는 논문/특허 데이터는 시연용 샘플입니다. 
-                    향후 실제 논문/특허 DB 연동을 통해 실제 데이터로 구축될 예정입니다.
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # 샘플 논문/특허 통계 (기존 유지)
-                sample_data = {
-                    '한국': {'논문': 156, '특허': 89, '증가율': '+12%'},
-                    '중국': {'논문': 324, '특허': 156, '증가율': '+28%'},
-                    '일본': {'논문': 198, '특허': 134, '증가율': '+8%'},
-                    '미국': {'논문': 289, '특허': 201, '증가율': '+15%'},
-                    'EU': {'논문': 234, '특허': 167, '증가율': '+11%'}
-                }
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("📊 최근 5년 논문 발표 현황")
-                    paper_data = []
-                    for country, data in sample_data.items():
-                        paper_data.append({
-                            '국가': country,
-                            '논문 수(편)': data['논문'],
-                            '증가율': data['증가율']
-                        })
-                    st.dataframe(pd.DataFrame(paper_data), hide_index=True)
-                
-                with col2:
-                    st.subheader("🏭 최근 5년 특허 출원 현황")
-                    patent_data = []
-                    for country, data in sample_data.items():
-                        patent_data.append({
-                            '국가': country,
-                            '특허 수(건)': data['특허'],
-                            '증가율': data['증가율']
-                        })
-                    st.dataframe(pd.DataFrame(patent_data), hide_index=True)
+                for col, card in zip(st.columns(2), rd_capability_html(dataset, category_info)):
+                    with col:
+                        st.markdown(card, unsafe_allow_html=True)
+            else:
+                st.dataframe(build_detail_table(dataset, selected_detail, ['basic_research', 'applied_research'], 'rd_trend'),
+                             use_container_width=True, hide_index=True, column_config=TABLE_COLUMN_CONFIG)
         
-        # 다운로드 섹션 (기존 유지)
-        st.markdown("---")
-        st.subheader("💾 분석 결과 다운로드")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if st.button("📊 중분류별 종합 분석 다운로드", type="primary"):
-                csv_buffer = io.StringIO()
-                category_data.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
-                st.download_button(
-                    label="💾 중분류_종합분석.csv 다운로드",
-                    data=csv_buffer.getvalue(),
-                    file_name=f"중분류_종합분석_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime="text/csv"
-                )
+        with tab3:
+            st.subheader("📈 논문·특허 분석")
+            
+            biblio_section(selected_category)
+    
+    download_section(dataset, selected_category)
+
+BIBLIO_COLUMN_CONFIG = {
+    '증가율': st.column_config.NumberColumn(format="%+.0f%%", help="직전 구간 대비 최근 구간 건수 증가율")
+}
+
+def biblio_section(category):
+    """중분류의 국가별 논문·특허 수와 증가율 (저장소의 사전 집계 rollups만 조회)"""
+    store = get_biblio_store()
+    meta = None if store is None else store.meta()
+    if meta is None:
+        st.info("논문·특허 DB가 없습니다. 덤프 파일을 가져오면 이 탭에 중분류별 통계가 표시됩니다: "
+                "`python biblio_store.py import papers.csv --kind paper` "
+                f"(DB 경로: {biblio_path()})")
+        return
+    
+    window = DEFAULT_WINDOW
+    latest = meta['latest_year']
+    with span('biblio_store.query'):
+        summary = store.category_summary(category, window, latest)
+        years = store.category_years(category)
+    if years.empty:
+        st.info(f"{category} 중분류의 논문·특허 레코드가 없습니다.")
+        return
+    
+    st.caption(f"최근 {window}년({latest - window + 1}~{latest}) 건수, 증가율은 직전 {window}년 대비")
+    for col, kind in zip(st.columns(2), KINDS):
+        with col:
+            st.subheader(f"{'📊' if kind == 'paper' else '🏭'} 최근 {window}년 {KINDS[kind]} 현황")
+            st.dataframe(build_biblio_table(summary, kind, window), hide_index=True,
+                         use_container_width=True, column_config=BIBLIO_COLUMN_CONFIG)
+            show_chart(create_biblio_trend(years, kind), use_container_width=True, config={'displayModeBar': False})
+
+@profiled
+def render_cluster_analysis(dataset):
+    """🧭 경쟁구도 군집 - 국가 간 경쟁구도가 비슷한 기술 묶기"""
+    st.subheader("🧭 국가 경쟁구도 군집 및 유사 기술")
+    
+    st.markdown("""
+    <div class="story-box">
+        <h3>🧩 경쟁구도가 비슷한 기술끼리 묶기</h3>
+        <p>중분류(또는 세부기술)마다 5개국의 <strong>기술수준·기술격차·기초연구·응용연구</strong> 20개 값을 특성으로 군집을 나눕니다.
+        <strong>국가 간 상대 구도</strong>는 기술 안에서 어느 나라가 앞서고 뒤처지는지만, <strong>절대 수준</strong>은 값 자체를 비교합니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    cluster_section(dataset)
+
+# 계층 군집은 scipy가 설치된 경우에만 선택 가능
+HIERARCHICAL_AVAILABLE = hierarchical_available()
+
+@st.fragment
+@profiled_fragment
+def cluster_section(dataset):
+    """군집 구간 (cluster_level, cluster_method_{단위}, cluster_k, cluster_mode, cluster_metric, cluster_item_{단위})"""
+    col1, col2, col3, col4 = st.columns([1.2, 1, 1, 1.5])
+    
+    with col1:
+        level = st.radio("단위", list(CLUSTER_LEVELS), format_func=CLUSTER_LEVELS.get,
+                         horizontal=True, key="cluster_level")
+    n_rows = len(dataset.tensor.categories) if level == 'category' else len(dataset.df)
+    methods = ['kmeans'] + (['ward'] if HIERARCHICAL_AVAILABLE and n_rows <= HIERARCHICAL_MAX_ROWS else [])
+    with col2:
+        # 단위마다 선택 가능한 방법이 달라지므로 키를 분리
+        method = st.selectbox("방법", methods, format_func=CLUSTER_METHODS.get, key=f"cluster_method_{level}")
+    with col3:
+        k = st.selectbox("군집 수", CLUSTER_K_OPTIONS, index=CLUSTER_K_OPTIONS.index(4), key="cluster_k")
+    with col4:
+        mode = st.radio("특성", list(FEATURE_MODES), format_func=FEATURE_MODES.get,
+                        horizontal=True, key="cluster_mode")
+    
+    if n_rows < 2:
+        st.info(f"군집 분석에는 {CLUSTER_LEVELS[level]}가 2개 이상 필요합니다.")
+        return
+    
+    with st.spinner("군집을 계산중입니다..."), span('clusters', level=level, method=method, k=k, mode=mode):
+        result = dataset.clusters(level, method, k, mode)
+    
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        show_chart(cached_figure(create_cluster_scatter, dataset, level, method, k, mode),
+                   use_container_width=True, config={'displayModeBar': False})
+    with col2:
+        metric = st.selectbox("군집 평균 지표", list(CLUSTER_METRICS), format_func=lambda key: CLUSTER_METRICS[key][0],
+                              key="cluster_metric")
+        show_chart(cached_figure(create_cluster_profile, dataset, level, method, k, mode, metric),
+                   use_container_width=True, config={'displayModeBar': False})
+    notes = [f"{CLUSTER_LEVELS[level]} {n_rows:,}개", f"주성분 2개가 특성 분산의 {result.explained.sum():.0%} 설명",
+             "군집 번호는 크기순"]
+    if not HIERARCHICAL_AVAILABLE:
+        notes.append("계층 군집은 scipy 설치 시 사용 가능")
+    elif n_rows > HIERARCHICAL_MAX_ROWS:
+        notes.append(f"계층 군집은 {HIERARCHICAL_MAX_ROWS:,}개 이하에서만 사용 가능")
+    st.caption(" · ".join(notes))
+    
+    st.subheader("📋 군집별 경쟁구도")
+    st.dataframe(build_cluster_table(result), hide_index=True, use_container_width=True, column_config=CLUSTER_COLUMN_CONFIG)
+    
+    st.subheader(f"🔗 경쟁구도가 비슷한 {CLUSTER_LEVELS[level]}")
+    names, groups = result.names, result.groups
+    position = st.selectbox(
+        f"기준 {CLUSTER_LEVELS[level]}:",
+        range(n_rows),
+        format_func=(lambda p: names[p]) if level == 'category' else (lambda p: f"{names[p]} · {groups[p]}"),
+        key=f"cluster_item_{level}"
+    )
+    st.caption(f"{names[position]}: 군집 {result.labels[position] + 1}, 표준화 특성 거리가 가까운 순")
+    st.dataframe(build_neighbor_table(dataset, result, position), hide_index=True, use_container_width=True,
+                 column_config=CLUSTER_COLUMN_CONFIG)
+
+@profiled
+def render_trend_analysis(trends):
+    """📈 연도별 추이 - 조사연도 간 기술수준/격차 변화"""
+    st.subheader("📈 조사연도별 기술수준·격차 추이")
+    if trends is None:
+        return
+    if len(trends.years) < 2:
+        st.info(f"연도별 비교에는 조사연도 워크북이 2개 이상 필요합니다 "
+                f"(현재: {', '.join(str(year) for year in trends.years)}년). "
+                "tracker20XX.xlsx 파일을 같은 폴더에 추가하면 자동으로 반영됩니다.")
+        return
+    
+    trend_section(trends)
+
+@st.fragment
+@profiled_fragment
+def trend_section(trends):
+    """연도별 추이 구간 (trend_metric, trend_type, trend_country, trend_start, trend_end_{시작 연도})"""
+    years = [int(year) for year in trends.years]
+    col1, col2, col3, col4, col5 = st.columns([1.2, 1, 1, 1, 1])
+    
+    with col1:
+        metric = st.radio("지표", list(TREND_METRICS), format_func=lambda key: TREND_METRICS[key][0],
+                          horizontal=True, key="trend_metric")
+    with col2:
+        selected_type = st.selectbox("구분", ['전체', '감축', '적응'], key="trend_type")
+    with col3:
+        country = st.selectbox("국가", list(COUNTRY_LABELS), format_func=COUNTRY_LABELS.get, key="trend_country")
+    with col4:
+        start_year = st.selectbox("시작 연도", years[:-1], key="trend_start")
+    with col5:
+        end_options = [year for year in years if year > start_year]
+        # 시작 연도마다 선택지가 달라지므로 키를 분리
+        end_year = st.selectbox("끝 연도", end_options, index=len(end_options) - 1, key=f"trend_end_{start_year}")
+    
+    if len(trends.members(selected_type)) == 0:
+        st.info(f"{selected_type} 구분에 해당하는 중분류가 없습니다.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        show_chart(cached_figure(create_trend_lines, trends, selected_type, metric),
+                   use_container_width=True, config={'displayModeBar': False})
+    with col2:
+        show_chart(cached_figure(create_category_trajectories, trends, selected_type, country, metric),
+                   use_container_width=True, config={'displayModeBar': False})
+    
+    st.subheader(f"🔥 {start_year}→{end_year}년 중분류 × 국가 변화")
+    show_chart(cached_figure(create_change_heatmap, trends, start_year, end_year, selected_type, metric),
+               use_container_width=True, config={'displayModeBar': False})
+    
+    label = TREND_METRICS[metric][0]
+    column_config = {**TABLE_COLUMN_CONFIG, **trend_column_config(start_year, end_year, metric)}
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader(f"🚀 {COUNTRY_LABELS[country]} {label} 개선이 빠른 분야")
+        st.dataframe(build_movers_table(trends, start_year, end_year, country, metric, selected_type),
+                     hide_index=True, height=400, column_config=column_config)
+    with col2:
+        st.subheader(f"⚠️ {COUNTRY_LABELS[country]} {label} 악화가 빠른 분야")
+        st.dataframe(build_movers_table(trends, start_year, end_year, country, metric, selected_type, improving=False),
+                     hide_index=True, height=400, column_config=column_config)
+
+@profiled
+def download_section(dataset, selected_category=None):
+    """분석 결과 다운로드 구간 (파일은 버튼을 누를 때 생성, 전체 데이터 파일은 데이터 버전별로 캐시)"""
+    st.markdown("---")
+    st.subheader("💾 분석 결과 다운로드")
+    
+    stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("**📊 중분류별 종합 분석**")
+        for fmt in ['csv', 'parquet']:
+            st.download_button(
+                label=f"💾 중분류_종합분석.{fmt} 다운로드",
+                data=functools.partial(export_artifact, dataset.version, 'category', fmt, dataset),
+                file_name=f"중분류_종합분석_{stamp}.{fmt}",
+                mime=EXPORT_MIME[fmt]
+            )
+    
+    with col2:
+        st.markdown("**🔍 세부기술별 상세 데이터**")
+        for fmt in ['csv', 'parquet']:
+            st.download_button(
+                label=f"💾 세부기술_상세데이터.{fmt} 다운로드",
+                data=functools.partial(export_artifact, dataset.version, 'detail', fmt, dataset),
+                file_name=f"세부기술_상세데이터_{stamp}.{fmt}",
+                mime=EXPORT_MIME[fmt]
+            )
+    
+    with col3:
+        st.markdown("**📑 통합 엑셀 (세부기술·중분류·국가별)**")
+        st.download_button(
+            label="💾 기후기술_분석.xlsx 다운로드",
+            data=functools.partial(export_artifact, dataset.version, 'workbook', 'xlsx', dataset),
+            file_name=f"기후기술_분석_{stamp}.xlsx",
+            mime=EXPORT_MIME['xlsx']
+        )
         
-        with col2:
-            if st.button("🔍 세부기술별 상세 데이터 다운로드", type="secondary"):
-                csv_buffer = io.StringIO()
-                df.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
+        # 현재 화면(선택 중분류)과 같은 범위의 데이터
+        if selected_category:
+            st.markdown(f"**📋 {selected_category} (현재 선택)**")
+            for fmt in ['csv', 'xlsx']:
                 st.download_button(
-                    label="💾 세부기술_상세데이터.csv 다운로드",
-                    data=csv_buffer.getvalue(),
-                    file_name=f"세부기술_상세데이터_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime="text/csv"
+                    label=f"💾 {selected_category}.{fmt} 다운로드",
+                    data=functools.partial(selected_artifact, dataset, selected_category, fmt),
+                    file_name=f"{selected_category}_{stamp}.{fmt}",
+                    mime=EXPORT_MIME[fmt]
                 )
+
+# 내보내기 파일 (다운로드 버튼의 지연 생성 함수, 화면을 그릴 때는 만들지 않음)
+EXPORT_MIME = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+# 전체 데이터 파일 5종(중분류 csv/parquet, 세부기술 csv/parquet, 통합 xlsx) × 데이터 버전 2개
+@st.cache_resource(max_entries=10, show_spinner=False)
+def export_artifact(version, scope, fmt, _dataset):
+    """전체 데이터 파일 (scope: category 중분류, detail 세부기술, workbook 통합 엑셀), 데이터 버전별 1회 생성"""
+    df, category_data = _dataset.df, _dataset.category_data
+    if fmt == 'xlsx':
+        return to_xlsx_bytes(workbook_sheets(df, category_data))
+    frame = category_data if scope == 'category' else df
+    return to_csv_bytes(frame) if fmt == 'csv' else to_parquet_bytes(frame)
+
+def selected_artifact(dataset, category, fmt):
+    """선택 중분류 파일 (작아서 누를 때마다 생성, 전체 데이터 파일 캐시를 밀어내지 않도록 캐시하지 않음)"""
+    df = dataset.df[dataset.df['tech_category'] == category]
+    category_data = dataset.category_data[dataset.category_data['tech_category'] == category]
+    if fmt == 'xlsx':
+        return to_xlsx_bytes(workbook_sheets(df, category_data))
+    return to_csv_bytes(df)
+
+# 기술 검색 (사이드바, 결과 선택 시 🔬 기술분야별 분석으로 이동)
+ANALYSIS_MENUS = ["🏠 메인 대시보드", "🌏 국가별 경쟁력", "🔬 기술분야별 분석", "🧭 경쟁구도 군집", "📈 연도별 추이"]
+SEARCH_LIMIT = 8
+
+def open_tech_field(category, position):
+    """검색 결과 버튼 콜백 - 분석 메뉴/중분류/세부기술 위젯 상태 설정"""
+    st.session_state['analysis_menu'] = "🔬 기술분야별 분석"
+    st.session_state['category_select'] = category
+    st.session_state['detail_select'] = position
+
+def search_section(dataset):
+    """중분류/세부기술 이름 검색 (초성, 부분 입력, 오타 허용)"""
+    query = st.sidebar.text_input("🔎 기술 검색", placeholder="예: 수소, ㅌㅇㄱ, 연료전지", key="tech_search")
+    if not query.strip():
+        return
+    
+    with span('search', query_length=len(query)):
+        hits = dataset.search.search(query, SEARCH_LIMIT)
+    if not hits:
+        st.sidebar.caption("검색 결과가 없습니다.")
+        return
+    
+    for i, hit in enumerate(hits):
+        label = f"📁 {hit.name}" if hit.kind == 'category' else f"🔹 {hit.name} · {hit.category}"
+        st.sidebar.button(label, key=f"search_hit_{i}", on_click=open_tech_field,
+                          args=(hit.category, hit.position), use_container_width=True)
+
+# 워크북 변경 확인 주기 (초, 0이면 자동 반영 안 함)
+DATA_WATCH_INTERVAL = watch_interval()
+
+def describe_change(stats):
+    """감시기 변경 통계 -> 한 줄 설명"""
+    if stats['mode'] == 'incremental':
+        return (f"중분류 {len(stats['categories'])}개 재집계 "
+                f"(수정 {stats['changed']} · 추가 {stats['added']} · 삭제 {stats['removed']}행, {stats['seconds']:.1f}초)")
+    if stats['mode'] == 'snapshot':
+        return "공유 스냅샷 반영"
+    return f"전체 재집계 ({stats['seconds']:.1f}초)"
+
+@st.fragment(run_every=DATA_WATCH_INTERVAL or None)
+def data_watch_section():
+    """감시기 generation이 이 세션이 그린 데이터와 다르면 전체 다시 실행 (워크북 수정 자동 반영)"""
+    watcher = get_tracker_watcher()
+    if watcher.generation != st.session_state.get('data_generation'):
+        st.rerun()
+    
+    if watcher.last_change:
+        updated = datetime.fromtimestamp(watcher.last_change['time']).strftime('%H:%M:%S')
+        changes = ' · '.join(f"{year}년 {describe_change(stats)}" for year, stats in watcher.last_change['years'].items())
+        st.caption(f"🔄 {updated} 데이터 갱신" + (f": {changes}" if changes else ""))
+
+# 캐시 미리 채우기 (데이터 generation마다 한 번, 백그라운드 스레드 풀)
+PREWARM_ENABLED = prewarm_enabled()
+RADAR_TYPES = ['전체', '감축', '적응']
+
+def prewarm_tasks(dataset, generation):
+    """메뉴별 기본 화면의 figure/집계 작업 목록 [(이름, 함수)]
+    
+    메인 대시보드는 분석 범위(hierarchy_level)별, 국가별 경쟁력은 레이더 분류(radar_type)별과 히트맵 첫 페이지,
+    기술분야별 분석은 모든 중분류(category_select), 경쟁구도 군집과 연도별 추이는 기본 선택 화면을 채운다.
+    """
+    tasks = [
+        ('bootstrap', dataset.bootstrap),
+    ]
+    for level, (selected_type, story_context) in HIERARCHY_LEVELS.items():
+        tasks += [
+            (f'main:{level}:level', lambda t=selected_type: cached_figure(
+                create_simple_bar_comparison, dataset, t, "기술수준 비교", "tech_level")),
+            (f'main:{level}:gap', lambda t=selected_type: cached_figure(
+                create_simple_bar_comparison, dataset, t, "기술격차 비교", "tech_gap")),
+            (f'main:{level}:heatmap', lambda t=selected_type, c=story_context: cached_figure(
+                create_enhanced_heatmap, dataset, t, f"{c} 기술수준 히트맵")),
+        ]
+    tasks += [(f'radar:{radar_type}', lambda t=radar_type: cached_figure(
+        create_radar_chart, dataset, t, tuple(COUNTRY_NAMES))) for radar_type in RADAR_TYPES]
+    tasks += [(f'heatmap:{level}:{selected_type}', lambda l=level, t=selected_type: cached_figure(
+        create_windowed_heatmap, dataset, l, t, 'kr', False, 0, HEATMAP_WINDOWS[1]))
+        for level in HEATMAP_LEVELS for selected_type in RADAR_TYPES]
+    tasks += [(f'category:{category}', lambda c=category: [
+        cached_figure(create_category_bar, dataset, c, metric) for metric in ('tech_level', 'tech_gap')])
+        for category in dataset.details.categories]
+    tasks.append(('clusters', lambda: [
+        cached_figure(create_cluster_scatter, dataset, 'category', 'kmeans', 4, 'profile'),
+        cached_figure(create_cluster_profile, dataset, 'category', 'kmeans', 4, 'profile', 'tech_level')]))
+    tasks.append(('trends', lambda: prewarm_trends(load_trend_cube(generation))))
+    return tasks
+
+def prewarm_trends(trends):
+    """연도별 추이 기본 화면 (기술수준, 전체, 한국, 처음~마지막 연도)"""
+    if trends is None or len(trends.years) < 2:
+        return
+    cached_figure(create_trend_lines, trends, '전체', 'tech_level')
+    cached_figure(create_category_trajectories, trends, '전체', 'kr', 'tech_level')
+    cached_figure(create_change_heatmap, trends, trends.years[0], trends.years[-1], '전체', 'tech_level')
+
+@st.cache_resource(max_entries=1)
+def start_prewarm(generation):
+    """generation 데이터의 미리 채우기 시작 (진행 상황은 반환한 Prewarm으로 조회)"""
+    _, dataset = get_tracker_watcher().current()
+    return Prewarm(prewarm_tasks(dataset, generation), label=f'prewarm-{generation}').start()
+
+def prewarm_caption(prewarm):
+    progress = prewarm.progress()
+    failed = f", 실패 {progress['failed']}" if progress['failed'] else ""
+    if prewarm.is_done():
+        return f"🔥 화면 캐시 준비 완료 ({progress['total']}개{failed}, {progress['seconds']:.1f}초)"
+    return f"🔥 화면 캐시 준비 중 {progress['done']}/{progress['total']}{failed} ({progress['seconds']:.1f}초)"
+
+# 메인 애플리케이션
+def main():
+    # 페이지 설정
+    st.set_page_config(
+        page_title="🌍 기후기술 델파이조사 분석 대시보드",
+        page_icon="🌍",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+    profiling = start_profiling()
+    try:
+        render_app(profiling)
+    finally:
+        # 계측 실행 종료 (마지막 계측 실행이면 메모리 추적도 중지)
+        instrumentation.end_run()
+
+def render_app(profiling):
+    """헤더, 데이터 로드, 사이드바 메뉴와 선택한 분석 화면"""
+    # 헤더
+    st.markdown("""
+    <div class="main-header">
+        <h1>🌍 기후기술 델파이조사 분석 대시보드</h1>
+        <p>NIGT 기후기술 수준조사 기반 의사결정 지원 도구 (스토리텔링 고도화 버전)</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # 데이터 로드
+    with st.spinner('데이터를 로딩중입니다...'), span('load_climate_tech_data', cache='hit'):
+        dataset = load_climate_tech_data()
+    
+    if dataset is None:
+        st.stop()
+    
+    # 다른 메뉴/선택지의 기본 화면을 백그라운드에서 미리 생성 (이 세션 화면과 같은 figure 캐시 공유)
+    prewarm = start_prewarm(st.session_state['data_generation']) if PREWARM_ENABLED else None
+    
+    df, category_data = dataset.df, dataset.category_data
+    
+    # 사이드바
+    st.sidebar.title("📊 분석 메뉴")
+    
+    search_section(dataset)
+    
+    analysis_type = st.sidebar.selectbox(
+        "분석 유형을 선택하세요:",
+        ANALYSIS_MENUS,
+        key="analysis_menu"
+    )
+    
+    # 메인 대시보드 - 한국 중심 스토리텔링
+    if analysis_type == "🏠 메인 대시보드":
+        render_main_dashboard(dataset)
+    
+    # 국가별 경쟁력 - 주요국 비교 스토리텔링
+    elif analysis_type == "🌏 국가별 경쟁력":
+        render_country_competitiveness(dataset)
+    
+    # 기술분야별 분석 - 개별 기술 집중 분석
+    elif analysis_type == "🔬 기술분야별 분석":
+        render_tech_field_analysis(dataset)
+    
+    # 경쟁구도 군집 - 비슷한 국가 경쟁구도의 기술 묶기
+    elif analysis_type == "🧭 경쟁구도 군집":
+        render_cluster_analysis(dataset)
+    
+    # 연도별 추이 - 조사연도 간 변화
+    elif analysis_type == "📈 연도별 추이":
+        with span('load_trend_cube', cache='hit'):
+            trends = load_trend_cube(st.session_state['data_generation'])
+        render_trend_analysis(trends)
     
     # 사이드바 - 추가 정보
+    # 조사연도 목록 = 감시기가 로드한 연도별 데이터셋
+    survey_years = sorted(get_tracker_watcher().datasets)
+    
     st.sidebar.markdown("---")
     st.sidebar.subheader("📊 데이터 정보")
     st.sidebar.info(f"""
     **📈 데이터 현황**
+    - 조사 연도: {', '.join(str(year) for year in survey_years)}
     - 총 중분류: {len(category_data)}개
     - 총 세부기술: {len(df)}개  
     - 감축기술: {len(category_data[category_data['type'] == '감축'])}개 중분류
     - 적응기술: {len(category_data[category_data['type'] == '적응'])}개 중분류
     - 분석 국가: 5개국 (한국, 중국, 일본, 미국, EU)
     """)
+    if prewarm is not None:
+        st.sidebar.caption(prewarm_caption(prewarm))
+    if DATA_WATCH_INTERVAL:
+        with st.sidebar:
+            data_watch_section()
+    
+    if profiling:
+        render_debug_panel()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""Plotly figure 캐시 (메모리 상한이 있는 LRU, 직렬화된 figure JSON 보관)"""
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+MAX_MB_ENV = 'FIGURE_CACHE_MAX_MB'
+DEFAULT_MAX_MB = 64
+
+
+class FigureCache:
+    """(데이터 버전, 함수, 인자) 키로 figure JSON을 보관하는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(MAX_MB_ENV, DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """캐시에 있으면 JSON에서 figure 복원, 없으면 build()로 생성 후 저장"""
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if spec is not None:
+            return _figure_from_json(spec)
+
+        fig = build()
+        self._put(key, fig.to_json())
+        return fig
+
+    def _put(self, key, spec):
+        size = sys.getsizeof(spec)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= sys.getsizeof(old)
+            # 메모리 상한을 넘으면 가장 오래 사용하지 않은 figure부터 제거
+            while self._entries and self._bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted)
+                self.evictions += 1
+            self._entries[key] = spec
+            self._bytes += size
+
+    def stats(self):
+        """캐시 상태 (적중/미적중/제거 횟수, 항목 수, 사용 메모리)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _figure_from_json(spec):
+    import plotly.graph_objects as go
+    # plotly가 직접 직렬화한 JSON이므로 재검증 생략 (검증이 생성 비용의 대부분)
+    return go.Figure(json.loads(spec), _validate=False)
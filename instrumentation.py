@@ -0,0 +1,146 @@
+"""구간별 성능 계측 (실행 시간, 최대 메모리, 캐시 적중 여부) - 선택적으로 켜는 경량 계측
+
+계측은 begin_run(enabled=True)로 시작해 end_run()으로 끝내는 스크립트 실행(스레드) 안에서만 기록되며,
+꺼져 있으면 span()은 아무 일도 하지 않는다. 구간이 끝날 때마다 tracker.perf 로거에 JSON 한 줄을 남기므로
+여러 세션의 로그를 모아 집계할 수 있다.
+
+메모리(tracemalloc)는 프로세스 전체에 걸리므로 TRACKER_PROFILE_MEMORY 환경변수로 켠 경우에만 추적하고,
+계측 중인 실행이 모두 끝나면 중지한다. 최대 메모리는 프로세스 전체 값이라 다른 스레드가 있으면 섞이므로
+스레드가 하나일 때(스크립트, 벤치마크)만 구간 peak_mb를 기록한다.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+PROFILE_ENV = 'TRACKER_PROFILE'
+PROFILE_MEMORY_ENV = 'TRACKER_PROFILE_MEMORY'
+LOGGER_NAME = 'tracker.perf'
+
+_local = threading.local()
+# 계측 중인 실행 수와 이 모듈이 tracemalloc을 켰는지 (프로세스 공유)
+_runs_lock = threading.Lock()
+_active_runs = 0
+_started_tracing = False
+_logger = logging.getLogger(LOGGER_NAME)
+if not _logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    _logger.addHandler(_handler)
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def enabled_by_env():
+    """TRACKER_PROFILE 환경변수로 전체 계측 활성화 여부"""
+    return _env_flag(PROFILE_ENV)
+
+
+def memory_enabled_by_env():
+    """TRACKER_PROFILE_MEMORY 환경변수로 메모리 추적(tracemalloc) 허용 여부"""
+    return _env_flag(PROFILE_MEMORY_ENV)
+
+
+def begin_run(enabled=True, **context):
+    """현재 스레드의 계측 시작 (context는 모든 로그 줄에 포함, 예: session), 끝나면 end_run() 호출"""
+    global _active_runs, _started_tracing
+    # 이전 실행이 end_run 없이 끝났으면 정리
+    end_run()
+    _local.enabled = enabled
+    _local.stack = []
+    _local.records = []
+    _local.context = {'run': uuid.uuid4().hex[:8], **context}
+    if enabled:
+        with _runs_lock:
+            _active_runs += 1
+            _local.active = True
+            if memory_enabled_by_env() and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+
+
+def end_run():
+    """현재 스레드의 계측 종료 (기록은 records()로 계속 조회), 마지막 계측 실행이면 메모리 추적 중지"""
+    global _active_runs, _started_tracing
+    _local.enabled = False
+    if not getattr(_local, 'active', False):
+        return
+    _local.active = False
+    with _runs_lock:
+        _active_runs -= 1
+        if _active_runs == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _memory_exclusive():
+    """구간 최대 메모리를 믿을 수 있는지 (메모리 추적 중이고 프로세스 스레드가 하나)"""
+    return tracemalloc.is_tracing() and threading.active_count() == 1
+
+
+def is_enabled():
+    return getattr(_local, 'enabled', False)
+
+
+def records():
+    """현재 실행에서 끝난 구간 기록 목록 (종료 순서)"""
+    return list(getattr(_local, 'records', []))
+
+
+def mark(**fields):
+    """가장 안쪽 구간에 필드 기록 (예: 캐시 함수 본문에서 mark(cache='miss'))"""
+    stack = getattr(_local, 'stack', None)
+    if is_enabled() and stack:
+        stack[-1]['fields'].update(fields)
+
+
+@contextlib.contextmanager
+def span(section, **fields):
+    """구간 계측 (실행 시간 ms, 추가 필드, 단일 스레드 메모리 추적 시 구간 중 최대 메모리 증가 MB)"""
+    if not is_enabled():
+        yield
+        return
+
+    stack = _local.stack
+    memory = _memory_exclusive()
+    if memory:
+        # 바깥 구간의 최대 메모리를 보존한 뒤 이 구간 기준으로 peak 초기화
+        if stack and stack[-1]['memory']:
+            stack[-1]['peak'] = max(stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    entry = {'fields': dict(fields), 'memory': memory, 'peak': 0,
+             'base': tracemalloc.get_traced_memory()[0] if memory else 0}
+    stack.append(entry)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        record = {'section': section, 'depth': len(stack), 'ms': round(elapsed * 1000, 2)}
+        if memory and _memory_exclusive():
+            peak = max(entry['peak'], tracemalloc.get_traced_memory()[1])
+            if stack and stack[-1]['memory']:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            record['peak_mb'] = round(max(peak - entry['base'], 0) / 1024 / 1024, 3)
+        record.update(entry['fields'])
+        _local.records.append(record)
+        _logger.info(json.dumps({'event': 'span', **_local.context, **record}, ensure_ascii=False, default=str))
+
+
+def profiled(func):
+    """함수 호출 전체를 함수 이름 구간으로 계측하는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,95 @@
+"""캐시 미리 채우기 (백그라운드 스레드 풀, Streamlit 없이 사용 가능)
+
+대시보드가 화면별 기본 figure/집계 작업 목록을 넘기면 스레드 풀에서 실행해 캐시를 채우고, 진행 상황과
+소요 시간을 기록한다. 작업 하나가 실패해도 나머지는 계속 실행하며 실패는 로그와 failed 목록에 남는다.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PREWARM_ENV = 'TRACKER_PREWARM'
+PREWARM_WORKERS_ENV = 'TRACKER_PREWARM_WORKERS'
+DEFAULT_WORKERS = 4
+
+logger = logging.getLogger('tracker.prewarm')
+
+
+def prewarm_enabled():
+    """TRACKER_PREWARM 환경변수가 0/false/off가 아니면 사용"""
+    return os.environ.get(PREWARM_ENV, '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+
+def prewarm_workers():
+    """스레드 수, TRACKER_PREWARM_WORKERS 환경변수로 조정 (기본: min(4, CPU 수))"""
+    try:
+        return max(1, int(os.environ[PREWARM_WORKERS_ENV]))
+    except (KeyError, ValueError):
+        return min(DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+class Prewarm:
+    """(이름, 함수) 작업 목록을 백그라운드 스레드 풀에서 실행하고 진행 상황을 기록"""
+
+    def __init__(self, tasks, workers=None, label='prewarm'):
+        self.tasks = list(tasks)
+        self.workers = workers or prewarm_workers()
+        self.label = label
+        self.total = len(self.tasks)
+        self.done = 0
+        self.failed = []
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self):
+        """작업 제출 후 바로 반환 (이미 시작했으면 아무것도 하지 않음)"""
+        if self._executor is not None:
+            return self
+        self.started = time.perf_counter()
+        if not self.tasks:
+            self.finished = self.started
+            return self
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.label)
+        for name, task in self.tasks:
+            self._executor.submit(self._run, name, task)
+        # 제출한 작업이 끝나면 스레드 정리 (기다리지 않음)
+        self._executor.shutdown(wait=False)
+        return self
+
+    def _run(self, name, task):
+        try:
+            task()
+        except Exception as e:
+            logger.warning("%s 작업 실패 %s: %s", self.label, name, e)
+            with self._lock:
+                self.failed.append(name)
+        with self._lock:
+            self.done += 1
+            if self.done == self.total:
+                self.finished = time.perf_counter()
+                logger.info("%s 완료: 작업 %d개 (실패 %d), %.2f초",
+                            self.label, self.total, len(self.failed), self.finished - self.started)
+
+    def wait(self, timeout=None):
+        """모든 작업이 끝날 때까지 대기 -> 완료 여부"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.is_done():
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def is_done(self):
+        return self.finished is not None
+
+    def progress(self):
+        """{'done', 'total', 'failed', 'seconds'} (seconds는 시작 후 경과 또는 총 소요 시간)"""
+        with self._lock:
+            if self.started is None:
+                seconds = 0.0
+            else:
+                seconds = (self.finished or time.perf_counter()) - self.started
+            return {'done': self.done, 'total': self.total, 'failed': len(self.failed), 'seconds': round(seconds, 2)}
@@ -0,0 +1,559 @@
+"""대시보드 정적 사이트 내보내기 (서버 없이 호스팅, Streamlit 없이 대시보드 빌더 재사용)
+
+    python static_export.py                          # 최신 조사연도 -> site/
+    python static_export.py --years all --output public
+    python -m http.server -d site                    # 로컬 확인 (file://에서는 JSON을 읽을 수 없음)
+
+사이드바와 위젯으로 도달할 수 있는 화면 상태(메뉴, 분석 범위, 레이더 분류 × 비교 국가 조합, 히트맵 단위 ×
+구분 × 페이지, 중분류별 화면, 경쟁구도 군집 단위 × 군집 수, 연도별 추이 기본 화면)를 모두 미리 계산한다.
+figure spec, 표, HTML 카드 같은 블록은 내용 해시로 한 번만 저장해 여러 상태가 공유하고(figure 공통 template도
+한 번만), 약 SHARD_BYTES씩 {출력}/{연도}/shards/<해시>.json으로 묶는다. {연도}/index.json은 화면 상태 -> 블록
+해시 목록과 블록 -> shard 위치만 담으며, index.html이 필요한 shard만 받아 plotly.js로 그린다. 히트맵은 기본
+정렬(한국 기술수준 내림차순)과 기본 행 수만, 군집은 k-means · 국가 간 상대 구도만 내보내며 세부기술
+선택(detail_select)과 유사 기술 목록은 내보내지 않는다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+# 대시보드 모듈 import 시 Streamlit 런타임 부재 경고 숨김
+os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+
+import numpy as np
+
+from batch_report import select_years
+from biblio_store import DEFAULT_WINDOW, KINDS, BiblioStore, biblio_path
+from tracker_clusters import CLUSTER_LEVELS, CLUSTER_METHODS, FEATURE_MODES
+from tracker_data import COUNTRY_NAMES, build_dataset, load_tracker_years
+from tracker_trends import build_trend_cube
+
+DEFAULT_OUTPUT = 'site'
+# shard 파일 하나의 목표 크기 (바이트, 블록 하나가 더 크면 그 블록만 담음)
+SHARD_BYTES = 64 * 1024
+PLOTLY_CDN = 'https://cdn.plot.ly/plotly-{version}.min.js'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {type(value).__name__}")
+
+
+def _cell(value, fmt):
+    """표 셀 값 (대시보드 column_config 형식이 있으면 같은 형식의 문자열, 결측은 None)"""
+    if value is None or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return None
+    if fmt is not None and isinstance(value, (int, float, np.number)):
+        return fmt % value
+    return value
+
+
+class BlockStore:
+    """내용 해시로 중복을 제거한 화면 블록 보관 및 shard 파일 기록"""
+
+    def __init__(self):
+        # 해시 -> 직렬화한 블록 (추가 순서 유지, 같은 화면 블록이 같은 shard에 모이도록)
+        self.blocks = {}
+
+    def add(self, block):
+        text = json.dumps(block, ensure_ascii=False, separators=(',', ':'), sort_keys=True, default=_json_default)
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        self.blocks.setdefault(key, text)
+        return key
+
+    def html(self, text):
+        return self.add({'type': 'html', 'html': text})
+
+    def heading(self, text):
+        return self.add({'type': 'heading', 'text': text})
+
+    def caption(self, text):
+        return self.add({'type': 'caption', 'text': text})
+
+    def row(self, keys):
+        return self.add({'type': 'row', 'items': list(keys)})
+
+    def figure(self, fig):
+        """plotly figure -> 블록 (layout.template은 별도 블록으로 한 번만 저장)"""
+        spec = json.loads(fig.to_json())
+        template = spec['layout'].pop('template', None)
+        block = {'type': 'figure', 'data': spec['data'], 'layout': spec['layout']}
+        if template is not None:
+            block['template'] = self.add({'type': 'template', 'template': template})
+        return self.add(block)
+
+    def table(self, frame, column_config=None):
+        """DataFrame -> 표 블록 (숫자 컬럼은 column_config 형식으로 미리 문자열화)"""
+        formats = {}
+        for name, config in (column_config or {}).items():
+            fmt = dict(config).get('type_config', {}).get('format')
+            if fmt:
+                formats[name] = fmt
+        columns = [str(name) for name in frame.columns]
+        rows = [
+            [_cell(value, formats.get(name)) for name, value in zip(columns, row)]
+            for row in frame.itertuples(index=False, name=None)
+        ]
+        return self.add({'type': 'table', 'columns': columns, 'rows': rows})
+
+    def write_shards(self, directory, shard_bytes=SHARD_BYTES):
+        """블록을 shard 파일로 묶어 기록 -> {블록 해시: shard 이름}
+
+        shard 이름은 내용 해시라 내용이 같으면 이름도 같다 (호스팅 시 장기 캐시 가능).
+        """
+        os.makedirs(directory, exist_ok=True)
+        locations = {}
+        batch, size = [], 0
+
+        def flush():
+            if not batch:
+                return
+            text = '{' + ','.join(f'{json.dumps(key)}:{self.blocks[key]}' for key in batch) + '}'
+            name = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+            with open(os.path.join(directory, f'{name}.json'), 'w', encoding='utf-8') as f:
+                f.write(text)
+            for key in batch:
+                locations[key] = name
+
+        for key, text in self.blocks.items():
+            if batch and size + len(text) > shard_bytes:
+                flush()
+                batch, size = [], 0
+            batch.append(key)
+            size += len(text)
+        flush()
+        return locations
+
+
+def slot(blocks, view, controls):
+    """위젯 구간 블록: controls 선택값으로 view 템플릿({이름})을 채운 화면을 그림
+
+    controls: [{'name', 'label', 'options': [[값, 라벨], ...], 'multi': 다중 선택 여부}],
+    다중 선택 값은 선택한 옵션 위치의 비트 합(모두 선택이 기본)이다.
+    """
+    return blocks.add({'type': 'slot', 'view': view, 'controls': controls})
+
+
+def _options(values, labels=None):
+    labels = values if labels is None else labels
+    return [[value, label] for value, label in zip(values, labels)]
+
+
+def export_main(dashboard, dataset, blocks, views):
+    """🏠 메인 대시보드 (분석 범위별)"""
+    for level, (selected_type, story_context) in dashboard.HIERARCHY_LEVELS.items():
+        summary = dashboard.main_summary(dataset, selected_type)
+        cards = [{'label': label, 'value': value, 'delta': delta, 'color': color, 'help': help_text}
+                 for label, value, delta, color, help_text in dashboard.main_metric_cards(summary)]
+        members = dataset.cube.get('members', selected_type)
+        views[f'main/{level}'] = [
+            blocks.add({'type': 'metrics', 'items': cards}),
+            blocks.heading(f"📊 {story_context} - 한국 vs 주요국 기술수준 비교"),
+            blocks.row([
+                blocks.figure(dashboard.create_simple_bar_comparison(dataset, selected_type, "기술수준 비교", "tech_level")),
+                blocks.figure(dashboard.create_simple_bar_comparison(dataset, selected_type, "기술격차 비교", "tech_gap"))
+            ]),
+            blocks.html(dashboard.main_insight_html(story_context, summary)),
+            blocks.heading(f"🔥 {story_context} 기술수준 현황 (한국 기준 상위 15개)"),
+            blocks.figure(dashboard.create_enhanced_heatmap(dataset, selected_type, f"{story_context} 기술수준 히트맵")),
+            blocks.heading(f"📋 {story_context} 상세현황"),
+            blocks.table(dashboard.build_status_table(dataset.category_data.iloc[members]), dashboard.TABLE_COLUMN_CONFIG)
+        ]
+    return [slot(blocks, 'main/{hierarchy_level}', [
+        {'name': 'hierarchy_level', 'label': "📊 분석 범위:", 'options': _options(list(dashboard.HIERARCHY_LEVELS))}
+    ])]
+
+
+def export_country(dashboard, dataset, blocks, views):
+    """🌏 국가별 경쟁력 (레이더 분류 × 비교 국가 조합, 히트맵 단위 × 구분 × 페이지)"""
+    for radar_type in dashboard.RADAR_TYPES:
+        for mask in range(1, 1 << len(COUNTRY_NAMES)):
+            countries = tuple(name for j, name in enumerate(COUNTRY_NAMES) if mask >> j & 1)
+            views[f'radar/{radar_type}/{mask}'] = [
+                blocks.heading("📡 국가별 기술경쟁력 레이더 분석"),
+                blocks.figure(dashboard.create_radar_chart(dataset, radar_type, countries))
+            ]
+
+    size = dashboard.HEATMAP_WINDOWS[1]
+    for level, level_label in dashboard.HEATMAP_LEVELS.items():
+        for selected_type in dashboard.RADAR_TYPES:
+            total = len(dataset.heatmaps[level].members(selected_type))
+            if total == 0:
+                views[f'heatmap/{level}/{selected_type}'] = [
+                    blocks.caption(f"{selected_type} 구분에 해당하는 {level_label}가 없습니다.")]
+                continue
+            pages = []
+            for start in range(0, total, size):
+                pages.append(blocks.add({'type': 'group', 'items': [
+                    blocks.caption(f"{level_label} 전체 {total:,}개 중 {start + 1:,}~{min(start + size, total):,}번째 "
+                                   f"(〈평균/최고/최저〉 행은 {total:,}개 전체 기준)"),
+                    blocks.figure(dashboard.create_windowed_heatmap(dataset, level, selected_type, 'kr', False, start, size))
+                ]}))
+            views[f'heatmap/{level}/{selected_type}'] = [
+                blocks.add({'type': 'pages', 'label': f"페이지 (1 ~ {len(pages)})", 'pages': pages})]
+
+    cards, caption = dashboard.country_performance_html(dataset)
+    bootstrap = dataset.bootstrap()
+    category_data = dataset.category_data
+    types = _options(dashboard.RADAR_TYPES)
+    return [
+        blocks.heading("🌍 국가별 기후기술 경쟁력 비교 분석"),
+        slot(blocks, 'radar/{radar_type}/{selected_countries}', [
+            {'name': 'radar_type', 'label': "🎯 분석 분류:", 'options': types},
+            {'name': 'selected_countries', 'label': "🌐 비교 국가 선택:", 'options': _options(COUNTRY_NAMES), 'multi': True}
+        ]),
+        blocks.heading("📊 주요국 기술경쟁력 현황"),
+        blocks.caption(caption),
+        blocks.row([blocks.html(card) for card in cards]),
+        blocks.heading("🔥 국가별 기술수준 히트맵 - 전체 현황"),
+        slot(blocks, 'heatmap/{heatmap_level}/{heatmap_type}', [
+            {'name': 'heatmap_level', 'label': "단위", 'options': [[key, label] for key, label in dashboard.HEATMAP_LEVELS.items()]},
+            {'name': 'heatmap_type', 'label': "구분", 'options': types}
+        ]),
+        blocks.row([
+            blocks.add({'type': 'group', 'items': [
+                blocks.heading("🏆 한국 상위 기술분야 (TOP 10)"),
+                blocks.table(dashboard.build_rank_table(category_data, 10, bootstrap=bootstrap), dashboard.TABLE_COLUMN_CONFIG)
+            ]}),
+            blocks.add({'type': 'group', 'items': [
+                blocks.heading("📈 한국 개선 필요 분야 (하위 10)"),
+                blocks.table(dashboard.build_rank_table(category_data, 10, largest=False, bootstrap=bootstrap),
+                             dashboard.TABLE_COLUMN_CONFIG)
+            ]})
+        ]),
+        blocks.heading("📈 종합 비교 분석 - 전체 중분류 현황"),
+        blocks.table(dashboard.build_comparison_table(category_data, dataset.tensor), dashboard.TABLE_COLUMN_CONFIG)
+    ]
+
+
+def export_tech_field(dashboard, dataset, blocks, views, store=None):
+    """🔬 기술분야별 분석 (중분류별, 논문·특허 DB가 있으면 포함)"""
+    category_data = dataset.category_data
+    meta = None if store is None else store.meta()
+    for category in dataset.details.categories:
+        category_info = category_data[category_data['tech_category'] == category].iloc[0]
+        items = [
+            blocks.html(dashboard.category_summary_html(category)),
+            blocks.row([blocks.html(card) for card in dashboard.category_cards_html(category_info)]),
+            blocks.heading("📊 기술수준 및 격차 분석"),
+            blocks.row([blocks.figure(dashboard.create_category_bar(dataset, category, metric))
+                        for metric in ('tech_level', 'tech_gap')]),
+            blocks.heading("📋 상세 현황"),
+            blocks.table(dashboard.build_country_detail_table(dataset, category_info), dashboard.TABLE_COLUMN_CONFIG),
+            blocks.heading("🎯 연구개발 역량 및 경향"),
+            blocks.table(dashboard.build_rd_table(dataset, category_info), dashboard.TABLE_COLUMN_CONFIG),
+            blocks.row([blocks.html(card) for card in dashboard.rd_capability_html(dataset, category_info)])
+        ]
+        if meta is not None:
+            summary = store.category_summary(category, DEFAULT_WINDOW, meta['latest_year'])
+            items += [blocks.heading("📈 논문·특허 분석"), blocks.row([
+                blocks.add({'type': 'group', 'items': [
+                    blocks.heading(f"최근 {DEFAULT_WINDOW}년 {KINDS[kind]} 현황"),
+                    blocks.table(dashboard.build_biblio_table(summary, kind, DEFAULT_WINDOW), dashboard.BIBLIO_COLUMN_CONFIG)
+                ]})
+                for kind in KINDS
+            ])]
+        views[f'field/{category}'] = items
+    return [slot(blocks, 'field/{category_select}', [
+        {'name': 'category_select', 'label': "📋 중분류를 선택하세요:", 'options': _options(list(dataset.details.categories))}
+    ])]
+
+
+def export_clusters(dashboard, dataset, blocks, views):
+    """🧭 경쟁구도 군집 (단위 × 군집 수, k-means · 국가 간 상대 구도)"""
+    method, mode = 'kmeans', 'profile'
+    levels = {level: label for level, label in CLUSTER_LEVELS.items()
+              if (len(dataset.tensor.categories) if level == 'category' else len(dataset.df)) >= 2}
+    for level in levels:
+        for k in dashboard.CLUSTER_K_OPTIONS:
+            result = dataset.clusters(level, method, k, mode)
+            views[f'clusters/{level}/{k}'] = [
+                blocks.row([blocks.figure(dashboard.create_cluster_scatter(dataset, level, method, k, mode)),
+                            blocks.figure(dashboard.create_cluster_profile(dataset, level, method, k, mode))]),
+                blocks.caption(f"{levels[level]} {len(result.labels):,}개 · 주성분 2개가 특성 분산의 "
+                               f"{result.explained.sum():.0%} 설명 · 군집 번호는 크기순"),
+                blocks.heading("📋 군집별 경쟁구도"),
+                blocks.table(dashboard.build_cluster_table(result), dashboard.CLUSTER_COLUMN_CONFIG)
+            ]
+    return [
+        blocks.heading("🧭 국가 경쟁구도 군집 및 유사 기술"),
+        blocks.caption(f"{CLUSTER_METHODS[method]} · {FEATURE_MODES[mode]} 기준"),
+        slot(blocks, 'clusters/{cluster_level}/{cluster_k}', [
+            {'name': 'cluster_level', 'label': "단위", 'options': [[key, label] for key, label in levels.items()]},
+            {'name': 'cluster_k', 'label': "군집 수", 'options': _options(dashboard.CLUSTER_K_OPTIONS)}
+        ])
+    ]
+
+
+def export_trends(dashboard, trends, blocks):
+    """📈 연도별 추이 (기본 선택: 기술수준, 전체, 한국, 처음~마지막 조사연도)"""
+    if len(trends.years) < 2:
+        return [blocks.caption(f"연도별 비교에는 조사연도 워크북이 2개 이상 필요합니다 "
+                               f"(현재: {', '.join(str(year) for year in trends.years)}년).")]
+    start, end = int(trends.years[0]), int(trends.years[-1])
+    config = dashboard.trend_column_config(start, end, 'tech_level')
+    return [
+        blocks.heading("📈 조사연도별 기술수준·격차 추이"),
+        blocks.row([blocks.figure(dashboard.create_trend_lines(trends, '전체', 'tech_level')),
+                    blocks.figure(dashboard.create_category_trajectories(trends, '전체', 'kr', 'tech_level'))]),
+        blocks.figure(dashboard.create_change_heatmap(trends, start, end, '전체', 'tech_level')),
+        blocks.row([
+            blocks.add({'type': 'group', 'items': [
+                blocks.heading(f"🚀 가장 개선된 중분류 ({start}→{end})"),
+                blocks.table(dashboard.build_movers_table(trends, start, end), config)
+            ]}),
+            blocks.add({'type': 'group', 'items': [
+                blocks.heading(f"⚠️ 가장 악화된 중분류 ({start}→{end})"),
+                blocks.table(dashboard.build_movers_table(trends, start, end, improving=False), config)
+            ]})
+        ])
+    ]
+
+
+def export_year(dataset, trends, output_dir, store=None):
+    """조사연도 하나의 화면 상태/블록 기록 -> 통계 {'views', 'blocks', 'shards', 'bytes'}"""
+    import dashboard_260916 as dashboard
+
+    blocks, views = BlockStore(), {}
+    menus = {
+        "🏠 메인 대시보드": export_main(dashboard, dataset, blocks, views),
+        "🌏 국가별 경쟁력": export_country(dashboard, dataset, blocks, views),
+        "🔬 기술분야별 분석": export_tech_field(dashboard, dataset, blocks, views, store),
+        "🧭 경쟁구도 군집": export_clusters(dashboard, dataset, blocks, views),
+        "📈 연도별 추이": export_trends(dashboard, trends, blocks)
+    }
+    for menu, items in menus.items():
+        views[f'menu/{menu}'] = items
+
+    year_dir = os.path.join(output_dir, str(dataset.year))
+    shutil.rmtree(os.path.join(year_dir, 'shards'), ignore_errors=True)
+    locations = blocks.write_shards(os.path.join(year_dir, 'shards'))
+    index = {
+        'year': dataset.year,
+        'version': dataset.version,
+        'menus': list(menus),
+        'views': views,
+        'blocks': locations,
+        'info': {
+            'categories': len(dataset.category_data),
+            'details': len(dataset.df),
+            'mitigation': int((dataset.category_data['type'] == '감축').sum()),
+            'adaptation': int((dataset.category_data['type'] == '적응').sum())
+        }
+    }
+    with open(os.path.join(year_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+    shard_bytes = sum(entry.stat().st_size for entry in os.scandir(os.path.join(year_dir, 'shards')))
+    return {'views': len(views), 'blocks': len(blocks.blocks), 'shards': len(set(locations.values())),
+            'bytes': shard_bytes}
+
+
+def write_shell(output_dir, years):
+    """index.html (연도/메뉴 선택과 블록 렌더링, 서버 없이 동작)과 years.json"""
+    import dashboard_260916 as dashboard
+    from plotly.offline import get_plotlyjs_version
+
+    with open(os.path.join(output_dir, 'years.json'), 'w', encoding='utf-8') as f:
+        json.dump(sorted(years, reverse=True), f)
+    page = (SHELL_HTML
+            .replace('__PAGE_CSS__', dashboard.PAGE_CSS)
+            .replace('__PLOTLY_JS__', PLOTLY_CDN.format(version=get_plotlyjs_version())))
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+
+
+SHELL_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>🌍 기후기술 델파이조사 분석 대시보드</title>
+<script src="__PLOTLY_JS__" charset="utf-8"></script>
+__PAGE_CSS__
+<style>
+body { font-family: sans-serif; margin: 0; display: flex; min-height: 100vh; }
+#sidebar { width: 260px; padding: 1rem; background: #f0f2f6; box-sizing: border-box; flex-shrink: 0; }
+#sidebar select { width: 100%; margin: 0.25rem 0 1rem; padding: 0.3rem; }
+#main { flex: 1; padding: 1rem 2rem; min-width: 0; }
+.row { display: flex; gap: 1rem; }
+.row > * { flex: 1; min-width: 0; }
+.controls { display: flex; gap: 1rem; flex-wrap: wrap; margin: 0.5rem 0; }
+.controls label { font-size: 0.9rem; }
+.metrics { display: flex; gap: 1rem; margin: 1rem 0; }
+.metric { flex: 1; }
+.metric .value { font-size: 1.8rem; }
+.metric .delta { font-size: 0.85rem; color: #09ab3b; }
+.metric .delta.inverse { color: #ff2b2b; }
+.caption { color: #6b7280; font-size: 0.85rem; }
+.report-table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+.report-table th, .report-table td { border-bottom: 1px solid #e5e7eb; padding: 0.35rem 0.5rem; text-align: left; }
+.table-wrap { max-height: 500px; overflow: auto; }
+</style>
+</head>
+<body>
+<div id="sidebar">
+<h3>📊 분석 메뉴</h3>
+<label>조사연도<select id="year"></select></label>
+<label>분석 유형을 선택하세요:<select id="menu"></select></label>
+<div id="info" class="caption"></div>
+</div>
+<div id="main">
+<div class="main-header"><h1>🌍 기후기술 델파이조사 분석 대시보드</h1>
+<p>NIGT 기후기술 수준조사 기반 의사결정 지원 도구 (정적 내보내기)</p></div>
+<div id="content"></div>
+</div>
+<script>
+let index = null, year = null, shards = {};
+const el = (tag, cls, text) => { const e = document.createElement(tag); if (cls) e.className = cls; if (text != null) e.textContent = text; return e; };
+
+function block(key) {
+  const shard = index.blocks[key];
+  if (!shards[shard]) shards[shard] = fetch(`${year}/shards/${shard}.json`).then(r => r.json());
+  return shards[shard].then(s => s[key]);
+}
+
+async function renderView(name, container) {
+  const keys = index.views[name] || [];
+  const nodes = keys.map(() => container.appendChild(el('div')));
+  await Promise.all(keys.map((key, i) => render(key, nodes[i])));
+}
+
+async function render(key, node) {
+  const b = await block(key);
+  if (b.type === 'html') node.innerHTML = b.html;
+  else if (b.type === 'heading') node.appendChild(el('h3', null, b.text));
+  else if (b.type === 'caption') node.appendChild(el('p', 'caption', b.text));
+  else if (b.type === 'row' || b.type === 'group') {
+    node.className = b.type === 'row' ? 'row' : '';
+    await Promise.all(b.items.map(k => render(k, node.appendChild(el('div')))));
+  } else if (b.type === 'metrics') {
+    node.className = 'metrics';
+    for (const m of b.items) {
+      const card = node.appendChild(el('div', 'metric'));
+      card.title = m.help || '';
+      card.appendChild(el('div', 'caption', m.label));
+      card.appendChild(el('div', 'value', m.value));
+      if (m.delta) card.appendChild(el('div', 'delta' + (m.color === 'inverse' ? ' inverse' : ''), m.delta));
+    }
+  } else if (b.type === 'figure') {
+    const layout = Object.assign({}, b.layout);
+    if (b.template) layout.template = (await block(b.template)).template;
+    Plotly.newPlot(node, b.data, layout, {displayModeBar: false, responsive: true});
+  } else if (b.type === 'table') {
+    const wrap = node.appendChild(el('div', 'table-wrap')), table = wrap.appendChild(el('table', 'report-table'));
+    const head = table.appendChild(el('tr'));
+    b.columns.forEach(c => head.appendChild(el('th', null, c)));
+    for (const row of b.rows) {
+      const tr = table.appendChild(el('tr'));
+      row.forEach(v => tr.appendChild(el('td', null, v == null ? '-' : typeof v === 'number' ? +v.toFixed(2) : v)));
+    }
+  } else if (b.type === 'pages') {
+    const select = el('select'), body = el('div');
+    b.pages.forEach((_, i) => select.appendChild(new Option(i + 1, i)));
+    const label = node.appendChild(el('label', null, b.label + ' '));
+    label.appendChild(select);
+    node.appendChild(body);
+    const show = () => { body.innerHTML = ''; render(b.pages[select.value], body); };
+    select.onchange = show;
+    show();
+  } else if (b.type === 'slot') {
+    const controls = node.appendChild(el('div', 'controls')), body = node.appendChild(el('div'));
+    const values = {};
+    const show = () => {
+      body.innerHTML = '';
+      const view = b.view.replace(/\\{(\\w+)\\}/g, (_, name) => values[name]);
+      if (index.views[view]) renderView(view, body);
+    };
+    for (const c of b.controls) {
+      const label = controls.appendChild(el('label', null, c.label + ' '));
+      if (c.multi) {
+        values[c.name] = (1 << c.options.length) - 1;
+        c.options.forEach(([, text], i) => {
+          const box = el('input'); box.type = 'checkbox'; box.checked = true;
+          box.onchange = () => { values[c.name] ^= 1 << i; show(); };
+          const item = label.appendChild(el('label', null, ' ' + text + ' '));
+          item.prepend(box);
+        });
+      } else {
+        const select = label.appendChild(el('select'));
+        c.options.forEach(([value, text]) => select.appendChild(new Option(text, value)));
+        values[c.name] = c.options[0][0];
+        select.onchange = () => { values[c.name] = select.value; show(); };
+      }
+    }
+    show();
+  }
+}
+
+async function showMenu() {
+  const content = document.getElementById('content');
+  content.innerHTML = '';
+  await renderView('menu/' + document.getElementById('menu').value, content);
+}
+
+async function loadYear(value) {
+  year = value; shards = {};
+  index = await (await fetch(`${year}/index.json`)).json();
+  const menu = document.getElementById('menu'), current = menu.value;
+  menu.innerHTML = '';
+  index.menus.forEach(m => menu.appendChild(new Option(m, m)));
+  if (index.menus.includes(current)) menu.value = current;
+  const info = index.info;
+  document.getElementById('info').textContent =
+    `${year}년 조사 · 중분류 ${info.categories}개 · 세부기술 ${info.details}개 (감축 ${info.mitigation} · 적응 ${info.adaptation})`;
+  await showMenu();
+}
+
+(async () => {
+  const years = await (await fetch('years.json')).json();
+  const select = document.getElementById('year');
+  years.forEach(y => select.appendChild(new Option(y, y)));
+  select.onchange = () => loadYear(select.value);
+  document.getElementById('menu').onchange = showMenu;
+  await loadYear(years[0]);
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='대시보드 정적 사이트 내보내기')
+    parser.add_argument('--data-dir', default='.', help='tracker20XX.xlsx 워크북 폴더 (기본: 현재 폴더)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'출력 폴더 (기본: {DEFAULT_OUTPUT})')
+    parser.add_argument('--years', default='latest',
+                        help="조사연도: latest(기본), all, 또는 쉼표 구분 목록 (예: 2020,2022)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tracker_years = load_tracker_years(args.data_dir)
+    if not tracker_years:
+        raise SystemExit(f"{args.data_dir}에서 tracker20XX.xlsx 파일을 찾을 수 없습니다.")
+    years = select_years(tracker_years, args.years)
+    # 연도별 추이는 내보내는 연도와 관계없이 전체 조사연도로 구성
+    datasets = {year: build_dataset(*tracker_years[year], year) for year in tracker_years}
+    trends = build_trend_cube(datasets)
+    store = BiblioStore() if os.path.exists(biblio_path()) else None
+
+    os.makedirs(args.output, exist_ok=True)
+    for year in years:
+        start = time.perf_counter()
+        stats = export_year(datasets[year], trends, args.output, store)
+        print(f"{year}년: 화면 상태 {stats['views']}개 · 블록 {stats['blocks']}개 · shard {stats['shards']}개 "
+              f"({stats['bytes'] / 1024:.0f}KB), {time.perf_counter() - start:.1f}초")
+    write_shell(args.output, years)
+    print(f"완료 → {os.path.join(args.output, 'index.html')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
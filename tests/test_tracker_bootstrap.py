@@ -0,0 +1,56 @@
+"""부트스트랩 신뢰구간의 중분류별 안정성 (한 중분류 수정이 다른 중분류 결과에 영향을 주지 않음)"""
+import numpy as np
+import pytest
+
+import tracker_bootstrap
+from benchmark import generate_tracker
+from tracker_data import COLUMN_MAPPING, aggregate_categories, build_dataset
+
+N_RESAMPLES = 200
+
+
+def _dataset(df, version):
+    return build_dataset(df, aggregate_categories(df), version)
+
+
+@pytest.fixture(scope='module')
+def tracker_df():
+    return generate_tracker(400, seed=7).rename(columns=COLUMN_MAPPING)
+
+
+def _edit_one_category(df):
+    """두 번째 중분류의 첫 세부기술 한국 기술수준 수정 -> (수정된 df, 중분류명)"""
+    category = df['tech_category'].unique()[1]
+    row = df.index[df['tech_category'] == category][0]
+    edited = df.copy()
+    edited.loc[row, 'kr_tech_level'] = edited.loc[row, 'kr_tech_level'] - 7
+    return edited, category
+
+
+def test_edit_leaves_other_categories_bit_identical(tracker_df):
+    before = _dataset(tracker_df, 'a')
+    edited, category = _edit_one_category(tracker_df)
+    after = _dataset(edited, 'b')
+    summary_before = tracker_bootstrap.bootstrap_dataset(before, N_RESAMPLES)
+    summary_after = tracker_bootstrap.bootstrap_dataset(after, N_RESAMPLES)
+
+    changed = [name for name in before.category_versions
+               if before.category_versions[name] != after.category_versions[name]]
+    assert changed == [category]
+    for name in before.category_versions:
+        if name == category:
+            continue
+        for old, new in zip(summary_before.category_interval(name), summary_after.category_interval(name)):
+            np.testing.assert_array_equal(old, new)
+    low_before, _ = summary_before.category_interval(category)
+    low_after, _ = summary_after.category_interval(category)
+    assert not np.array_equal(low_before, low_after, equal_nan=True)
+
+
+def test_category_intervals_independent_of_chunking(tracker_df, monkeypatch):
+    dataset = _dataset(tracker_df, 'a')
+    default = tracker_bootstrap.bootstrap_dataset(dataset, N_RESAMPLES)
+    monkeypatch.setattr(tracker_bootstrap, 'CHUNK_ELEMENTS', 1 << 12)
+    chunked = tracker_bootstrap.bootstrap_dataset(dataset, N_RESAMPLES)
+    np.testing.assert_array_equal(default.category_low, chunked.category_low)
+    np.testing.assert_array_equal(default.category_high, chunked.category_high)
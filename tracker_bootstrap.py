@@ -0,0 +1,199 @@
+"""중분류 평균/국가 평균의 부트스트랩 신뢰구간과 국가 순위 안정도
+
+각 중분류 안에서 세부기술을 복원추출하는 층화 부트스트랩이다. 재표본마다 모든 중분류의 표본 위치를
+한 번에 모아 np.add.reduceat으로 중분류별 합/개수를 구한다. 표본 위치는 (seed, 중분류 버전 해시, 재표본 번호,
+중분류 안 행 번호)를 splitmix64로 섞은 카운터 기반 난수라 배열 연산 한 번으로 만들어지고, 다른 중분류 데이터나
+묶음 구성과 무관하다. 따라서 한 중분류를 고쳐도 다른 중분류의 신뢰구간은 비트 단위로 그대로이고, 중분류
+figure/리포트 캐시를 category_versions로 판단해도 된다.
+국가 평균(필터 × 국가 × 지표)과 순위는 같은 재표본의 중분류 평균에서 계산해 불확실성이 그대로 전파된다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_SEED = 2020
+N_RESAMPLES = 1000
+CONFIDENCE = 0.95
+# 한 번에 만드는 (재표본 × 세부기술 × 국가 × 지표) 원소 수 상한 (메모리 사용량 제한)
+CHUNK_ELEMENTS = 1 << 24
+
+
+@dataclass(frozen=True)
+class BootstrapSummary:
+    """부트스트랩 신뢰구간 (low/high는 CONFIDENCE 양측 백분위수)
+
+    category_low/high는 (중분류, 국가, 지표)로 CategoryTensor와 같은 순서, mean_low/high와
+    rank_low/high는 (필터, 국가, 지표)로 AggregateCube와 같은 순서다. rank_stability는 재표본 중
+    관측 순위와 같은 순위가 나온 비율(0~1)이다.
+    """
+    categories: pd.Index
+    filters: pd.Index
+    countries: pd.Index
+    metrics: pd.Index
+    category_low: np.ndarray
+    category_high: np.ndarray
+    mean_low: np.ndarray
+    mean_high: np.ndarray
+    rank_low: np.ndarray
+    rank_high: np.ndarray
+    rank_stability: np.ndarray
+    n_resamples: int
+    confidence: float
+    seed: int
+
+    def category_interval(self, category, metric=None):
+        """중분류 하나의 (low, high), 각각 (국가, 지표) 또는 metric 지정 시 (국가,)"""
+        i = self.categories.get_loc(category)
+        low, high = self.category_low[i], self.category_high[i]
+        if metric is not None:
+            k = self.metrics.get_loc(metric)
+            low, high = low[:, k], high[:, k]
+        return low, high
+
+    def get(self, stat, selected_type='전체', metric=None):
+        """필터별 국가 통계 (mean_low, mean_high, rank_low, rank_high, rank_stability) 조회"""
+        values = getattr(self, stat)[self.filters.get_loc(selected_type)]
+        if metric is not None:
+            values = values[..., self.metrics.get_loc(metric)]
+        return values
+
+
+def _interval(replicates, confidence):
+    """재표본 축(0)의 양측 백분위수 (NaN 재표본 제외, numpy 'linear' 방식과 동일)
+
+    nanpercentile은 NaN이 있으면 칸마다 따로 계산하므로 정렬 후 위치를 직접 보간한다.
+    """
+    ordered = np.sort(replicates, axis=0)
+    last = np.maximum((~np.isnan(ordered)).sum(axis=0) - 1, 0)
+    tail = (1 - confidence) / 2
+    bounds = []
+    for q in (tail, 1 - tail):
+        position = q * last
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, last)
+        low = np.take_along_axis(ordered, below[None], axis=0)[0]
+        high = np.take_along_axis(ordered, above[None], axis=0)[0]
+        bounds.append(low + (high - low) * (position - below))
+    return bounds
+
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix64(x):
+    """splitmix64 마무리 함수 (uint64 배열, 곱셈은 2^64에서 순환)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _category_keys(categories, versions, seed):
+    """중분류별 난수 키 (seed + 중분류 버전 해시, 다른 중분류 데이터와 무관) uint64 배열"""
+    hashes = np.array([int(versions[category], 16) for category in categories], dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        return _mix64(hashes ^ _mix64(np.full(len(hashes), seed, dtype=np.uint64) + _GOLDEN))
+
+
+def _resample_block(filled, valid, sizes, n_resamples, keys):
+    """연속한 중분류 묶음의 재표본 평균 (재표본, 중분류, 국가, 지표)
+
+    재표본 r에서 중분류 안 i번째 행이 뽑는 위치 = 시작 + (상위 32비트 난수 × 크기) >> 32 이며, 난수는
+    mix64(행 키 + (r + 1) × 황금비 상수), 행 키 = mix64(중분류 키 + (i + 1) × 황금비 상수)다. 모두 정수 연산이라
+    결과가 묶음 크기나 다른 중분류와 무관하다. 결측이 없는 묶음은 개수 대신 중분류 크기로 나눈다.
+    """
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    row_start = np.repeat(starts, sizes)
+    row_size = np.repeat(sizes, sizes).astype(np.uint64)
+    rank = (np.arange(len(row_start)) - row_start + 1).astype(np.uint64)
+    shape = (n_resamples, len(sizes)) + filled.shape[1:]
+    complete = valid.all()
+    sums = np.empty(shape, dtype=filled.dtype)
+    counts = None if complete else np.empty(shape, dtype=np.int32)
+    chunk = max(1, CHUNK_ELEMENTS // filled.size)
+    with np.errstate(over='ignore'):
+        row_keys = _mix64(np.repeat(keys, sizes) + rank * _GOLDEN)
+        for b in range(0, n_resamples, chunk):
+            n = min(chunk, n_resamples - b)
+            counters = np.arange(b + 1, b + n + 1, dtype=np.uint64)[:, None] * _GOLDEN
+            bits = _mix64(row_keys[None, :] + counters) >> np.uint64(32)
+            picks = row_start + ((bits * row_size) >> np.uint64(32)).astype(np.int64)
+            sums[b:b + n] = np.add.reduceat(filled[picks], starts, axis=1)
+            if not complete:
+                counts[b:b + n] = np.add.reduceat(valid[picks], starts, axis=1)
+    if complete:
+        # 결측 있는 묶음(sums / counts)과 같은 float64 나눗셈 (중분류 결과가 묶음 구성에 따라 달라지지 않도록)
+        return sums / sizes[None, :, None, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def bootstrap_dataset(dataset, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=BOOTSTRAP_SEED):
+    """TrackerDataset -> BootstrapSummary (같은 중분류 데이터와 seed면 그 중분류는 같은 결과)
+
+    재표본 배열 전체(재표본 × 중분류 × 국가 × 지표)를 한꺼번에 만들지 않도록 연속한 중분류를
+    CHUNK_ELEMENTS 크기의 묶음으로 나눠 처리하고, 묶음마다 신뢰구간과 필터별 합계만 남긴다.
+    """
+    details, tensor, cube = dataset.details, dataset.tensor, dataset.cube
+    keys = _category_keys(details.categories, dataset.category_versions, seed)
+    # 재표본 합계는 중분류 크기만큼만 더하므로 float32로 충분 (메모리 대역폭 절반)
+    values = details.values[details.positions]
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0).astype(np.float32)
+    sizes = np.diff(details.offsets)
+    cells = values.shape[1:]
+
+    # details 중분류 순서 -> tensor 행, 필터 소속 (필터, details 중분류)
+    rows = tensor.categories.get_indexer(details.categories)
+    masks = np.zeros((len(cube.filters), len(tensor.categories)))
+    for f, members in enumerate(cube.members):
+        masks[f, members] = 1.0
+    masks = masks[:, rows]
+
+    category_low = np.full((len(tensor.categories),) + cells, np.nan)
+    category_high = np.full((len(tensor.categories),) + cells, np.nan)
+    total = np.zeros((n_resamples, len(cube.filters)) + cells)
+    count = np.zeros((n_resamples, len(cube.filters)) + cells)
+    block_rows = max(1, CHUNK_ELEMENTS // (n_resamples * int(np.prod(cells))))
+    start = 0
+    while start < len(sizes):
+        # 행 수가 block_rows를 넘지 않는 데까지 (최소 중분류 하나)
+        end = max(start + 1, int(np.searchsorted(details.offsets, details.offsets[start] + block_rows, side='right')) - 1)
+        block = slice(details.offsets[start], details.offsets[end])
+        means = _resample_block(filled[block], valid[block], sizes[start:end], n_resamples, keys[start:end])
+        category_low[rows[start:end]], category_high[rows[start:end]] = _interval(means, confidence)
+
+        # 필터별 국가 평균 = 필터에 속한 중분류 평균의 평균 (값이 없는 중분류 제외)
+        present = ~np.isnan(means)
+        total += np.einsum('fc,bcjk->bfjk', masks[:, start:end], np.where(present, means, 0.0), dtype=np.float64)
+        count += np.einsum('fc,bcjk->bfjk', masks[:, start:end], present, dtype=np.float64)
+        start = end
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(count > 0, total / count, np.nan)
+    mean_low, mean_high = _interval(means, confidence)
+
+    # 재표본별 국가 순위 (AggregateCube.rank와 같은 평균 내림차순, NaN은 최하위)
+    order = np.argsort(-np.where(np.isnan(means), -np.inf, means), axis=2, kind='stable')
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, len(cube.countries) + 1)[None, None, :, None], axis=2)
+    tail = (1 - confidence) / 2 * 100
+    rank_low = np.percentile(ranks, tail, axis=0, method='lower')
+    rank_high = np.percentile(ranks, 100 - tail, axis=0, method='higher')
+
+    return BootstrapSummary(
+        categories=tensor.categories,
+        filters=cube.filters,
+        countries=cube.countries,
+        metrics=cube.metrics,
+        category_low=category_low,
+        category_high=category_high,
+        mean_low=mean_low,
+        mean_high=mean_high,
+        rank_low=rank_low.astype(np.int64),
+        rank_high=rank_high.astype(np.int64),
+        rank_stability=(ranks == cube.rank[None]).mean(axis=0),
+        n_resamples=n_resamples,
+        confidence=confidence,
+        seed=seed
+    )
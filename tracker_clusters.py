@@ -0,0 +1,244 @@
+"""중분류/세부기술 국가 경쟁구도 군집 및 유사 항목 (5개국 × 기술수준/격차/기초/응용 특성 벡터)
+
+특성 벡터는 (국가, 지표) 20차원이며 지표마다 5개국 값을 합쳐 표준화한다. profile 방식은 먼저 각 행에서 지표별
+5개국 평균을 빼 "어느 나라가 앞서고 어느 나라가 뒤처지는가"만 남기고, level 방식은 값 자체를 쓴다.
+거리는 ||a||² + ||b||² - 2a·b 행렬곱으로 한 번에 계산한다. k-means는 numpy(k-means++ 초기화, seed 고정),
+계층 군집(Ward)은 scipy가 설치된 경우에만 사용하며 n²에 비례하는 메모리가 들어 HIERARCHICAL_MAX_ROWS행까지 허용한다.
+"""
+import importlib.util
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+CLUSTER_SEED = 2020
+FEATURE_MODES = {'profile': '국가 간 상대 구도', 'level': '절대 수준'}
+CLUSTER_METHODS = {'kmeans': 'k-means', 'ward': '계층 군집 (Ward)'}
+CLUSTER_LEVELS = {'category': '중분류', 'detail': '세부기술'}
+HIERARCHICAL_MAX_ROWS = 5000
+KMEANS_INIT = 4
+KMEANS_MAX_ITER = 100
+
+
+def hierarchical_available():
+    """계층 군집 사용 가능 여부 (scipy 설치 시)"""
+    return importlib.util.find_spec('scipy') is not None
+
+
+def build_features(values, mode='profile'):
+    """(행, 국가, 지표) 값 -> 표준화 특성 (행, 국가 × 지표), 결측은 지표 평균(0)으로 채움"""
+    if mode not in FEATURE_MODES:
+        raise ValueError(f"mode는 {', '.join(FEATURE_MODES)} 중 하나여야 합니다: {mode}")
+    values = np.asarray(values, dtype=np.float64)
+    with warnings.catch_warnings():
+        # 값이 모두 비어 있는 행/지표의 평균 경고 무시 (결과는 NaN -> 0으로 채움)
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if mode == 'profile':
+            values = values - np.nanmean(values, axis=1, keepdims=True)
+        mean = np.nanmean(values, axis=(0, 1))
+        std = np.nanstd(values, axis=(0, 1))
+    scaled = (values - mean) / np.where(std > 0, std, 1.0)
+    return np.nan_to_num(scaled.reshape(len(values), -1), nan=0.0)
+
+
+def squared_distances(a, b):
+    """(n, d) × (m, d) -> (n, m) 제곱 유클리드 거리"""
+    distances = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * (a @ b.T)
+    return np.maximum(distances, 0, out=distances)
+
+
+def _kmeans_plus_plus(features, k, rng):
+    centers = [features[rng.integers(len(features))]]
+    closest = squared_distances(features, centers[0][None])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        # 모든 점이 기존 중심과 같으면 임의 선택
+        pick = rng.integers(len(features)) if total <= 0 else rng.choice(len(features), p=closest / total)
+        centers.append(features[pick])
+        closest = np.minimum(closest, squared_distances(features, features[pick][None])[:, 0])
+    return np.array(centers)
+
+
+def _assign(features, norms, centers):
+    """가장 가까운 중심 -> (군집 번호, 제곱거리) (행 제곱노름 norms는 미리 계산해 반복마다 재사용)"""
+    partial = (centers * centers).sum(axis=1)[None, :] - 2 * (features @ centers.T)
+    labels = partial.argmin(axis=1)
+    closest = np.maximum(norms + partial[np.arange(len(features)), labels], 0)
+    return labels, closest
+
+
+def kmeans(features, k, seed=CLUSTER_SEED, n_init=KMEANS_INIT, max_iter=KMEANS_MAX_ITER, tol=1e-4):
+    """k-means -> (군집 번호 (n,), 중심 (k, d), 관성)
+
+    k-means++ 초기화를 n_init번 시도해 관성(중심까지 제곱거리 합)이 가장 작은 결과를 쓴다. 중심 이동량
+    제곱합이 tol × 특성 평균 분산 이하가 되면 멈추고, 비어 버린 군집은 현재 중심에서 가장 먼 점으로 다시 시작한다.
+    """
+    n = len(features)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    norms = (features * features).sum(axis=1)
+    threshold = tol * features.var(axis=0).mean()
+    clusters = np.arange(k)
+    best = None
+    for _ in range(n_init):
+        centers = _kmeans_plus_plus(features, k, rng)
+        for _ in range(max_iter):
+            labels, closest = _assign(features, norms, centers)
+            # 군집별 합 = one-hot(k, n) @ features
+            members = (labels[None, :] == clusters[:, None]).astype(features.dtype)
+            counts = members.sum(axis=1)
+            updated = (members @ features) / np.maximum(counts, 1)[:, None]
+            for empty in np.flatnonzero(counts == 0):
+                far = int(closest.argmax())
+                updated[empty], closest[far] = features[far], 0.0
+            shift = ((updated - centers) ** 2).sum()
+            centers = updated
+            if shift <= threshold:
+                break
+        labels, closest = _assign(features, norms, centers)
+        inertia = float(closest.sum())
+        if best is None or inertia < best[2]:
+            best = (labels, centers, inertia)
+    return best
+
+
+def ward(features, k):
+    """Ward 계층 군집 -> 군집 번호 (n,) (scipy 필요, HIERARCHICAL_MAX_ROWS행 이하)"""
+    if len(features) > HIERARCHICAL_MAX_ROWS:
+        raise ValueError(f"계층 군집은 {HIERARCHICAL_MAX_ROWS:,}행까지 지원합니다 ({len(features):,}행) - k-means를 사용하세요.")
+    if len(features) < 2:
+        return np.zeros(len(features), dtype=np.int64)
+    # 선택 의존성 (requirements에 없음)
+    from scipy.cluster.hierarchy import fcluster, linkage
+    return fcluster(linkage(features, method='ward'), t=k, criterion='maxclust').astype(np.int64) - 1
+
+
+def _relabel_by_size(labels, k):
+    """군집 번호를 크기 내림차순(동률은 첫 등장 순)으로 다시 매김"""
+    counts = np.bincount(labels, minlength=k)
+    first = np.full(k, len(labels))
+    np.minimum.at(first, labels, np.arange(len(labels)))
+    order = np.lexsort((first, -counts))
+    mapping = np.empty(k, dtype=np.int64)
+    mapping[order] = np.arange(k)
+    return mapping[labels]
+
+
+@dataclass(frozen=True)
+class ClusterResult:
+    """군집 결과 (행 순서는 names와 같음)
+
+    profiles[c, j, k]는 군집 c에 속한 행들의 countries[j] 국가 metrics[k] 지표 원래 값 평균, coords는 특성의
+    주성분 2개 좌표, explained는 두 주성분의 설명 분산 비율이다. groups는 세부기술이면 소속 중분류, 중분류면 감축/적응 구분.
+    """
+    names: np.ndarray
+    groups: np.ndarray
+    labels: np.ndarray
+    features: np.ndarray
+    profiles: np.ndarray
+    sizes: np.ndarray
+    coords: np.ndarray
+    explained: np.ndarray
+    countries: pd.Index
+    metrics: pd.Index
+    level: str
+    method: str
+    mode: str
+    k: int
+    inertia: float
+
+    def neighbors(self, position, n=10):
+        """position 행과 특성 거리가 가장 가까운 n개 -> (위치, 거리) (자기 자신 제외, 가까운 순)"""
+        distances = squared_distances(self.features[position][None], self.features)[0]
+        distances[position] = np.inf
+        n = min(n, len(distances) - 1)
+        if n <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        nearest = np.argpartition(distances, n - 1)[:n]
+        nearest = nearest[np.lexsort((nearest, distances[nearest]))]
+        return nearest, np.sqrt(distances[nearest])
+
+    def representatives(self, cluster, n=3):
+        """군집 중심에 가장 가까운 n개 행 위치"""
+        members = np.flatnonzero(self.labels == cluster)
+        center = self.features[members].mean(axis=0)
+        distances = squared_distances(self.features[members], center[None])[:, 0]
+        return members[np.argsort(distances, kind='stable')[:n]]
+
+    def describe(self, cluster, country_labels=None, metric_labels=None, metric='tech_level'):
+        """군집의 경쟁구도 요약 (예: '미국 > EU > 일본 > 한국 > 중국 · 중국 기초연구 높음')
+
+        metric 지표 평균 순위와, 군집 중심이 전체 평균(표준화 0)에서 가장 멀리 떨어진 (국가, 지표) 특성.
+        """
+        country_labels, metric_labels = country_labels or {}, metric_labels or {}
+        values = self.profiles[cluster, :, self.metrics.get_loc(metric)]
+        order = np.argsort(-np.where(np.isnan(values), -np.inf, values), kind='stable')
+        ranking = ' > '.join(str(country_labels.get(self.countries[j], self.countries[j])) for j in order)
+        center = self.features[self.labels == cluster].mean(axis=0)
+        j, k = divmod(int(np.abs(center).argmax()), len(self.metrics))
+        country, name = self.countries[j], self.metrics[k]
+        trait = f"{country_labels.get(country, country)} {metric_labels.get(name, name)} {'높음' if center[j * len(self.metrics) + k] > 0 else '낮음'}"
+        return f"{ranking} · {trait}"
+
+
+def cluster_values(values, names, groups, countries, metrics, level='category', method='kmeans', k=4,
+                   mode='profile', seed=CLUSTER_SEED):
+    """(행, 국가, 지표) 값 배열 군집 -> ClusterResult"""
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"method는 {', '.join(CLUSTER_METHODS)} 중 하나여야 합니다: {method}")
+    features = build_features(values, mode)
+    k = max(1, min(k, len(features)))
+    if method == 'kmeans':
+        labels, _, inertia = kmeans(features, k, seed)
+    else:
+        labels = ward(features, k)
+        k = int(labels.max()) + 1 if len(labels) else 1
+        centers = np.stack([features[labels == c].mean(axis=0) for c in range(k)])
+        inertia = float(((features - centers[labels]) ** 2).sum())
+    labels = _relabel_by_size(labels, k)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        profiles = np.stack([np.nanmean(values[labels == c], axis=0) for c in range(k)])
+
+    # 주성분 2개 (산점도 좌표)
+    centered = features - features.mean(axis=0)
+    _, singular, vt = np.linalg.svd(centered, full_matrices=False)
+    components = vt[:2]
+    coords = centered @ components.T
+    if coords.shape[1] < 2:
+        coords = np.pad(coords, ((0, 0), (0, 2 - coords.shape[1])))
+    variance = singular ** 2
+    explained = variance[:2] / variance.sum() if variance.sum() > 0 else np.zeros(2)
+
+    return ClusterResult(
+        names=np.asarray(names, dtype=object),
+        groups=np.asarray(groups, dtype=object),
+        labels=labels,
+        features=features,
+        profiles=profiles,
+        sizes=np.bincount(labels, minlength=k),
+        coords=coords,
+        explained=np.pad(explained, (0, 2 - len(explained))),
+        countries=countries,
+        metrics=metrics,
+        level=level,
+        method=method,
+        mode=mode,
+        k=k,
+        inertia=inertia
+    )
+
+
+def cluster_dataset(dataset, level='category', method='kmeans', k=4, mode='profile', seed=CLUSTER_SEED):
+    """TrackerDataset -> ClusterResult (level: category 중분류, detail 세부기술 df 행 순서)"""
+    if level == 'category':
+        tensor = dataset.tensor
+        return cluster_values(tensor.values, tensor.categories, tensor.types, tensor.countries, tensor.metrics,
+                              level, method, k, mode, seed)
+    if level == 'detail':
+        details = dataset.details
+        return cluster_values(details.values, details.names, dataset.df['tech_category'].to_numpy(dtype=object),
+                              details.countries, details.metrics, level, method, k, mode, seed)
+    raise ValueError(f"level은 {', '.join(CLUSTER_LEVELS)} 중 하나여야 합니다: {level}")
@@ -0,0 +1,839 @@
+"""기후기술 델파이조사 tracker 워크북 로딩/전처리 (Streamlit 비의존)"""
+import contextlib
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 잠금 없이 각 프로세스가 직접 갱신
+    fcntl = None
+
+from tracker_bootstrap import bootstrap_dataset
+from tracker_clusters import cluster_dataset
+from tracker_search import SearchIndex, build_search_index
+
+# 원본 워크북 컬럼명 -> 내부 컬럼명
+COLUMN_MAPPING = {
+    '세부기술': 'tech_detail',
+    '중분류': 'tech_category',
+    '감축/적응': 'type',
+    '최고 기술 보유국': 'leading_country',
+    '한국-기술 수준 (%)': 'kr_tech_level',
+    '한국-기술 격차 (년)': 'kr_tech_gap',
+    '한국-기술 수준 그룹': 'kr_tech_group',
+    '중국-기술 수준 (%)': 'cn_tech_level',
+    '중국-기술 격차 (년)': 'cn_tech_gap',
+    '중국-기술 수준 그룹': 'cn_tech_group',
+    '일본-기술 수준 (%)': 'jp_tech_level',
+    '일본-기술 격차 (년)': 'jp_tech_gap',
+    '일본-기술 수준 그룹': 'jp_tech_group',
+    '미국-기술 수준 (%)': 'us_tech_level',
+    '미국-기술 격차 (년)': 'us_tech_gap',
+    '미국-기술 수준 그룹': 'us_tech_group',
+    'EU-기술 수준 (%)': 'eu_tech_level',
+    'EU-기술 격차 (년)': 'eu_tech_gap',
+    'EU-기술 수준 그룹': 'eu_tech_group',
+    '한국-연구 개발 활동 경향': 'kr_rd_trend',
+    '한국-기초 연구 역량(점)': 'kr_basic_research',
+    '한국-응용 개발 연구 역량(점)': 'kr_applied_research',
+    '중국-연구 개발 활동 경향': 'cn_rd_trend',
+    '중국-기초 연구 역량(점)': 'cn_basic_research',
+    '중국-응용 개발 연구 역량(점)': 'cn_applied_research',
+    '일본-연구 개발 활동 경향': 'jp_rd_trend',
+    '일본-기초 연구 역량(점)': 'jp_basic_research',
+    '일본-응용 개발 연구 역량(점)': 'jp_applied_research',
+    '미국-연구 개발 활동 경향': 'us_rd_trend',
+    '미국-기초 연구 역량(점)': 'us_basic_research',
+    '미국-응용 개발 연구 역량(점)': 'us_applied_research',
+    'EU-연구 개발 활동 경향': 'eu_rd_trend',
+    'EU-기초 연구 역량(점)': 'eu_basic_research',
+    'EU-응용 개발 연구 역량(점)': 'eu_applied_research'
+}
+
+# 국가 코드 및 수치 지표 (컬럼명: {국가}_{지표})
+COUNTRY_CODES = ['kr', 'cn', 'jp', 'us', 'eu']
+COUNTRY_NAMES = ['한국', '중국', '일본', '미국', 'EU']
+NUMERIC_METRICS = ['tech_level', 'tech_gap', 'basic_research', 'applied_research']
+CATEGORICAL_METRICS = ['tech_group', 'rd_trend']
+LONG_COLUMNS = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in NUMERIC_METRICS]
+
+# 중분류 집계 결과 컬럼 (국가별 기술수준/격차/그룹 -> 국가별 R&D 경향/역량 순)
+CATEGORY_COLUMNS = (
+    ['type']
+    + [f'{code}_{metric}' for code in COUNTRY_CODES for metric in ['tech_level', 'tech_gap', 'tech_group']]
+    + [f'{code}_{metric}' for code in COUNTRY_CODES for metric in ['rd_trend', 'basic_research', 'applied_research']]
+    + ['leading_country']
+)
+
+# 감축/적응 필터 및 선도 기준 (기술수준 %)
+TYPE_FILTERS = ['전체', '감축', '적응']
+LEADER_LEVEL = 90
+
+# 조사연도별 워크북 파일명
+WORKBOOK_PATTERN = re.compile(r'^tracker(20\d{2})\.xlsx$')
+
+# 스냅샷 포맷이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_SCHEMA = 2
+CACHE_DIR_ENV = 'TRACKER_CACHE_DIR'
+
+
+def read_tracker_workbook(path, sheet_name=0):
+    """워크북을 읽어 컬럼명 정리 및 숫자 컬럼 변환"""
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    # 숫자 컬럼 변환
+    numeric_cols = [col for col in df.columns if 'tech_level' in col or 'tech_gap' in col or 'research' in col]
+    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+
+    return df
+
+
+def categorical_mode(df, key, columns, missing='N/A'):
+    """그룹별 최빈값 (동률이면 정렬 순서상 가장 앞선 값)
+
+    그룹별 Series.mode().iloc[0]과 같은 결과를 (그룹, 값) 쌍의 빈도 행렬과
+    argmax로 한 번에 계산한다. 유효한 값이 없는 그룹은 missing으로 채운다.
+    """
+    group_codes, groups = pd.factorize(df[key], sort=True)
+    valid_group = group_codes >= 0
+    modes = {}
+    for col in columns:
+        value_codes, values = pd.factorize(df[col], sort=True)
+        valid = valid_group & (value_codes >= 0)
+        if len(values) == 0:
+            modes[col] = np.full(len(groups), missing, dtype=object)
+            continue
+        counts = np.bincount(
+            group_codes[valid] * len(values) + value_codes[valid],
+            minlength=len(groups) * len(values)
+        ).reshape(len(groups), len(values))
+        mode_values = np.asarray(values, dtype=object)[counts.argmax(axis=1)]
+        mode_values[counts.max(axis=1) == 0] = missing
+        modes[col] = mode_values
+    return pd.DataFrame(modes, index=pd.Index(groups, name=key))
+
+
+def aggregate_categories(df):
+    """중분류별 데이터 집계 (수치는 평균값, 범주형은 최빈값 사용)"""
+    columns = [col for col in CATEGORY_COLUMNS if col in df.columns]
+    mode_cols = [col for col in columns if col == 'leading_country' or col.endswith(tuple(CATEGORICAL_METRICS))]
+    mean_cols = [col for col in columns if col != 'type' and col not in mode_cols]
+
+    grouped = df.groupby('tech_category', sort=True)
+    category_data = grouped[mean_cols].mean()
+    category_data['type'] = grouped['type'].first()
+    category_data = category_data.join(categorical_mode(df, 'tech_category', mode_cols))
+    category_data['detail_count'] = grouped['tech_detail'].count()
+
+    return category_data[columns + ['detail_count']].reset_index()
+
+
+def diff_tracker_rows(old_df, new_df, key=('tech_category', 'tech_detail')):
+    """(tech_category, tech_detail) 기준 행 비교 -> (영향받은 중분류 집합, 변경 통계)
+
+    같은 키가 여러 번 나오면 등장 순서로 구분한다. 중분류 집계에 쓰는 컬럼(CATEGORY_COLUMNS)만 비교하므로
+    행 삽입/삭제로 뒤 행들의 '번호' 같은 매핑되지 않은 컬럼이 바뀌어도 해당 중분류만 영향받는다.
+    집계 컬럼 구성이 달라 행 단위로 비교할 수 없으면 None을 돌려주므로 전체 재집계해야 한다.
+    """
+    columns = [col for col in CATEGORY_COLUMNS if col in new_df.columns]
+    if columns != [col for col in CATEGORY_COLUMNS if col in old_df.columns]:
+        return None
+
+    def keyed(df):
+        keys = df[list(key)].astype(str)
+        occurrence = keys.groupby(list(key), sort=False).cumcount()
+        return df.set_index(pd.MultiIndex.from_arrays([keys[key[0]], keys[key[1]], occurrence]))
+
+    old, new = keyed(old_df), keyed(new_df)
+    removed = old.index.difference(new.index)
+    added = new.index.difference(old.index)
+    common = old.index.intersection(new.index)
+    before, after = old.loc[common, columns], new.loc[common, columns]
+    same = (before == after) | (before.isna() & after.isna())
+    changed = common[~same.all(axis=1).to_numpy()]
+
+    affected = set()
+    for index in (removed, added, changed):
+        affected.update(index.get_level_values(0))
+    stats = {'added': len(added), 'removed': len(removed), 'changed': len(changed)}
+    return affected, stats
+
+
+def update_category_data(category_data, df, affected):
+    """affected 중분류만 df에서 다시 집계해 category_data 갱신 (나머지 행은 그대로 재사용)"""
+    keep = category_data[~category_data['tech_category'].isin(affected)]
+    updated = aggregate_categories(df[df['tech_category'].isin(affected)])
+    if len(updated) == 0:
+        return keep.reset_index(drop=True)
+    merged = pd.concat([keep, updated], ignore_index=True)
+    return merged.sort_values('tech_category', kind='stable', ignore_index=True)
+
+
+@dataclass(frozen=True)
+class CategoryTensor:
+    """중분류 × 국가 × 지표 밀집 배열과 라벨 인덱스
+
+    values[i, j, k]는 categories[i]의 countries[j] 국가 metrics[k] 지표 평균이며,
+    types[i]는 해당 중분류의 감축/적응 구분이다.
+    """
+    values: np.ndarray
+    categories: pd.Index
+    countries: pd.Index
+    metrics: pd.Index
+    types: np.ndarray
+
+    def metric(self, metric):
+        """(중분류, 국가) 2차원 뷰"""
+        return self.values[:, :, self.metrics.get_loc(metric)]
+
+    def row(self, category):
+        """(국가, 지표) 2차원 뷰"""
+        return self.values[self.categories.get_loc(category)]
+
+    def select(self, rows):
+        """불리언 마스크 또는 위치 배열로 중분류 선택"""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return CategoryTensor(
+            np.ascontiguousarray(self.values[rows]),
+            self.categories[rows],
+            self.countries,
+            self.metrics,
+            self.types[rows]
+        )
+
+    def filter_type(self, selected_type):
+        """감축/적응 구분 필터 ('전체'면 그대로)"""
+        if selected_type == '전체':
+            return self
+        return self.select(self.types == selected_type)
+
+
+def build_category_tensor(category_data):
+    """중분류 집계 데이터 -> CategoryTensor"""
+    values = category_data[LONG_COLUMNS].to_numpy(dtype=np.float64).reshape(
+        len(category_data), len(COUNTRY_CODES), len(NUMERIC_METRICS))
+    return CategoryTensor(
+        np.ascontiguousarray(values),
+        pd.Index(category_data['tech_category'], name='tech_category'),
+        pd.Index(COUNTRY_CODES, name='country'),
+        pd.Index(NUMERIC_METRICS, name='metric'),
+        category_data['type'].to_numpy(dtype=object)
+    )
+
+
+@dataclass(frozen=True)
+class AggregateCube:
+    """감축/적응 필터 × 국가 × 지표 사전 집계
+
+    mean/count/max/argmax/rank는 (필터, 국가, 지표), leader_count(기술수준 90% 이상)와
+    group_leader_count(기술그룹 '선도')는 (필터, 국가) 배열이다. members[f]는 필터에
+    속한 중분류 위치, order[f]는 그중 한국 기술수준 내림차순 위치(NaN 제외)이다.
+    """
+    filters: pd.Index
+    countries: pd.Index
+    metrics: pd.Index
+    mean: np.ndarray
+    count: np.ndarray
+    max: np.ndarray
+    argmax: np.ndarray
+    rank: np.ndarray
+    leader_count: np.ndarray
+    group_leader_count: np.ndarray
+    category_count: np.ndarray
+    members: tuple
+    order: tuple
+
+    def get(self, stat, selected_type='전체', country=None, metric=None):
+        """집계값 조회 (country/metric을 생략하면 해당 축 전체)"""
+        values = getattr(self, stat)[self.filters.get_loc(selected_type)]
+        if country is not None:
+            values = values[self.countries.get_loc(country)]
+        if metric is not None:
+            values = values[..., self.metrics.get_loc(metric)]
+        return values[()] if np.ndim(values) == 0 else values
+
+
+def build_aggregate_cube(tensor, category_data):
+    """CategoryTensor로부터 필터 × 국가 × 지표 집계 큐브 구성"""
+    filters = pd.Index(TYPE_FILTERS, name='type')
+    masks = np.stack([
+        np.ones(len(tensor.categories), dtype=bool) if selected_type == '전체' else tensor.types == selected_type
+        for selected_type in TYPE_FILTERS
+    ])
+    values = tensor.values
+    valid = ~np.isnan(values)
+    flat = len(tensor.categories), -1
+    shape = (len(filters),) + values.shape[1:]
+
+    # 평균/개수: (필터, 중분류) 마스크 행렬곱
+    count = (masks.astype(np.int64) @ valid.reshape(flat)).reshape(shape)
+    total = (masks.astype(np.float64) @ np.where(valid, values, 0.0).reshape(flat)).reshape(shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, total / count, np.nan)
+
+    # 최댓값/최댓값 중분류
+    masked = np.where(masks[:, :, None, None] & valid[None], values[None], -np.inf)
+    argmax_pos = masked.argmax(axis=1)
+    max_values = np.where(count > 0, np.take_along_axis(masked, argmax_pos[:, None], axis=1)[:, 0], np.nan)
+    argmax = np.where(count > 0, np.asarray(tensor.categories, dtype=object)[argmax_pos], None)
+
+    # 국가 순위 (평균 내림차순, 1위부터)
+    order_by_mean = np.argsort(-np.where(np.isnan(mean), -np.inf, mean), axis=1, kind='stable')
+    rank = np.empty_like(order_by_mean)
+    np.put_along_axis(rank, order_by_mean, np.arange(1, len(tensor.countries) + 1)[None, :, None], axis=1)
+
+    levels = tensor.metric('tech_level')
+    leader_count = masks.astype(np.int64) @ (levels >= LEADER_LEVEL)
+    group_cols = [f'{code}_tech_group' for code in tensor.countries]
+    groups = category_data.reindex(columns=group_cols).to_numpy(dtype=object)
+    group_leader_count = masks.astype(np.int64) @ (groups == '선도')
+
+    kr_levels = levels[:, tensor.countries.get_loc('kr')]
+    kr_order = np.argsort(-kr_levels, kind='stable')
+    kr_order = kr_order[~np.isnan(kr_levels[kr_order])]
+
+    return AggregateCube(
+        filters=filters,
+        countries=tensor.countries,
+        metrics=tensor.metrics,
+        mean=mean,
+        count=count,
+        max=max_values,
+        argmax=argmax,
+        rank=rank,
+        leader_count=leader_count,
+        group_leader_count=group_leader_count,
+        category_count=masks.sum(axis=1),
+        members=tuple(np.flatnonzero(mask) for mask in masks),
+        order=tuple(kr_order[mask[kr_order]] for mask in masks)
+    )
+
+
+@dataclass(frozen=True)
+class LevelMatrix:
+    """히트맵용 (행 × 국가) 기술수준 행렬 (중분류 또는 세부기술 단위)
+
+    labels[i]는 행 이름, categories[i]는 소속 중분류, types[i]는 감축/적응 구분이다.
+    rows()/summary() 결과는 필터·정렬 조합별로 처음 요청될 때 계산해 보관하므로
+    페이지를 넘길 때는 보관된 위치 배열을 자르기만 한다.
+    """
+    values: np.ndarray
+    labels: np.ndarray
+    categories: np.ndarray
+    types: np.ndarray
+    countries: pd.Index
+    _memo: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def members(self, selected_type='전체'):
+        """감축/적응 구분 필터에 속한 행 위치"""
+        key = ('members', selected_type)
+        if key not in self._memo:
+            rows = np.arange(len(self.labels)) if selected_type == '전체' else np.flatnonzero(self.types == selected_type)
+            self._memo[key] = rows
+        return self._memo[key]
+
+    def rows(self, selected_type='전체', sort_by='kr', ascending=False):
+        """필터 후 정렬된 행 위치 (sort_by: 국가 코드 또는 'label', 값이 없는 행은 항상 마지막)"""
+        key = ('rows', selected_type, sort_by, ascending)
+        if key not in self._memo:
+            members = self.members(selected_type)
+            if sort_by == 'label':
+                order = members[np.argsort(self.labels[members], kind='stable')]
+                self._memo[key] = order if ascending else order[::-1]
+            else:
+                values = self.values[members, self.countries.get_loc(sort_by)]
+                valid = ~np.isnan(values)
+                order = np.argsort(values[valid] if ascending else -values[valid], kind='stable')
+                self._memo[key] = np.concatenate([members[valid][order], members[~valid]])
+        return self._memo[key]
+
+    def summary(self, selected_type='전체'):
+        """필터 전체 행의 국가별 요약 {'평균': 배열, '최고': 배열, '최저': 배열}"""
+        key = ('summary', selected_type)
+        if key not in self._memo:
+            values = self.values[self.members(selected_type)]
+            with warnings.catch_warnings():
+                # 값이 하나도 없는 국가 열은 NaN
+                warnings.simplefilter('ignore', RuntimeWarning)
+                self._memo[key] = {
+                    '평균': np.nanmean(values, axis=0),
+                    '최고': np.nanmax(values, axis=0) if len(values) else np.full(len(self.countries), np.nan),
+                    '최저': np.nanmin(values, axis=0) if len(values) else np.full(len(self.countries), np.nan)
+                }
+        return self._memo[key]
+
+
+def build_level_matrices(df, tensor):
+    """중분류/세부기술 단위 히트맵 행렬 -> {'category': LevelMatrix, 'detail': LevelMatrix}"""
+    categories = np.asarray(tensor.categories, dtype=object)
+    level_cols = [f'{code}_tech_level' for code in tensor.countries]
+    return {
+        'category': LevelMatrix(
+            np.ascontiguousarray(tensor.metric('tech_level')),
+            categories,
+            categories,
+            tensor.types,
+            tensor.countries
+        ),
+        'detail': LevelMatrix(
+            df.reindex(columns=level_cols).to_numpy(dtype=np.float64),
+            df['tech_detail'].astype(str).to_numpy(dtype=object),
+            df['tech_category'].to_numpy(dtype=object),
+            df['type'].to_numpy(dtype=object),
+            tensor.countries
+        )
+    }
+
+
+@dataclass(frozen=True)
+class DetailIndex:
+    """중분류 -> 세부기술 행 인덱스 (중분류 순으로 정렬한 행 위치 + 그룹 오프셋)
+
+    positions[offsets[i]:offsets[i + 1]]은 categories[i]에 속한 세부기술의 df 행 위치(원래 순서)이고
+    codes[p]는 df 행 p의 중분류 위치, values[p, j, k]는 countries[j] 국가 metrics[k] 지표 값이다.
+    """
+    categories: pd.Index
+    positions: np.ndarray
+    offsets: np.ndarray
+    codes: np.ndarray
+    names: np.ndarray
+    values: np.ndarray
+    countries: pd.Index
+    metrics: pd.Index
+
+    def rows(self, category):
+        """중분류에 속한 세부기술 행 위치 (없으면 빈 배열)"""
+        if category not in self.categories:
+            return self.positions[:0]
+        return self._group(self.categories.get_loc(category))
+
+    def _group(self, i):
+        return self.positions[self.offsets[i]:self.offsets[i + 1]]
+
+    def locate(self, category, detail):
+        """중분류 안에서 세부기술명으로 행 위치 찾기 (없으면 None)"""
+        rows = self.rows(category)
+        matches = rows[self.names[rows] == detail]
+        return int(matches[0]) if len(matches) else None
+
+    def category_of(self, position):
+        """df 행 position의 중분류명"""
+        return self.categories[self.codes[position]]
+
+    def percentile(self, position):
+        """df 행 position의 (국가, 지표)별 소속 중분류 내 백분위 (중간 순위 기준, 0~100)"""
+        peers = self.values[self._group(self.codes[position])]
+        value = self.values[position]
+        valid = ~np.isnan(peers)
+        below = ((peers < value) & valid).sum(axis=0)
+        equal = ((peers == value) & valid).sum(axis=0)
+        n_valid = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = (below + 0.5 * equal) / n_valid * 100
+        return np.where(np.isnan(value) | (n_valid == 0), np.nan, result)
+
+
+def build_detail_index(df):
+    """세부기술 df -> DetailIndex (중분류 정렬 순서는 aggregate_categories와 동일)"""
+    codes, categories = pd.factorize(df['tech_category'], sort=True)
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind='stable')
+    positions = np.flatnonzero(valid)[order]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[valid], minlength=len(categories)))])
+    values = df.reindex(columns=LONG_COLUMNS).to_numpy(dtype=np.float64).reshape(
+        len(df), len(COUNTRY_CODES), len(NUMERIC_METRICS))
+    return DetailIndex(
+        categories=pd.Index(categories, name='tech_category'),
+        positions=positions,
+        offsets=offsets,
+        codes=codes,
+        names=df['tech_detail'].astype(str).to_numpy(dtype=object),
+        values=np.ascontiguousarray(values),
+        countries=pd.Index(COUNTRY_CODES, name='country'),
+        metrics=pd.Index(NUMERIC_METRICS, name='metric')
+    )
+
+
+def category_versions(category_data, details):
+    """중분류별 집계 행 + 세부기술 값 해시 {중분류: 16자리 hex} (해당 중분류 figure/리포트 캐시 키, 부트스트랩 seed)
+
+    부트스트랩 신뢰구간은 세부기술 값과 중분류 안 순서에 따라 달라지므로 평균이 같아도 세부 값이 바뀌면 키가 바뀌도록
+    세부기술 행 해시를 중분류 안 순서대로 다항식(mod 2^64)으로 묶어 함께 해시한다.
+    """
+    rows = pd.util.hash_pandas_object(pd.DataFrame(details.values.reshape(len(details.values), -1)),
+                                      index=False).to_numpy()[details.positions]
+    sizes = np.diff(details.offsets)
+    rank = np.arange(len(rows)) - np.repeat(details.offsets[:-1], sizes)
+    with np.errstate(over='ignore'):
+        weights = np.power(np.uint64(0x100000001B3), rank.astype(np.uint64))
+        detail_hashes = np.add.reduceat(rows * weights, details.offsets[:-1]) if len(rows) else rows
+    aggregate = pd.Series(pd.util.hash_pandas_object(category_data, index=False).to_numpy(),
+                          index=category_data['tech_category'])
+    combined = pd.util.hash_pandas_object(pd.DataFrame({
+        'aggregate': aggregate.reindex(details.categories).to_numpy(),
+        'details': detail_hashes
+    }), index=False).to_numpy()
+    return dict(zip(details.categories, (f"{value:016x}" for value in combined)))
+
+
+# 데이터셋별 키 잠금 사전(_memo_locks) 접근만 보호 (계산은 키 잠금 안에서)
+_MEMO_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TrackerDataset:
+    """대시보드 데이터 모델 (조사연도 하나의 세부기술/중분류 데이터와 파생 구조)"""
+    df: pd.DataFrame
+    category_data: pd.DataFrame
+    tensor: CategoryTensor
+    cube: AggregateCube
+    heatmaps: dict
+    details: DetailIndex
+    search: SearchIndex
+    category_versions: dict
+    version: str
+    year: int = None
+    _memo: dict = field(default_factory=dict, repr=False, compare=False)
+    _memo_locks: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def _memoized(self, key, compute):
+        """처음 요청될 때 compute()로 계산해 데이터셋과 함께 보관
+
+        여러 세션/미리 채우기 스레드가 같은 키를 동시에 요청해도 한 번만 계산하고, 잠금은 (데이터셋, 키)별이라
+        오래 걸리는 계산(세부기술 군집 등)이 다른 키나 다른 데이터셋의 계산을 막지 않는다.
+        """
+        result = self._memo.get(key)
+        if result is None:
+            with _MEMO_LOCK:
+                lock = self._memo_locks.setdefault(key, threading.Lock())
+            with lock:
+                result = self._memo.get(key)
+                if result is None:
+                    result = self._memo[key] = compute()
+        return result
+
+    def bootstrap(self):
+        """중분류/국가 평균 부트스트랩 신뢰구간"""
+        return self._memoized('bootstrap', lambda: bootstrap_dataset(self))
+
+    def clusters(self, level='category', method='kmeans', k=4, mode='profile'):
+        """중분류/세부기술 국가 경쟁구도 군집 (설정 조합별 보관)"""
+        return self._memoized(('clusters', level, method, k, mode),
+                              lambda: cluster_dataset(self, level, method, k, mode))
+
+
+def build_dataset(df, category_data, version, year=None, previous=None):
+    """로드 결과로부터 대시보드 데이터 모델 구성
+
+    previous(이전 TrackerDataset)를 주면 중분류/세부기술 이름이 그대로일 때 검색 색인을 재사용한다.
+    나머지 파생 구조(텐서, 집계 큐브, 히트맵 행렬, 세부기술 색인, 중분류 버전 해시)는 증분 갱신 때도 전체 데이터로 다시 만든다.
+    """
+    tensor = build_category_tensor(category_data)
+    name_cols = ['tech_category', 'tech_detail']
+    if previous is not None and previous.df[name_cols].equals(df[name_cols]):
+        search = previous.search
+    else:
+        search = build_search_index(tensor.categories, df['tech_detail'], df['tech_category'])
+    details = build_detail_index(df)
+    return TrackerDataset(
+        df=df,
+        category_data=category_data,
+        tensor=tensor,
+        cube=build_aggregate_cube(tensor, category_data),
+        heatmaps=build_level_matrices(df, tensor),
+        details=details,
+        search=search,
+        category_versions=category_versions(category_data, details),
+        version=version,
+        year=year
+    )
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """워크북 내용 해시 (sha256)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_dir_for(path, cache_dir=None):
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return cache_dir
+    return os.path.join(os.path.dirname(os.path.abspath(path)), '.tracker_cache')
+
+
+def _snapshot_paths(cache_dir, stem, digest):
+    base = os.path.join(cache_dir, f"{stem}-{digest[:16]}")
+    return f"{base}.detail.arrow", f"{base}.category.arrow"
+
+
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(manifest_path, manifest):
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+    _write_atomic(manifest_path, write)
+
+
+def _read_snapshot(snapshot_path):
+    from pyarrow import feather
+    # 비압축 Arrow IPC 파일을 memory-map으로 연결, split_blocks로 수치 컬럼은 복사 없이 공유
+    return feather.read_table(snapshot_path, memory_map=True).to_pandas(split_blocks=True)
+
+
+def _write_snapshot(frame, snapshot_path):
+    from pyarrow import feather
+    _write_atomic(snapshot_path, lambda tmp_path: feather.write_feather(
+        frame, tmp_path, compression='uncompressed'))
+
+
+def _try_write(write):
+    # 캐시 디렉터리에 쓸 수 없어도 로딩 자체는 계속 진행
+    try:
+        write()
+    except OSError as e:
+        warnings.warn(f"tracker 스냅샷 저장 실패: {e}")
+
+
+@contextlib.contextmanager
+def _refresh_lock(cache_dir, stem):
+    """스냅샷 갱신 잠금 (같은 캐시 디렉터리를 쓰는 프로세스 중 먼저 잠근 하나만 워크북 파싱)"""
+    if fcntl is None:
+        yield
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        lock_file = open(os.path.join(cache_dir, f"{stem}.lock"), 'a+')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _manifest_matches(manifest, source, stat):
+    return (manifest is not None and manifest.get('schema') == SNAPSHOT_SCHEMA and manifest.get('source') == source
+            and (manifest['mtime_ns'], manifest['size']) == (stat.st_mtime_ns, stat.st_size))
+
+
+def _snapshot_state(path, cache_dir=None):
+    stat = os.stat(path)
+    cache_dir = _cache_dir_for(path, cache_dir)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    state = {
+        'path': path,
+        'source': os.path.abspath(path),
+        'stat': stat,
+        'cache_dir': cache_dir,
+        'stem': stem,
+        'manifest_path': os.path.join(cache_dir, f"{stem}.json")
+    }
+
+    manifest = _read_manifest(state['manifest_path'])
+    if manifest and (manifest.get('schema') != SNAPSHOT_SCHEMA or manifest.get('source') != state['source']):
+        manifest = None
+    state['manifest'] = manifest
+
+    if manifest and (manifest['mtime_ns'], manifest['size']) == (stat.st_mtime_ns, stat.st_size):
+        state['digest'] = manifest['sha256']
+    else:
+        # mtime만 바뀐 경우(복사, touch 등)에는 내용 해시로 재확인
+        state['digest'] = file_digest(path)
+    return state
+
+
+def _load_snapshot(state):
+    manifest, stat = state['manifest'], state['stat']
+    if not manifest or manifest['sha256'] != state['digest']:
+        return None
+
+    detail_path, category_path = _snapshot_paths(state['cache_dir'], state['stem'], state['digest'])
+    try:
+        df = _read_snapshot(detail_path)
+        category_data = _read_snapshot(category_path)
+    except (OSError, ValueError):
+        return None
+
+    if (manifest['mtime_ns'], manifest['size']) != (stat.st_mtime_ns, stat.st_size):
+        manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        _try_write(lambda: _write_manifest(state['manifest_path'], manifest))
+    return df, category_data, state['digest']
+
+
+def _publish_snapshot(state, df, category_data):
+    cache_dir, stem, digest = state['cache_dir'], state['stem'], state['digest']
+    detail_path, category_path = _snapshot_paths(cache_dir, stem, digest)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_snapshot(df, detail_path)
+    _write_snapshot(category_data, category_path)
+    stale = state['manifest']['sha256'] if state['manifest'] else None
+    _write_manifest(state['manifest_path'], {
+        'schema': SNAPSHOT_SCHEMA,
+        'source': state['source'],
+        'mtime_ns': state['stat'].st_mtime_ns,
+        'size': state['stat'].st_size,
+        'sha256': digest,
+        'published_at': time.time(),
+        'publisher': os.getpid()
+    })
+    if stale and stale != digest:
+        for old_path in _snapshot_paths(cache_dir, stem, stale):
+            if os.path.exists(old_path):
+                os.remove(old_path)
+
+
+def load_cached_tracker(path, cache_dir=None):
+    """최신 스냅샷이 있으면 (df, category_data, 내용 해시), 없으면 None"""
+    return _load_snapshot(_snapshot_state(path, cache_dir))
+
+
+def load_tracker(path, cache_dir=None):
+    """워크북 로드 (Arrow 스냅샷 캐시 사용)
+
+    스냅샷은 워크북 경로, mtime, 내용 해시로 식별되며 워크북 내용이 바뀐 경우에만
+    openpyxl 파싱을 다시 수행한다. 캐시 디렉터리를 공유하는 여러 프로세스(Streamlit
+    레플리카)가 동시에 갱신을 시도하면 잠금을 먼저 얻은 하나만 파싱/게시하고 나머지는
+    기다렸다가 게시된 스냅샷에 연결한다. 반환값: (df, category_data, 내용 해시)
+    """
+    state = _snapshot_state(path, cache_dir)
+    cached = _load_snapshot(state)
+    if cached is not None:
+        return cached
+
+    with _refresh_lock(state['cache_dir'], state['stem']):
+        # 잠금을 기다리는 동안 다른 프로세스가 게시했으면 그 스냅샷 사용
+        state = _snapshot_state(path, cache_dir)
+        cached = _load_snapshot(state)
+        if cached is not None:
+            return cached
+
+        df = read_tracker_workbook(path)
+        category_data = aggregate_categories(df)
+        _try_write(lambda: _publish_snapshot(state, df, category_data))
+    return df, category_data, state['digest']
+
+
+def refresh_tracker(path, previous=None, cache_dir=None):
+    """워크북 변경 반영 (이전 로드 결과 대비 바뀐 행의 중분류만 재집계)
+
+    previous: 이전 (df, category_data, 내용 해시). 다른 프로세스가 이미 같은 내용을 게시했으면
+    스냅샷에 연결하고, 직접 파싱한 경우에만 행 비교 후 영향받은 중분류를 다시 집계한다.
+    반환값: (df, category_data, 내용 해시, 변경 통계)
+    """
+    state = _snapshot_state(path, cache_dir)
+    if previous is not None and state['digest'] == previous[2]:
+        return (*previous, {'mode': 'unchanged'})
+    cached = _load_snapshot(state)
+    if cached is not None:
+        return (*cached, {'mode': 'snapshot'})
+
+    with _refresh_lock(state['cache_dir'], state['stem']):
+        state = _snapshot_state(path, cache_dir)
+        cached = _load_snapshot(state)
+        if cached is not None:
+            return (*cached, {'mode': 'snapshot'})
+
+        df = read_tracker_workbook(path)
+        diff = diff_tracker_rows(previous[0], df) if previous is not None else None
+        if diff is None:
+            category_data = aggregate_categories(df)
+            stats = {'mode': 'full'}
+        else:
+            affected, stats = diff
+            category_data = update_category_data(previous[1], df, affected)
+            stats = {'mode': 'incremental', **stats, 'categories': sorted(affected)}
+        _try_write(lambda: _publish_snapshot(state, df, category_data))
+    return df, category_data, state['digest'], stats
+
+
+def snapshot_versions(directory='.', cache_dir=None):
+    """조사연도별 공유 스냅샷 버전 스탬프 ((연도, 스탬프), ...)
+
+    stat과 manifest만 읽으므로 매 실행마다 호출할 수 있다. 워크북이 게시된 스냅샷과
+    같으면 내용 해시, 아니면 'stale:' 스탬프를 돌려주므로 스탬프가 바뀔 때만 다시 로드하면 된다.
+    """
+    versions = []
+    for year, path in discover_workbooks(directory).items():
+        stat = os.stat(path)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        manifest = _read_manifest(os.path.join(_cache_dir_for(path, cache_dir), f"{stem}.json"))
+        if _manifest_matches(manifest, os.path.abspath(path), stat):
+            versions.append((year, manifest['sha256']))
+        else:
+            versions.append((year, f"stale:{stat.st_mtime_ns}:{stat.st_size}"))
+    return tuple(versions)
+
+
+def discover_workbooks(directory='.'):
+    """조사연도별 tracker20XX.xlsx 탐색 -> {연도: 경로}"""
+    workbooks = {}
+    for name in os.listdir(directory):
+        match = WORKBOOK_PATTERN.match(name)
+        if match:
+            workbooks[int(match.group(1))] = os.path.join(directory, name)
+    return dict(sorted(workbooks.items()))
+
+
+def load_tracker_years(directory='.', cache_dir=None, max_workers=None):
+    """전체 조사연도 워크북 로드 -> {연도: (df, category_data, 내용 해시)}
+
+    스냅샷이 최신인 워크북은 현재 프로세스에서 바로 읽고, 다시 파싱해야 하는
+    워크북이 여러 개면 프로세스 풀에서 병렬로 파싱한다.
+    """
+    workbooks = discover_workbooks(directory)
+    results = {}
+    stale = {}
+    for year, path in workbooks.items():
+        cached = load_cached_tracker(path, cache_dir)
+        if cached is None:
+            stale[year] = path
+        else:
+            results[year] = cached
+
+    if len(stale) > 1:
+        workers = min(len(stale), max_workers or os.cpu_count() or 1)
+        # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn 사용
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn')) as pool:
+            futures = {year: pool.submit(load_tracker, path, cache_dir) for year, path in stale.items()}
+            for year, future in futures.items():
+                results[year] = future.result()
+    else:
+        for year, path in stale.items():
+            results[year] = load_tracker(path, cache_dir)
+
+    return dict(sorted(results.items()))
@@ -0,0 +1,64 @@
+"""분석 결과 내보내기 (CSV / Parquet / 다중 시트 XLSX 바이트 생성)"""
+import io
+
+import pandas as pd
+
+from tracker_data import COUNTRY_CODES, COUNTRY_NAMES
+
+# 대용량 내보내기 시 한 번에 직렬화할 행 수
+CHUNK_ROWS = 50_000
+
+# 국가별 시트 컬럼 ({국가}_{지표} -> 표시명)
+COUNTRY_SHEET_COLUMNS = {
+    'tech_level': '기술수준(%)',
+    'tech_gap': '기술격차(년)',
+    'tech_group': '기술그룹',
+    'rd_trend': 'R&D활동경향',
+    'basic_research': '기초연구역량',
+    'applied_research': '응용연구역량'
+}
+
+
+def to_csv_bytes(frame, chunk_rows=CHUNK_ROWS):
+    """CSV 바이트 (utf-8-sig, chunk_rows 단위로 나눠 기록)"""
+    buffer = io.BytesIO()
+    # BOM은 스트림 시작에 한 번만 기록
+    with io.TextIOWrapper(buffer, encoding='utf-8-sig', newline='') as text:
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            frame.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+        text.flush()
+        return buffer.getvalue()
+
+
+def to_parquet_bytes(frame, chunk_rows=CHUNK_ROWS):
+    """Parquet 바이트 (chunk_rows 단위 row group)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), buffer, row_group_size=chunk_rows)
+    return buffer.getvalue()
+
+
+def country_frame(category_data, code):
+    """중분류별 특정 국가 지표 시트"""
+    columns = {f'{code}_{metric}': label for metric, label in COUNTRY_SHEET_COLUMNS.items()
+               if f'{code}_{metric}' in category_data.columns}
+    frame = category_data[['tech_category', 'type'] + list(columns)]
+    return frame.rename(columns={'tech_category': '중분류', 'type': '구분', **columns})
+
+
+def workbook_sheets(df, category_data):
+    """XLSX 내보내기 시트 구성 (세부기술, 중분류, 국가별)"""
+    sheets = {'세부기술': df, '중분류': category_data}
+    for code, name in zip(COUNTRY_CODES, COUNTRY_NAMES):
+        sheets[name] = country_frame(category_data, code)
+    return sheets
+
+
+def to_xlsx_bytes(sheets):
+    """다중 시트 XLSX 바이트"""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name[:31], index=False)
+    return buffer.getvalue()
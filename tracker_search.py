@@ -0,0 +1,154 @@
+"""중분류/세부기술 이름 검색 (자모 단위 n-gram 역색인, 초성 검색 및 오타 허용)"""
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+# 한글 음절 -> 호환 자모 (초성, 중성, 종성)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+             'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = len(CHOSEONG) * len(JUNGSEONG) * len(JONGSEONG)
+
+# str.translate 테이블 (음절마다 자모 문자열 / 초성 한 글자)
+JAMO_TABLE = {
+    HANGUL_BASE + i: CHOSEONG[i // 588] + JUNGSEONG[i % 588 // 28] + JONGSEONG[i % 28]
+    for i in range(HANGUL_COUNT)
+}
+CHOSEONG_TABLE = {HANGUL_BASE + i: CHOSEONG[i // 588] for i in range(HANGUL_COUNT)}
+
+# 검색에서 무시하는 구분 문자
+SEPARATORS = re.compile(r'[\s·ㆍ.,:;/\\()\[\]{}<>\-_&+\'"]+')
+
+NGRAM = 3
+# 질의 n-gram 중 이 비율 이상 겹쳐야 후보 (오타 허용 정도)
+MIN_OVERLAP = 0.4
+# 자모 부분 문자열(입력 중인 음절 포함)/음절 단위 부분 문자열/접두어 일치 가점, 중분류 가점 (동점이면 중분류를 먼저)
+SUBSTRING_BONUS = 1.0
+SYLLABLE_BONUS = 0.5
+PREFIX_BONUS = 0.5
+CATEGORY_BONUS = 0.05
+
+
+def normalize(text):
+    """소문자화 및 공백/구분 문자 제거"""
+    return SEPARATORS.sub('', str(text).lower())
+
+
+def to_jamo(text):
+    """한글 음절을 자모로 분해 (다른 문자는 그대로)"""
+    return text.translate(JAMO_TABLE)
+
+
+def to_choseong(text):
+    return text.translate(CHOSEONG_TABLE)
+
+
+def ngrams(text, n=NGRAM):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """검색 결과 (kind: 'category' 또는 'detail', position: 세부기술 df 행 위치, 중분류면 -1)"""
+    kind: str
+    name: str
+    category: str
+    position: int
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """중분류/세부기술 이름의 자모 n-gram 역색인
+
+    texts/jamo/choseong은 정규화한 이름과 그 자모/초성 문자열, postings[gram]은 해당 n-gram을 포함하는 항목 번호 배열이고, gram_counts[i]는 항목 i의
+    n-gram 개수다. 질의는 겹치는 n-gram 수로 후보를 고른 뒤 Dice 계수와 부분 일치 가점으로 순위를 매긴다.
+    """
+    kinds: np.ndarray
+    names: np.ndarray
+    categories: np.ndarray
+    positions: np.ndarray
+    texts: np.ndarray
+    jamo: np.ndarray
+    choseong: np.ndarray
+    postings: dict
+    gram_counts: np.ndarray
+
+    def search(self, query, limit=10):
+        """질의 -> 점수 내림차순 SearchHit 목록 (초성만 입력하면 초성 검색)"""
+        text = normalize(query)
+        if not text:
+            return []
+        if all(char in CHOSEONG for char in text):
+            scores = self._choseong_scores(text)
+        else:
+            scores = self._ngram_scores(text)
+
+        candidates = np.flatnonzero(scores > 0)
+        scores = scores[candidates] + np.where(self.kinds[candidates] == 'category', CATEGORY_BONUS, 0.0)
+        order = np.argsort(-scores, kind='stable')[:limit]
+        return [
+            SearchHit(self.kinds[i], self.names[i], self.categories[i], int(self.positions[i]), float(score))
+            for i, score in zip(candidates[order], scores[order])
+        ]
+
+    def _choseong_scores(self, text):
+        found = np.char.find(self.choseong, text)
+        lengths = np.maximum(np.char.str_len(self.choseong), 1)
+        return np.where(found >= 0, len(text) / lengths + SUBSTRING_BONUS + np.where(found == 0, PREFIX_BONUS, 0.0), 0.0)
+
+    def _ngram_scores(self, text):
+        jamo = to_jamo(text)
+        scores = np.zeros(len(self.names))
+        grams = ngrams(jamo)
+        if grams:
+            lists = [self.postings[gram] for gram in grams if gram in self.postings]
+            if not lists:
+                return scores
+            shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+            candidates = np.flatnonzero(shared >= max(1, math.ceil(len(grams) * MIN_OVERLAP)))
+            scores[candidates] = 2 * shared[candidates] / (len(grams) + self.gram_counts[candidates])
+            # 부분 문자열이면 질의의 n-gram이 모두 겹침
+            candidates = candidates[shared[candidates] == len(grams)]
+        else:
+            # n-gram보다 짧은 질의 (한 글자 등)는 전체 항목에서 부분 일치만 확인
+            candidates = np.arange(len(self.names))
+        found = np.char.find(self.jamo[candidates], jamo)
+        scores[candidates] += np.where(found >= 0, SUBSTRING_BONUS + np.where(found == 0, PREFIX_BONUS, 0.0), 0.0)
+        scores[candidates] += np.where(np.char.find(self.texts[candidates], text) >= 0, SYLLABLE_BONUS, 0.0)
+        return scores
+
+
+def build_search_index(categories, detail_names, detail_categories):
+    """중분류 목록과 세부기술(df 행 순서) 이름/소속 중분류로 검색 색인 구성"""
+    categories = [str(name) for name in categories]
+    kinds = ['category'] * len(categories) + ['detail'] * len(detail_names)
+    names = categories + [str(name) for name in detail_names]
+    owners = categories + [str(name) for name in detail_categories]
+    positions = [-1] * len(categories) + list(range(len(detail_names)))
+
+    normalized = [normalize(name) for name in names]
+    jamo = [to_jamo(text) for text in normalized]
+    postings = {}
+    gram_counts = np.empty(len(names), dtype=np.int64)
+    for i, text in enumerate(jamo):
+        grams = ngrams(text)
+        gram_counts[i] = len(grams)
+        for gram in grams:
+            postings.setdefault(gram, []).append(i)
+
+    return SearchIndex(
+        kinds=np.array(kinds, dtype=object),
+        names=np.array(names, dtype=object),
+        categories=np.array(owners, dtype=object),
+        positions=np.array(positions, dtype=np.int64),
+        texts=np.array(normalized, dtype=str),
+        jamo=np.array(jamo, dtype=str),
+        choseong=np.array([to_choseong(text) for text in normalized], dtype=str),
+        postings={gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()},
+        gram_counts=gram_counts
+    )
@@ -0,0 +1,144 @@
+"""조사연도 간 변화 분석 (연도 × 중분류 × 국가 × 지표 배열 기반 증감, 연평균 증가율, 격차 단축 속도)"""
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from tracker_data import COUNTRY_CODES, NUMERIC_METRICS
+
+# pairwise() 통계 종류
+TREND_STATS = ('delta', 'annual', 'cagr')
+
+
+@dataclass(frozen=True)
+class TrendCube:
+    """조사연도 × 중분류 × 국가 × 지표 배열
+
+    values[y, i, j, k]는 years[y] 조사에서 categories[i]의 countries[j] 국가 metrics[k] 지표 평균이며,
+    해당 연도에 없는 중분류는 NaN이다. 중분류는 이름이 같은 행끼리 연결하고, types[i]는 가장 최근
+    조사의 감축/적응 구분이다. pairwise()/country_means() 결과는 처음 요청될 때 계산해 보관한다.
+    """
+    values: np.ndarray
+    years: np.ndarray
+    categories: pd.Index
+    countries: pd.Index
+    metrics: pd.Index
+    types: np.ndarray
+    version: str
+    _memo: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def year_pos(self, year):
+        pos = int(np.searchsorted(self.years, year))
+        if pos >= len(self.years) or self.years[pos] != year:
+            raise KeyError(f"조사연도 데이터가 없습니다: {year}")
+        return pos
+
+    def members(self, selected_type='전체'):
+        """필터에 속한 중분류 위치"""
+        if selected_type == '전체':
+            return np.arange(len(self.categories))
+        return np.flatnonzero(self.types == selected_type)
+
+    def pairwise(self, stat='delta'):
+        """모든 연도 쌍의 변화 (시작 연도, 끝 연도, 중분류, 국가, 지표)
+
+        delta: 끝 - 시작, annual: 연평균 변화량 (delta / 연수), cagr: 연평균 증가율(%).
+        annual/cagr는 시작 연도가 앞선 쌍만 값이 있고, cagr는 시작 값이 양수일 때만 정의된다.
+        """
+        if stat not in TREND_STATS:
+            raise ValueError(f"stat은 {', '.join(TREND_STATS)} 중 하나여야 합니다: {stat}")
+        result = self._memo.get(stat)
+        if result is not None:
+            return result
+
+        start, end = self.values[:, None], self.values[None, :]
+        span = (self.years[None, :] - self.years[:, None]).astype(np.float64)[:, :, None, None, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if stat == 'delta':
+                result = end - start
+            elif stat == 'annual':
+                result = np.where(span > 0, (end - start) / span, np.nan)
+            else:
+                valid = (span > 0) & (start > 0) & (end >= 0)
+                result = np.where(valid, (np.where(valid, end / start, 1.0) ** (1 / np.where(span > 0, span, 1.0)) - 1) * 100,
+                                  np.nan)
+        result.flags.writeable = False
+        self._memo[stat] = result
+        return result
+
+    def change(self, start_year, end_year, stat='delta', metric=None):
+        """두 연도 사이 변화 (중분류, 국가, 지표) 또는 metric 지정 시 (중분류, 국가)"""
+        values = self.pairwise(stat)[self.year_pos(start_year), self.year_pos(end_year)]
+        if metric is not None:
+            values = values[..., self.metrics.get_loc(metric)]
+        return values
+
+    def country_means(self, selected_type='전체'):
+        """연도별 국가 평균 (연도, 국가, 지표), 해당 연도에 값이 있는 중분류만 평균"""
+        key = ('country_means', selected_type)
+        result = self._memo.get(key)
+        if result is None:
+            values = self.values[:, self.members(selected_type)]
+            count = (~np.isnan(values)).sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = np.where(count > 0, np.nansum(values, axis=1) / count, np.nan)
+            result.flags.writeable = False
+            self._memo[key] = result
+        return result
+
+    def movers(self, start_year, end_year, country='kr', metric='tech_level', selected_type='전체'):
+        """중분류별 두 연도 값과 변화 표 (두 연도 모두 값이 있는 중분류만, 변화 내림차순)
+
+        기술격차(tech_gap)면 closure(연당 단축된 격차, 년/년)와 closure_rate(시작 격차 대비 단축 비율 %)를 더한다.
+        """
+        rows = self.members(selected_type)
+        j, k = self.countries.get_loc(country), self.metrics.get_loc(metric)
+        s, e = self.year_pos(start_year), self.year_pos(end_year)
+        start = self.values[s, rows, j, k]
+        end = self.values[e, rows, j, k]
+        table = pd.DataFrame({
+            'tech_category': self.categories[rows],
+            'type': self.types[rows],
+            'start': start,
+            'end': end,
+            'delta': end - start,
+            'annual': self.pairwise('annual')[s, e, rows, j, k],
+            'cagr': self.pairwise('cagr')[s, e, rows, j, k]
+        })
+        if metric == 'tech_gap':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                table['closure'] = -table['annual']
+                table['closure_rate'] = np.where(start > 0, (start - end) / start * 100, np.nan)
+        table = table[~(np.isnan(start) | np.isnan(end))]
+        return table.sort_values('delta', ascending=False, kind='stable', ignore_index=True)
+
+
+def build_trend_cube(datasets):
+    """조사연도별 TrackerDataset {연도: dataset} -> TrendCube"""
+    years = np.array(sorted(datasets), dtype=np.int64)
+    names = set()
+    for dataset in datasets.values():
+        names.update(dataset.tensor.categories)
+    categories = pd.Index(sorted(names), name='tech_category')
+
+    values = np.full((len(years), len(categories), len(COUNTRY_CODES), len(NUMERIC_METRICS)), np.nan)
+    types = np.full(len(categories), None, dtype=object)
+    for y, year in enumerate(years):
+        tensor = datasets[year].tensor
+        rows = categories.get_indexer(tensor.categories)
+        values[y, rows] = tensor.values
+        types[rows] = tensor.types
+
+    digest = hashlib.sha256()
+    for year in years:
+        digest.update(f"{year}:{datasets[year].version};".encode())
+    return TrendCube(
+        values=values,
+        years=years,
+        categories=categories,
+        countries=pd.Index(COUNTRY_CODES, name='country'),
+        metrics=pd.Index(NUMERIC_METRICS, name='metric'),
+        types=types,
+        version=digest.hexdigest()
+    )
@@ -0,0 +1,130 @@
+"""조사연도 워크북 변경 감시 및 증분 갱신 (Streamlit 없이 사용 가능)
+
+TrackerWatcher는 백그라운드 스레드에서 interval초마다 워크북 stat과 공유 스냅샷 manifest만
+확인하고, 바뀐 워크북은 refresh_tracker로 다시 읽어 바뀐 행이 속한 중분류만 재집계한다.
+다른 프로세스가 이미 같은 내용을 게시했으면 스냅샷에 연결만 한다. 갱신될 때마다 generation이
+1씩 증가하므로 화면 쪽은 generation이 바뀌었을 때만 다시 그리면 된다.
+
+증분으로 처리되는 것은 행 비교와 중분류 재집계(category_data)까지다. 그 뒤 build_dataset이 텐서, 집계 큐브,
+히트맵 행렬, 세부기술 색인, 중분류 버전 해시를 전체 데이터로 다시 만들고(배열 연산), 데이터 버전(내용 해시)이
+바뀌므로 버전을 키로 쓰는 figure(히트맵, 레이더, 메인 막대, 추이, 군집)와 부트스트랩/군집 결과도 모두 다시 계산된다.
+중분류 집계 해시(category_versions)를 키로 쓰는 중분류 막대 figure와 일괄 리포트만 바뀐 중분류에 한해 다시 만들고,
+검색 색인은 이름이 그대로면 재사용한다.
+"""
+import logging
+import os
+import threading
+import time
+
+from tracker_data import build_dataset, discover_workbooks, load_tracker_years, refresh_tracker, snapshot_versions
+
+WATCH_INTERVAL_ENV = 'TRACKER_WATCH_INTERVAL'
+DEFAULT_INTERVAL = 2.0
+
+logger = logging.getLogger('tracker.watch')
+
+
+def watch_interval():
+    """감시 주기(초), TRACKER_WATCH_INTERVAL 환경변수로 조정 (0이면 감시하지 않음)"""
+    try:
+        return max(float(os.environ.get(WATCH_INTERVAL_ENV, DEFAULT_INTERVAL)), 0.0)
+    except ValueError:
+        return DEFAULT_INTERVAL
+
+
+class TrackerWatcher:
+    """조사연도별 TrackerDataset 보관 및 워크북 변경 시 증분 갱신"""
+
+    def __init__(self, directory='.', interval=None, cache_dir=None):
+        self.directory = directory
+        self.cache_dir = cache_dir
+        self.interval = watch_interval() if interval is None else interval
+        self.generation = 0
+        # 마지막 갱신 정보 {'time': epoch 초, 'years': {연도: 변경 통계}}
+        self.last_change = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._stamps = dict(snapshot_versions(directory, cache_dir))
+        self.datasets = {
+            year: build_dataset(df, category_data, version, year)
+            for year, (df, category_data, version) in load_tracker_years(directory, cache_dir).items()
+        }
+
+    def latest(self):
+        """최신 조사연도 데이터셋 (워크북이 없으면 None)"""
+        datasets = self.datasets
+        return datasets[max(datasets)] if datasets else None
+
+    def current(self):
+        """(generation, 최신 조사연도 데이터셋)을 함께 읽음 (갱신 중에도 서로 어긋나지 않음)"""
+        with self._lock:
+            return self.generation, self.latest()
+
+    def poll(self):
+        """워크북 변경 확인 및 반영 -> 갱신 여부
+
+        읽기에 실패한 워크북(저장 중 등)은 이전 데이터를 유지하고 다음 확인 때 다시 시도한다.
+        """
+        stamps = dict(snapshot_versions(self.directory, self.cache_dir))
+        changed = [year for year, stamp in stamps.items() if self._stamps.get(year) != stamp]
+        removed = [year for year in self._stamps if year not in stamps]
+        if not changed and not removed:
+            return False
+
+        workbooks = discover_workbooks(self.directory)
+        datasets = {year: dataset for year, dataset in self.datasets.items() if year not in removed}
+        years = {}
+        for year in changed:
+            previous = datasets.get(year)
+            start = time.perf_counter()
+            try:
+                df, category_data, version, stats = refresh_tracker(
+                    workbooks[year],
+                    None if previous is None else (previous.df, previous.category_data, previous.version),
+                    self.cache_dir
+                )
+            except Exception as e:
+                logger.warning("%d년 워크북 갱신 실패 (다음 확인 때 재시도): %s", year, e)
+                stamps.pop(year, None)
+                continue
+            if stats['mode'] != 'unchanged':
+                datasets[year] = build_dataset(df, category_data, version, year, previous)
+                years[year] = {**stats, 'seconds': round(time.perf_counter() - start, 3)}
+
+        # 직접 게시한 스냅샷은 스탬프가 내용 해시로 바뀌므로 다시 읽되, 읽은 내용과 같을 때만 기록
+        # (그 사이 워크북이 또 바뀌었으면 이전 스탬프를 남겨 다음 확인 때 반영)
+        refreshed = dict(snapshot_versions(self.directory, self.cache_dir))
+        for year, dataset in datasets.items():
+            if year in stamps and refreshed.get(year) == dataset.version:
+                stamps[year] = dataset.version
+        self._stamps = stamps
+        if not years and not removed:
+            return False
+        with self._lock:
+            self.datasets = datasets
+            self.generation += 1
+            self.last_change = {'time': time.time(), 'years': years}
+        logger.info("데이터 갱신 (generation %d): %s", self.generation, years)
+        return True
+
+    def start(self):
+        """백그라운드 감시 시작 (interval이 0이면 시작하지 않음)"""
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='tracker-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("워크북 변경 확인 실패")